@@ -0,0 +1,244 @@
+"""Admission control for DB-bound timer requests.
+
+Each worker runs at most `limit` DB-bound /api/v1/timers requests at once.
+Past that, requests wait in a priority queue: transitions (create, start,
+stop, reset) first, then single-timer reads, then lists, ticks and bulk
+operations. A request that cannot be queued (the queue is full of requests
+at least as important) or is not admitted before its deadline gets an
+immediate 503 with Retry-After, instead of piling onto pool.acquire().
+
+The limit adapts AIMD-style to the DB time each request spent
+(MetricsMiddleware's per-request accounting, which includes pool waits).
+While the limit is the bottleneck and DB time stays under the target, it
+grows by about one slot per `limit` completions. A request over the target,
+or one that failed, cuts it by BACKOFF_RATIO. Only one cut happens per
+generation of requests: those admitted before the last cut do not cut
+again.
+
+Streams, WebSockets and long-polls are not admission controlled: they hold
+no connection while they wait.
+"""
+import asyncio
+import heapq
+import itertools
+import time
+from urllib.parse import parse_qs
+from starlette.responses import JSONResponse
+from app.metrics import REGISTRY, request_db_seconds
+
+TIMERS_PREFIX = "/api/v1/timers"
+
+# Priority classes, most important first; also the label values of the metrics.
+PRIORITIES = ("transition", "read", "background")
+TRANSITION, READ, BACKGROUND = range(len(PRIORITIES))
+
+# Multiplicative decrease applied to the limit on an over-target or failed request.
+BACKOFF_RATIO = 0.9
+
+# Statuses that count as a failed request, like an over-target one (a 501 or
+# 4xx says nothing about load).
+FAILURE_STATUSES = (500, 503, 504)
+
+# Seconds a shed client is told to wait before retrying.
+RETRY_AFTER_SECONDS = 1
+
+ADMISSION_LIMIT = REGISTRY.gauge("admission_limit", "Current adaptive concurrency limit of DB-bound requests.")
+ADMISSION_IN_FLIGHT = REGISTRY.gauge("admission_in_flight", "Admitted DB-bound requests currently running.")
+ADMISSION_QUEUED = REGISTRY.gauge("admission_queued", "Requests waiting for admission, by priority.", ("priority",))
+ADMISSION_DECISIONS = REGISTRY.counter(
+    "admission_decisions_total",
+    "Admission outcomes by priority: admitted, queued (admitted after waiting), "
+    "shed_full, shed_evicted (displaced by a more important request) or shed_timeout.",
+    ("priority", "decision"),
+)
+ADMISSION_WAIT = REGISTRY.histogram(
+    "admission_queue_wait_seconds", "Time requests spent queued for admission, by priority.", ("priority",)
+)
+
+
+def classify(scope) -> int | None:
+    """Priority class of an HTTP request, or None if it bypasses admission."""
+    path = scope["path"]
+    if not path.startswith(TIMERS_PREFIX):
+        return None
+    rest = path[len(TIMERS_PREFIX):]
+    method = scope["method"]
+    if method == "POST":
+        if rest in ("", ":start", ":stop", ":reset") or rest.endswith(("/start", "/stop", "/reset")):
+            return TRANSITION
+        return BACKGROUND
+    if method == "GET":
+        if rest.endswith("/stream") or "wait" in parse_qs(scope["query_string"].decode("latin-1")):
+            return None
+        if rest in ("", "/export"):
+            return BACKGROUND
+        return READ
+    return None
+
+
+class AdmissionController:
+    """Adaptive concurrency limit with a bounded, deadline-limited priority queue."""
+
+    def __init__(
+        self,
+        initial_limit: int,
+        min_limit: int,
+        max_limit: int,
+        queue_size: int,
+        queue_timeout: float,
+        latency_target: float,
+    ) -> None:
+        self._min_limit = min_limit
+        self._max_limit = max_limit
+        self._queue_size = queue_size
+        self._queue_timeout = queue_timeout
+        self._latency_target = latency_target
+        self.limit = float(min(max(initial_limit, min_limit), max_limit))
+        self.in_flight = 0
+        # Min-heap of (priority, arrival sequence, future resolved True on
+        # admission or False when displaced).
+        self._queue: list[tuple[int, int, asyncio.Future]] = []
+        self._sequence = itertools.count()
+        self._last_decrease = 0.0
+        ADMISSION_LIMIT.set(self.limit)
+
+    async def acquire(self, priority: int) -> float | None:
+        """Wait for a slot. Returns the monotonic admission time, or None if the request is shed."""
+        label = PRIORITIES[priority]
+        if not self._queue and self.in_flight < int(self.limit):
+            self._admit()
+            ADMISSION_DECISIONS.inc(label, "admitted")
+            return time.monotonic()
+        if len(self._queue) >= self._queue_size and not self._evict_below(priority):
+            ADMISSION_DECISIONS.inc(label, "shed_full")
+            return None
+        entry = (priority, next(self._sequence), asyncio.get_running_loop().create_future())
+        heapq.heappush(self._queue, entry)
+        self._update_queued()
+        queued_at = time.monotonic()
+        try:
+            await asyncio.wait({entry[2]}, timeout=self._queue_timeout)
+        except asyncio.CancelledError:
+            if not self._withdraw(entry) and entry[2].result():
+                self.release(queued_at, 0.0, failed=False, record=False)
+            raise
+        ADMISSION_WAIT.observe(time.monotonic() - queued_at, label)
+        if self._withdraw(entry):
+            ADMISSION_DECISIONS.inc(label, "shed_timeout")
+            return None
+        if not entry[2].result():
+            ADMISSION_DECISIONS.inc(label, "shed_evicted")
+            return None
+        ADMISSION_DECISIONS.inc(label, "queued")
+        return time.monotonic()
+
+    def release(self, admitted_at: float, latency: float, failed: bool, record: bool = True) -> None:
+        """Free the slot of a request admitted at `admitted_at`, adapting the limit to its latency."""
+        self.in_flight -= 1
+        if record:
+            self._adapt(admitted_at, latency, failed)
+        while self._queue and self.in_flight < int(self.limit):
+            _, _, future = heapq.heappop(self._queue)
+            self._admit()
+            future.set_result(True)
+        self._update_queued()
+        ADMISSION_IN_FLIGHT.set(self.in_flight)
+
+    def _adapt(self, admitted_at: float, latency: float, failed: bool) -> None:
+        if failed or latency > self._latency_target:
+            if admitted_at >= self._last_decrease:
+                self.limit = max(self._min_limit, self.limit * BACKOFF_RATIO)
+                self._last_decrease = time.monotonic()
+        elif self._queue or self.in_flight + 1 >= int(self.limit):
+            # Grow only while the limit is what holds requests back.
+            self.limit = min(self._max_limit, self.limit + 1 / self.limit)
+        ADMISSION_LIMIT.set(self.limit)
+
+    def _admit(self) -> None:
+        self.in_flight += 1
+        ADMISSION_IN_FLIGHT.set(self.in_flight)
+
+    def _evict_below(self, priority: int) -> bool:
+        """Displace the newest queued request of the least important class below `priority`."""
+        if not self._queue:
+            return False
+        victim = max(self._queue, key=lambda entry: (entry[0], entry[1]))
+        if victim[0] <= priority:
+            return False
+        self._withdraw(victim)
+        victim[2].set_result(False)
+        return True
+
+    def _withdraw(self, entry: tuple[int, int, asyncio.Future]) -> bool:
+        """Remove a still-queued entry; False if it was already admitted or displaced."""
+        if entry[2].done():
+            return False
+        self._queue.remove(entry)
+        heapq.heapify(self._queue)
+        self._update_queued()
+        return True
+
+    def _update_queued(self) -> None:
+        counts = dict.fromkeys(range(len(PRIORITIES)), 0)
+        for priority, _, _ in self._queue:
+            counts[priority] += 1
+        for priority, count in counts.items():
+            ADMISSION_QUEUED.set(count, PRIORITIES[priority])
+
+
+class AdmissionMiddleware:
+    """ASGI middleware putting DB-bound /api/v1/timers requests through an AdmissionController.
+
+    max_limit 0 disables it.
+    """
+
+    def __init__(
+        self,
+        app,
+        initial_limit: int,
+        min_limit: int,
+        max_limit: int,
+        queue_size: int,
+        queue_timeout: float,
+        latency_target: float,
+    ) -> None:
+        self.app = app
+        self.controller = None
+        if max_limit > 0:
+            self.controller = AdmissionController(
+                initial_limit, min_limit, max_limit, queue_size, queue_timeout, latency_target
+            )
+
+    async def __call__(self, scope, receive, send) -> None:
+        priority = classify(scope) if self.controller is not None and scope["type"] == "http" else None
+        if priority is None:
+            await self.app(scope, receive, send)
+            return
+        admitted_at = await self.controller.acquire(priority)
+        if admitted_at is None:
+            response = JSONResponse(
+                {"detail": "Server is overloaded, retry later"},
+                status_code=503,
+                headers={"Retry-After": str(RETRY_AFTER_SECONDS)},
+            )
+            await response(scope, receive, send)
+            return
+        status = 500
+        db_before = request_db_seconds()
+
+        async def send_wrapper(message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            db_after = request_db_seconds()
+            if db_before is None or db_after is None:
+                # Not under MetricsMiddleware: fall back to time since admission.
+                latency = time.monotonic() - admitted_at
+            else:
+                latency = db_after - db_before
+            self.controller.release(admitted_at, latency, failed=status in FAILURE_STATUSES)
@@ -1,4 +1,6 @@
 from functools import lru_cache
+from typing import Literal
+from pydantic import field_validator
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
 
@@ -12,13 +14,130 @@ class Settings(BaseSettings):
     )
 
     database_url: str
+    # Where timers live. "memory" keeps them in this process (single worker
+    # only: no pool, migrations or change feed), optionally persisted to
+    # MEMORY_SNAPSHOT_PATH every MEMORY_SNAPSHOT_INTERVAL seconds and on
+    # shutdown; an empty path keeps nothing across restarts.
+    timer_backend: Literal["postgres", "memory"] = "postgres"
+    memory_snapshot_path: str = ""
+    memory_snapshot_interval: float = 30.0
     cors_origins: str = "http://localhost:3000,http://localhost:5173"
+    # Apply pending migrations/ at startup (one query when the schema is
+    # current). Disable when deployments run `python -m app.migrate` instead.
+    migrate_on_startup: bool = True
+    # asyncpg pool. Size it from GET /health/pool: sustained waiters or a high
+    # acquire_ms_p95 mean max_size is too small for the worker's concurrency.
+    db_pool_min_size: int = 5
+    db_pool_max_size: int = 20
+    # Connections are replaced after this many queries / seconds idle.
+    db_pool_max_queries: int = 50000
+    db_pool_max_inactive_lifetime: float = 300.0
+    # Per-connection LRU of prepared queries; 0 also skips preparing the repo
+    # statements (required behind pgbouncer in transaction mode).
+    db_statement_cache_size: int = 100
+    # Seconds before a single query is cancelled; 0 disables the limit.
+    db_command_timeout: float = 30.0
+    # Run the hot statements once on every new pool connection, in a
+    # rolled-back transaction, so its first requests skip planning and trigger
+    # compilation. Only applies with a statement cache (not behind pgbouncer).
+    db_pool_warmup: bool = True
+    # "wallclock": elapsed_time is derived from a started_at anchor on read, so
+    # running timers cost no writes. "tick": legacy mode, each POST /tick persists +1s.
+    timer_engine: Literal["wallclock", "tick"] = "wallclock"
+    # Seconds between polls of the push-stream scheduler (one query per poll for
+    # all subscribed timers, regardless of how many clients are connected).
+    stream_poll_interval: float = 0.25
+    # Per-worker read-through cache for GET /timers/{id}; 0 disables it. Entries
+    # are refreshed by local writes and invalidated by other workers' writes via
+    # the change feed; the TTL bounds staleness if a notification is ever missed.
+    timer_cache_size: int = 10000
+    timer_cache_ttl: float = 30.0
+    # Change feed (one LISTEN connection per worker, outside the pool): writes
+    # are coalesced per timer for this many ms before being dispatched to the
+    # cache, completion scheduler and push streams.
+    change_feed_coalesce_ms: int = 20
+    # Distinct pending timer ids before a burst is dropped and consumers resync
+    # from the database instead.
+    change_feed_max_pending: int = 10000
+    # Elapsed percentages at which urgency_level steps up (one level per
+    # threshold), strictly increasing integers in 1..100.
+    urgency_thresholds: str = "33,66,90"
+    # Seconds between set-based refreshes of the stored urgency_level of
+    # running timers (keeps ?urgency_level= filters current under the
+    # wall-clock engine); 0 disables the job.
+    urgency_recompute_interval: float = 0.0
+    # Retention: "archive" moves completed timers older than RETENTION_AGE_DAYS
+    # to timers_archive, "delete" drops them, "off" keeps everything. Runs
+    # every RETENTION_INTERVAL seconds in batches of RETENTION_BATCH_SIZE rows.
+    retention_mode: Literal["off", "archive", "delete"] = "off"
+    retention_age_days: float = 30.0
+    retention_batch_size: int = 1000
+    retention_interval: float = 3600.0
+    # Seconds between recounts that repair drift in the counters behind GET
+    # /timers/stats (e.g. after a load with triggers disabled); 0 disables.
+    stats_reconcile_interval: float = 3600.0
+    # Wall-clock engine: complete running timers (and persist urgency steps) at
+    # their deadline from an in-process scheduler, even if no client ticks.
+    completion_scheduler: bool = True
+    # Seconds between reloads of running timers' deadlines from the database,
+    # which picks up timers started by other workers.
+    completion_resync_interval: float = 60.0
+    # GET /health/ready latency budgets in ms; exceeding any one returns 503 so
+    # the load balancer stops routing to this worker. Results are cached for
+    # HEALTH_CACHE_TTL seconds, so probes cost at most one round trip per TTL.
+    health_pool_acquire_budget_ms: float = 100.0
+    health_db_budget_ms: float = 50.0
+    health_loop_lag_budget_ms: float = 200.0
+    health_cache_ttl: float = 1.0
+    # POST /debug/profile samples the event loop and returns collapsed stacks;
+    # off by default since anyone who can reach it can read code paths.
+    profiler_enabled: bool = False
+    # Longest window a single profile may request, in seconds.
+    profiler_max_seconds: float = 60.0
+    # Tick engine only: buffer ticks in memory and flush dirty timers every N ms
+    # in one statement. 0 writes every tick through. A crash loses at most one
+    # interval of elapsed_time; status/urgency changes are flushed immediately.
+    tick_flush_interval_ms: int = 0
+    # POSTs with an Idempotency-Key header run once per (method, path, key):
+    # retries with the same body within IDEMPOTENCY_TTL seconds replay the
+    # stored response. At most IDEMPOTENCY_MAX_KEYS keys are kept per worker
+    # (LRU over finished keys; 503 when all are in flight); 0 disables it.
+    idempotency_max_keys: int = 10000
+    idempotency_ttl: float = 300.0
+    # Admission control (app.admission): at most a limit of DB-bound
+    # /api/v1/timers requests run at once per worker; the rest queue by
+    # priority (transitions, then reads, then lists/ticks/bulk) for up to
+    # ADMISSION_QUEUE_TIMEOUT_MS and get 503 + Retry-After beyond that or when
+    # the queue is full. The limit adapts between MIN and MAX, backing off
+    # when a request's DB time exceeds ADMISSION_LATENCY_TARGET_MS.
+    # ADMISSION_MAX_LIMIT=0 disables it.
+    admission_initial_limit: int = 20
+    admission_min_limit: int = 2
+    admission_max_limit: int = 100
+    admission_queue_size: int = 200
+    admission_queue_timeout_ms: float = 1000.0
+    admission_latency_target_ms: float = 100.0
+
+    @field_validator("urgency_thresholds")
+    @classmethod
+    def _check_urgency_thresholds(cls, value: str) -> str:
+        thresholds = [int(part) for part in value.split(",") if part.strip()]
+        if not thresholds or any(t < 1 or t > 100 for t in thresholds):
+            raise ValueError("urgency thresholds must be percentages between 1 and 100")
+        if any(a >= b for a, b in zip(thresholds, thresholds[1:])):
+            raise ValueError("urgency thresholds must be strictly increasing")
+        return value
 
     @property
     def cors_origins_list(self) -> list[str]:
         """Parse CORS_ORIGINS string into a list."""
         return [origin.strip() for origin in self.cors_origins.split(",")]
 
+    @property
+    def urgency_thresholds_tuple(self) -> tuple[int, ...]:
+        """Parse URGENCY_THRESHOLDS ("33,66,90") into integer percentages."""
+        return tuple(int(part) for part in self.urgency_thresholds.split(",") if part.strip())
+
 
 @lru_cache(maxsize=1)
 def get_settings() -> Settings:
@@ -26,7 +145,60 @@ def get_settings() -> Settings:
     return Settings()
 
 
-# Module-level exports for direct access (per implementation_contract.md)
-_settings = get_settings()
-DATABASE_URL: str = _settings.database_url
-CORS_ORIGINS: list[str] = _settings.cors_origins_list
+# Module-level exports for direct access (per implementation_contract.md).
+# Declared here, resolved on first access by __getattr__: importing app.config
+# reads neither the environment nor .env until a value is actually needed.
+DATABASE_URL: str
+CORS_ORIGINS: list[str]
+TIMER_BACKEND: str
+MEMORY_SNAPSHOT_PATH: str
+MEMORY_SNAPSHOT_INTERVAL: float
+MIGRATE_ON_STARTUP: bool
+DB_POOL_MIN_SIZE: int
+DB_POOL_MAX_SIZE: int
+DB_POOL_MAX_QUERIES: int
+DB_POOL_MAX_INACTIVE_LIFETIME: float
+DB_STATEMENT_CACHE_SIZE: int
+DB_COMMAND_TIMEOUT: float
+DB_POOL_WARMUP: bool
+TIMER_ENGINE: str
+STREAM_POLL_INTERVAL: float
+TIMER_CACHE_SIZE: int
+TIMER_CACHE_TTL: float
+CHANGE_FEED_COALESCE_MS: int
+CHANGE_FEED_MAX_PENDING: int
+URGENCY_THRESHOLDS: tuple[int, ...]
+URGENCY_RECOMPUTE_INTERVAL: float
+RETENTION_MODE: str
+RETENTION_AGE_DAYS: float
+RETENTION_BATCH_SIZE: int
+RETENTION_INTERVAL: float
+STATS_RECONCILE_INTERVAL: float
+COMPLETION_SCHEDULER: bool
+COMPLETION_RESYNC_INTERVAL: float
+TICK_FLUSH_INTERVAL_MS: int
+IDEMPOTENCY_MAX_KEYS: int
+IDEMPOTENCY_TTL: float
+ADMISSION_INITIAL_LIMIT: int
+ADMISSION_MIN_LIMIT: int
+ADMISSION_MAX_LIMIT: int
+ADMISSION_QUEUE_SIZE: int
+ADMISSION_QUEUE_TIMEOUT_MS: float
+ADMISSION_LATENCY_TARGET_MS: float
+HEALTH_POOL_ACQUIRE_BUDGET_MS: float
+HEALTH_DB_BUDGET_MS: float
+HEALTH_LOOP_LAG_BUDGET_MS: float
+HEALTH_CACHE_TTL: float
+PROFILER_ENABLED: bool
+PROFILER_MAX_SECONDS: float
+
+# Exports that are not just the upper-cased field name.
+_DERIVED = {"CORS_ORIGINS": "cors_origins_list", "URGENCY_THRESHOLDS": "urgency_thresholds_tuple"}
+
+
+def __getattr__(name: str):
+    if name not in __annotations__:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(get_settings(), _DERIVED.get(name, name.lower()))
+    globals()[name] = value
+    return value
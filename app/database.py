@@ -1,19 +1,155 @@
+import time
+from collections import deque
+from dataclasses import dataclass
 import asyncpg
-from app.config import DATABASE_URL
+from app.config import get_settings
+from app.metrics import DB_POOL_ACQUIRE, REGISTRY
+from app.repos.statements import prepare_all, warm_up
 
-_pool: asyncpg.Pool | None = None
+# Acquire wait samples kept for the latency percentiles in PoolStats.
+ACQUIRE_SAMPLES = 1024
 
 
-async def create_pool() -> asyncpg.Pool:
+@dataclass
+class PoolStats:
+    """Point-in-time pool utilisation, for sizing DB_POOL_MIN_SIZE/MAX_SIZE."""
+    size: int
+    idle: int
+    in_use: int
+    min_size: int
+    max_size: int
+    # Acquirers currently waiting for a connection.
+    waiters: int
+    acquires: int
+    # Statements executed on pool connections since the pool was created.
+    queries: int
+    acquire_ms_avg: float
+    acquire_ms_p95: float
+    acquire_ms_max: float
+
+
+class InstrumentedPool(asyncpg.Pool):
+    """asyncpg pool that records acquire waits, waiting callers and executed queries."""
+
+    def __init__(self, *args, init=None, **kwargs) -> None:
+        self._connection_init = init
+        super().__init__(*args, init=self._init_connection, **kwargs)
+        self.waiters = 0
+        self.acquires = 0
+        self.queries = 0
+        self._acquire_total = 0.0
+        self._acquire_max = 0.0
+        self._acquire_samples: deque[float] = deque(maxlen=ACQUIRE_SAMPLES)
+
+    def acquire(self, *, timeout: float | None = None) -> "_TimedAcquire":
+        return _TimedAcquire(self, super().acquire(timeout=timeout))
+
+    async def _init_connection(self, conn: asyncpg.Connection) -> None:
+        if self._connection_init is not None:
+            await self._connection_init(conn)
+        # Counted from here, so connection setup is not. The session reset the
+        # pool runs on every release is not counted either.
+        reset_query = conn.get_reset_query()
+
+        def record_query(logged) -> None:
+            if logged.query != reset_query:
+                self.queries += 1
+
+        conn.add_query_logger(record_query)
+
+    def record_acquire(self, seconds: float) -> None:
+        self.acquires += 1
+        self._acquire_total += seconds
+        self._acquire_max = max(self._acquire_max, seconds)
+        self._acquire_samples.append(seconds)
+        DB_POOL_ACQUIRE.observe(seconds)
+
+    def stats(self) -> PoolStats:
+        samples = sorted(self._acquire_samples)
+        p95 = samples[min(len(samples) - 1, int(len(samples) * 0.95))] if samples else 0.0
+        size = self.get_size()
+        idle = self.get_idle_size()
+        return PoolStats(
+            size=size,
+            idle=idle,
+            in_use=size - idle,
+            min_size=self.get_min_size(),
+            max_size=self.get_max_size(),
+            waiters=self.waiters,
+            acquires=self.acquires,
+            queries=self.queries,
+            acquire_ms_avg=round(self._acquire_total / self.acquires * 1000, 3) if self.acquires else 0.0,
+            acquire_ms_p95=round(p95 * 1000, 3),
+            acquire_ms_max=round(self._acquire_max * 1000, 3),
+        )
+
+
+class _TimedAcquire:
+    """Wraps asyncpg's acquire context to time the wait for a connection."""
+
+    def __init__(self, pool: InstrumentedPool, context) -> None:
+        self._pool = pool
+        self._context = context
+
+    async def __aenter__(self):
+        self._pool.waiters += 1
+        started = time.perf_counter()
+        try:
+            return await self._context.__aenter__()
+        finally:
+            self._pool.waiters -= 1
+            self._pool.record_acquire(time.perf_counter() - started)
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self._context.__aexit__(*exc_info)
+
+    def __await__(self):
+        return self.__aenter__().__await__()
+
+
+_pool: InstrumentedPool | None = None
+
+
+async def _setup_connection(conn: asyncpg.Connection) -> None:
+    """Prepare and warm up a new pool connection.
+
+    asyncpg opens DB_POOL_MIN_SIZE connections when the pool is created, so
+    those are ready before the lifespan finishes startup; connections opened
+    later under load are set up the same way before first use.
+    """
+    await prepare_all(conn)
+    if get_settings().db_pool_warmup:
+        await warm_up(conn)
+
+
+async def create_pool() -> InstrumentedPool:
     """Create and cache the asyncpg connection pool."""
     global _pool
     if _pool is not None:
         return _pool
-    _pool = await asyncpg.create_pool(DATABASE_URL, min_size=5, max_size=20)
+    settings = get_settings()
+    _pool = await InstrumentedPool(
+        settings.database_url,
+        min_size=settings.db_pool_min_size,
+        max_size=settings.db_pool_max_size,
+        max_queries=settings.db_pool_max_queries,
+        max_inactive_connection_lifetime=settings.db_pool_max_inactive_lifetime,
+        statement_cache_size=settings.db_statement_cache_size,
+        command_timeout=settings.db_command_timeout or None,
+        connection_class=asyncpg.Connection,
+        record_class=asyncpg.Record,
+        # Prepare (and warm up) the repos' fixed statements once per
+        # connection. A zero statement cache means a transaction-pooling proxy
+        # (pgbouncer) sits in front of Postgres, where named prepared
+        # statements would break and a warmed backend is not ours to keep.
+        init=_setup_connection if settings.db_statement_cache_size > 0 else None,
+        setup=None,
+        loop=None,
+    )
     return _pool
 
 
-async def get_pool() -> asyncpg.Pool:
+async def get_pool() -> InstrumentedPool:
     """Get the cached connection pool, creating it if necessary."""
     global _pool
     if _pool is None:
@@ -21,6 +157,26 @@ async def get_pool() -> asyncpg.Pool:
     return _pool
 
 
+def get_pool_stats() -> PoolStats | None:
+    """Utilisation of the current pool, or None before it is created."""
+    return _pool.stats() if _pool is not None else None
+
+
+def _collect_pool_connections() -> dict[tuple[str, ...], float]:
+    stats = get_pool_stats()
+    if stats is None:
+        return {}
+    return {("idle",): stats.idle, ("in_use",): stats.in_use, ("waiting",): stats.waiters}
+
+
+REGISTRY.gauge(
+    "db_pool_connections",
+    "Pool connections by state; waiting counts callers queued for a connection.",
+    ("state",),
+    collect=_collect_pool_connections,
+)
+
+
 async def close_pool() -> None:
     """Close the connection pool."""
     global _pool
@@ -0,0 +1,246 @@
+"""Idempotency-Key support for mutating requests.
+
+A POST carrying an Idempotency-Key header runs once per (method, path, key)
+on this worker within the key's TTL. A retry gets the stored status, headers
+and body back, marked Idempotent-Replayed: true. A retry that arrives while
+the original is still running waits for it and then gets the same replay. A
+key reused with a different request body is rejected with 422 rather than
+answered with another request's response. 5xx responses (and bodies over
+IDEMPOTENCY_MAX_BODY_BYTES) are not stored, so those requests can be retried
+for real.
+
+Keys are held per worker, like the read cache: a retry that lands on another
+worker runs again. A key in flight is never evicted, since the retries
+waiting on it would then run the request a second time; when every slot is
+in flight, requests with a new key get 503 with Retry-After.
+"""
+import asyncio
+import hashlib
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from starlette.responses import JSONResponse
+from app.metrics import REGISTRY
+
+IDEMPOTENCY_HEADER = b"idempotency-key"
+REPLAYED_HEADER = (b"idempotent-replayed", b"true")
+
+# Longest accepted key; longer ones are rejected with 400.
+IDEMPOTENCY_MAX_KEY_LENGTH = 255
+
+# Responses with a larger body (e.g. a big POST :bulk) are passed through but
+# not stored. Requests with a larger body (e.g. a POST /import stream) are not
+# buffered to fingerprint them: they run without Idempotency-Key handling.
+IDEMPOTENCY_MAX_BODY_BYTES = 1 << 20
+
+# Seconds a client turned away because every key slot is in flight is told to
+# wait before retrying.
+RETRY_AFTER_SECONDS = 1
+
+IDEMPOTENT_REQUESTS = REGISTRY.counter(
+    "idempotent_requests_total",
+    "POSTs carrying an Idempotency-Key by result: executed, replayed, waited (joined one in flight), "
+    "mismatched (key reused with another body, 422), rejected (no free key slot, 503) or "
+    "bypassed (body too large to fingerprint).",
+    ("result",),
+)
+IDEMPOTENCY_KEYS = REGISTRY.gauge("idempotency_keys", "Idempotency keys held by this worker (stored or in flight).")
+
+# (method, path, Idempotency-Key header)
+Key = tuple[str, str, str]
+
+
+@dataclass
+class StoredResponse:
+    status: int
+    headers: list[tuple[bytes, bytes]]
+    body: bytes
+
+
+class IdempotencyStore:
+    """Bounded LRU + TTL map of a key to a finished response or the future of one in flight.
+
+    Each key also records the SHA-256 of the request body it was first used with.
+    """
+
+    def __init__(self, max_keys: int, ttl: float) -> None:
+        self._max_keys = max_keys
+        self._ttl = ttl
+        # key -> (StoredResponse or in-flight future, monotonic expiry, body fingerprint)
+        self._entries: OrderedDict[Key, tuple[StoredResponse | asyncio.Future, float, bytes]] = OrderedDict()
+
+    def get(self, key: Key) -> tuple[StoredResponse | asyncio.Future, bytes] | None:
+        """The stored response or in-flight future for `key` and its body fingerprint, or None."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        value, expires, fingerprint = entry
+        if not isinstance(value, asyncio.Future) and expires < time.monotonic():
+            del self._entries[key]
+            IDEMPOTENCY_KEYS.set(len(self._entries))
+            return None
+        return value, fingerprint
+
+    def begin(self, key: Key, fingerprint: bytes) -> asyncio.Future | None:
+        """Mark `key` in flight; later requests with it wait on the returned future.
+
+        Returns None when every slot holds a request still in flight.
+        """
+        self._evict(reserve=1)
+        if len(self._entries) >= self._max_keys:
+            return None
+        future = asyncio.get_running_loop().create_future()
+        self._entries[key] = (future, time.monotonic() + self._ttl, fingerprint)
+        IDEMPOTENCY_KEYS.set(len(self._entries))
+        return future
+
+    def finish(self, key: Key, response: StoredResponse | None) -> None:
+        """Store the response (None: forget the key) and release waiting requests."""
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        future, _, fingerprint = entry
+        if response is not None:
+            # Takes the slot the in-flight entry held, so nothing to evict.
+            self._entries[key] = (response, time.monotonic() + self._ttl, fingerprint)
+        IDEMPOTENCY_KEYS.set(len(self._entries))
+        if not future.done():
+            future.set_result(None)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _evict(self, reserve: int) -> None:
+        """Drop least recently stored responses until `reserve` slots are free; in-flight keys stay."""
+        excess = len(self._entries) + reserve - self._max_keys
+        if excess <= 0:
+            return
+        victims = []
+        for key, (value, _, _) in self._entries.items():
+            if not isinstance(value, asyncio.Future):
+                victims.append(key)
+                if len(victims) == excess:
+                    break
+        for key in victims:
+            del self._entries[key]
+        IDEMPOTENCY_KEYS.set(len(self._entries))
+
+
+class IdempotencyMiddleware:
+    """ASGI middleware applying Idempotency-Key to POST requests; max_keys 0 disables it."""
+
+    def __init__(self, app, max_keys: int, ttl: float) -> None:
+        self.app = app
+        self.store = IdempotencyStore(max_keys, ttl) if max_keys > 0 else None
+
+    async def __call__(self, scope, receive, send) -> None:
+        if self.store is None or scope["type"] != "http" or scope["method"] != "POST":
+            await self.app(scope, receive, send)
+            return
+        header = dict(scope["headers"]).get(IDEMPOTENCY_HEADER)
+        if header is None:
+            await self.app(scope, receive, send)
+            return
+        if len(header) > IDEMPOTENCY_MAX_KEY_LENGTH:
+            response = JSONResponse({"detail": "Idempotency-Key is too long"}, status_code=400)
+            await response(scope, receive, send)
+            return
+        key = (scope["method"], scope["path"], header.decode("latin-1"))
+        messages, request_body = await _read_body(receive, IDEMPOTENCY_MAX_BODY_BYTES)
+        receive = _replaying(messages, receive)
+        if request_body is None:
+            IDEMPOTENT_REQUESTS.inc("bypassed")
+            await self.app(scope, receive, send)
+            return
+        fingerprint = hashlib.sha256(request_body).digest()
+
+        waited = False
+        while True:
+            entry = self.store.get(key)
+            if entry is None:
+                break
+            stored, stored_fingerprint = entry
+            if stored_fingerprint != fingerprint:
+                IDEMPOTENT_REQUESTS.inc("mismatched")
+                response = JSONResponse(
+                    {"detail": "Idempotency-Key was already used with a different request body"}, status_code=422
+                )
+                await response(scope, receive, send)
+                return
+            if isinstance(stored, asyncio.Future):
+                waited = True
+                await asyncio.shield(stored)
+                continue
+            IDEMPOTENT_REQUESTS.inc("waited" if waited else "replayed")
+            await _replay(stored, send)
+            return
+
+        if self.store.begin(key, fingerprint) is None:
+            IDEMPOTENT_REQUESTS.inc("rejected")
+            response = JSONResponse(
+                {"detail": "Too many requests in flight, retry later"},
+                status_code=503,
+                headers={"Retry-After": str(RETRY_AFTER_SECONDS)},
+            )
+            await response(scope, receive, send)
+            return
+        IDEMPOTENT_REQUESTS.inc("executed")
+        start: dict | None = None
+        body: list[bytes] = []
+        size = 0
+        complete = False
+
+        async def send_wrapper(message) -> None:
+            nonlocal start, size, complete
+            if message["type"] == "http.response.start":
+                start = message
+            elif message["type"] == "http.response.body":
+                size += len(message.get("body", b""))
+                if size <= IDEMPOTENCY_MAX_BODY_BYTES:
+                    body.append(message.get("body", b""))
+                complete = not message.get("more_body", False)
+            await send(message)
+
+        stored = None
+        try:
+            await self.app(scope, receive, send_wrapper)
+            if start is not None and start["status"] < 500 and complete and size <= IDEMPOTENCY_MAX_BODY_BYTES:
+                stored = StoredResponse(start["status"], list(start.get("headers", [])), b"".join(body))
+        finally:
+            self.store.finish(key, stored)
+
+
+async def _read_body(receive, limit: int) -> tuple[list[dict], bytes | None]:
+    """Receive the request body. Returns the messages read and the body, or None once it exceeds `limit`."""
+    messages = []
+    chunks = []
+    size = 0
+    while True:
+        message = await receive()
+        messages.append(message)
+        if message["type"] != "http.request":
+            return messages, None
+        chunk = message.get("body", b"")
+        size += len(chunk)
+        if size > limit:
+            return messages, None
+        chunks.append(chunk)
+        if not message.get("more_body", False):
+            return messages, b"".join(chunks)
+
+
+def _replaying(messages: list[dict], receive):
+    """A receive callable that returns `messages` first, then continues with `receive`."""
+    pending = list(messages)
+
+    async def replay() -> dict:
+        if pending:
+            return pending.pop(0)
+        return await receive()
+
+    return replay
+
+
+async def _replay(stored: StoredResponse, send) -> None:
+    await send({"type": "http.response.start", "status": stored.status, "headers": [*stored.headers, REPLAYED_HEADER]})
+    await send({"type": "http.response.body", "body": stored.body})
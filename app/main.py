@@ -1,21 +1,147 @@
-import uvicorn
+import logging
 from contextlib import asynccontextmanager
+from datetime import timedelta
+from functools import partial
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from app.config import CORS_ORIGINS
+from app.config import get_settings
+from app.admission import AdmissionMiddleware
 from app.database import create_pool, close_pool
+from app.idempotency import IdempotencyMiddleware
+from app.repos.memory_repo import close_memory_repo, start_memory_repo
+from app.repos.timer_cache import close_timer_cache, get_timer_cache
+from app.metrics import MetricsMiddleware
+from app.migrate import migrate_database
 from app.routers.health import router as health_router
-from app.routers.timers import router as timers_router
+from app.routers.metrics import router as metrics_router
+from app.routers.timers import get_timer_repo, router as timers_router
+from app.services.change_feed import close_change_feed, start_change_feed
+from app.services.completion_scheduler import close_completion_scheduler, start_completion_scheduler
+from app.services.periodic_job import close_periodic_jobs, start_periodic_job
+from app.services.readiness import close_readiness, start_loop_lag_monitor
+from app.services.retention_job import RetentionJob
+from app.services.stats_job import StatsReconcileJob
+from app.services.tick_buffer import close_tick_buffer
+from app.services.timer_stream import close_stream_hub
+from app.services.timer_watch import close_timer_watch
+from app.services.urgency_job import UrgencyRecomputeJob
+from app.startup import TIMELINE
+
+logger = logging.getLogger(__name__)
+
+
+# Longest startup waits for the change feed's LISTEN connection and the
+# completion scheduler's first load before serving anyway (readiness then
+# reports what is still missing).
+STARTUP_WAIT_SECONDS = 5.0
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    """Manage startup/shutdown: create and close the DB pool."""
-    await create_pool()
+    """Manage startup/shutdown: create and close the DB pool and background listeners.
+
+    Each startup step is timed as a phase of the startup TIMELINE (app.startup).
+    """
+    TIMELINE.begin()
+    settings = get_settings()
+    feed = None
+    if settings.timer_backend == "memory":
+        # Single worker, no database: nothing to migrate, pool or listen to.
+        with TIMELINE.phase("memory_repo"):
+            start_memory_repo(settings.memory_snapshot_path, settings.memory_snapshot_interval)
+    else:
+        if settings.migrate_on_startup:
+            with TIMELINE.phase("migrate"):
+                await migrate_database(settings.database_url)
+        # Opens DB_POOL_MIN_SIZE connections, each prepared and warmed up
+        # (app.database), before the first request can be served.
+        with TIMELINE.phase("pool"):
+            await create_pool()
+        with TIMELINE.phase("change_feed"):
+            feed = start_change_feed(
+                settings.database_url, settings.change_feed_coalesce_ms / 1000, settings.change_feed_max_pending
+            )
+            # The cache goes first so other consumers re-reading a timer miss it.
+            cache = get_timer_cache(settings.timer_cache_size, settings.timer_cache_ttl)
+            if cache is not None:
+                feed.subscribe(cache)
+            # Listen before serving: other workers' writes are then never missed.
+            if not await feed.wait_connected(STARTUP_WAIT_SECONDS):
+                logger.warning("change feed not connected after %.0fs; serving anyway", STARTUP_WAIT_SECONDS)
+    with TIMELINE.phase("background_jobs"):
+        start_loop_lag_monitor()
+        start_periodic_job(
+            "urgency", UrgencyRecomputeJob(get_timer_repo).run_once, settings.urgency_recompute_interval
+        )
+        if settings.retention_mode != "off":
+            retention = RetentionJob(
+                get_timer_repo,
+                settings.retention_mode,
+                timedelta(days=settings.retention_age_days),
+                settings.retention_batch_size,
+            )
+            start_periodic_job("retention", retention.run_once, settings.retention_interval)
+        # Passing the interval lets one worker's pass per interval do the scan.
+        interval = settings.stats_reconcile_interval
+        start_periodic_job("stats", partial(StatsReconcileJob(get_timer_repo).run_once, interval), interval)
+    if settings.completion_scheduler and settings.timer_engine == "wallclock":
+        with TIMELINE.phase("completion_scheduler"):
+            scheduler = start_completion_scheduler(
+                get_timer_repo, settings.urgency_thresholds_tuple, settings.completion_resync_interval
+            )
+            if feed is not None:
+                feed.subscribe(scheduler)
+            # Its first load reads every running timer; let it finish before
+            # requests compete with it for the pool.
+            if not await scheduler.wait_loaded(STARTUP_WAIT_SECONDS):
+                logger.warning("completion scheduler not loaded after %.0fs; serving anyway", STARTUP_WAIT_SECONDS)
+    TIMELINE.mark_ready()
     yield
+    await close_readiness()
+    await close_change_feed()
+    await close_completion_scheduler()
+    await close_periodic_jobs()
+    await close_stream_hub()
+    await close_timer_watch()
+    # Write out buffered ticks before the pool goes away.
+    await close_tick_buffer()
+    await close_timer_cache()
+    # Final snapshot after the last writers above have stopped.
+    await close_memory_repo()
     await close_pool()
 
 
+def _admission_middleware(app) -> AdmissionMiddleware:
+    settings = get_settings()
+    return AdmissionMiddleware(
+        app,
+        initial_limit=settings.admission_initial_limit,
+        min_limit=settings.admission_min_limit,
+        max_limit=settings.admission_max_limit,
+        queue_size=settings.admission_queue_size,
+        queue_timeout=settings.admission_queue_timeout_ms / 1000,
+        latency_target=settings.admission_latency_target_ms / 1000,
+    )
+
+
+def _idempotency_middleware(app) -> IdempotencyMiddleware:
+    settings = get_settings()
+    return IdempotencyMiddleware(app, max_keys=settings.idempotency_max_keys, ttl=settings.idempotency_ttl)
+
+
+def _cors_middleware(app) -> CORSMiddleware:
+    return CORSMiddleware(
+        app,
+        allow_origins=get_settings().cors_origins_list,
+        allow_credentials=True,
+        allow_methods=["*"],
+        allow_headers=["*"],
+        # Conditional GETs and long-polls (GET /api/v1/timers/{id}) read the
+        # first two; Idempotent-Replayed marks a replayed Idempotency-Key POST.
+        expose_headers=["ETag", "X-Timer-Version", "Idempotent-Replayed"],
+    )
+
+
 app = FastAPI(
     title="Countdown Timer API",
     version="1.0.0",
@@ -23,17 +149,24 @@ app = FastAPI(
     lifespan=lifespan,
 )
 
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=CORS_ORIGINS,
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
-)
+# Middleware added first runs innermost. Admission sits inside idempotency, so
+# replays and requests waiting on an in-flight key take no slot; both sit
+# inside CORS and metrics, so 503s and replays still get CORS headers and are
+# counted. Starlette builds the stack on the first request or lifespan event,
+# so the factories read settings then, not when this module is imported.
+app.add_middleware(_admission_middleware)
+app.add_middleware(_idempotency_middleware)
+app.add_middleware(_cors_middleware)
+
+app.add_middleware(MetricsMiddleware, on_response=TIMELINE.request_served)
 
 app.include_router(health_router)
+app.include_router(metrics_router)
 app.include_router(timers_router)
 
 
 if __name__ == "__main__":
+    # Imported here: only needed when the app is run as a script.
+    import uvicorn
+
     uvicorn.run("app.main:app", host="0.0.0.0", port=8000, reload=True)
@@ -0,0 +1,299 @@
+import functools
+import inspect
+import time
+from abc import ABC, abstractmethod
+from bisect import bisect_left
+from contextvars import ContextVar
+from typing import Callable, Iterable
+
+# Latency buckets (seconds) shared by the request, DB and pool histograms.
+LATENCY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+def _format_labels(names: tuple[str, ...], values: tuple[str, ...], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class _Metric(ABC):
+    kind = ""
+
+    def __init__(self, name: str, help: str, labels: tuple[str, ...] = ()) -> None:
+        self.name = name
+        self.help = help
+        self.labels = labels
+
+    def render(self) -> Iterable[str]:
+        yield f"# HELP {self.name} {self.help}"
+        yield f"# TYPE {self.name} {self.kind}"
+        yield from self._samples()
+
+    @abstractmethod
+    def _samples(self) -> Iterable[str]:
+        ...
+
+
+class Counter(_Metric):
+    """Monotonic counter; one value per label tuple."""
+    kind = "counter"
+
+    def __init__(self, name: str, help: str, labels: tuple[str, ...] = ()) -> None:
+        super().__init__(name, help, labels)
+        self._values: dict[tuple[str, ...], float] = {}
+
+    def inc(self, *label_values: str, amount: float = 1) -> None:
+        self._values[label_values] = self._values.get(label_values, 0) + amount
+
+    def value(self, *label_values: str) -> float:
+        return self._values.get(label_values, 0)
+
+    def _samples(self) -> Iterable[str]:
+        for values, total in self._values.items():
+            yield f"{self.name}{_format_labels(self.labels, values)} {_format_value(total)}"
+
+
+class Gauge(_Metric):
+    """Point-in-time value, either set directly or read from `collect` at scrape time."""
+    kind = "gauge"
+
+    def __init__(
+        self,
+        name: str,
+        help: str,
+        labels: tuple[str, ...] = (),
+        collect: Callable[[], dict[tuple[str, ...], float]] | None = None,
+    ) -> None:
+        super().__init__(name, help, labels)
+        self._values: dict[tuple[str, ...], float] = {}
+        self._collect = collect
+
+    def set(self, value: float, *label_values: str) -> None:
+        self._values[label_values] = value
+
+    def inc(self, *label_values: str, amount: float = 1) -> None:
+        self._values[label_values] = self._values.get(label_values, 0) + amount
+
+    def dec(self, *label_values: str, amount: float = 1) -> None:
+        self.inc(*label_values, amount=-amount)
+
+    def value(self, *label_values: str) -> float:
+        return self._values.get(label_values, 0)
+
+    def _samples(self) -> Iterable[str]:
+        values = self._collect() if self._collect is not None else self._values
+        for label_values, value in values.items():
+            yield f"{self.name}{_format_labels(self.labels, label_values)} {_format_value(value)}"
+
+
+class Histogram(_Metric):
+    """Cumulative-bucket histogram. observe() is a bisect and two additions."""
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        help: str,
+        labels: tuple[str, ...] = (),
+        buckets: tuple[float, ...] = LATENCY_BUCKETS,
+    ) -> None:
+        super().__init__(name, help, labels)
+        self.buckets = tuple(buckets)
+        # label tuple -> [per-bucket counts (+Inf last), sum]
+        self._series: dict[tuple[str, ...], list] = {}
+
+    def observe(self, value: float, *label_values: str) -> None:
+        series = self._series.get(label_values)
+        if series is None:
+            series = self._series[label_values] = [[0] * (len(self.buckets) + 1), 0.0]
+        series[0][bisect_left(self.buckets, value)] += 1
+        series[1] += value
+
+    def count(self, *label_values: str) -> int:
+        series = self._series.get(label_values)
+        return sum(series[0]) if series is not None else 0
+
+    def _samples(self) -> Iterable[str]:
+        for values, (counts, total) in self._series.items():
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += bucket_count
+                labels = _format_labels(self.labels, values, f'le="{_format_value(bound)}"')
+                yield f"{self.name}_bucket{labels} {cumulative}"
+            labels = _format_labels(self.labels, values)
+            yield f"{self.name}_sum{labels} {_format_value(total)}"
+            yield f"{self.name}_count{labels} {cumulative}"
+
+
+class Registry:
+    """Process-wide collection of metrics rendered in the Prometheus text format (0.0.4)."""
+
+    def __init__(self) -> None:
+        self._metrics: dict[str, _Metric] = {}
+
+    def register(self, metric: _Metric) -> _Metric:
+        existing = self._metrics.get(metric.name)
+        if existing is not None:
+            return existing
+        self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, help: str, labels: tuple[str, ...] = ()) -> Counter:
+        return self.register(Counter(name, help, labels))
+
+    def gauge(self, name: str, help: str, labels: tuple[str, ...] = (), collect=None) -> Gauge:
+        return self.register(Gauge(name, help, labels, collect))
+
+    def histogram(self, name: str, help: str, labels: tuple[str, ...] = (), buckets=LATENCY_BUCKETS) -> Histogram:
+        return self.register(Histogram(name, help, labels, buckets))
+
+    def render(self) -> str:
+        lines = []
+        for metric in self._metrics.values():
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = Registry()
+
+HTTP_REQUESTS = REGISTRY.counter(
+    "http_requests_total", "HTTP requests by method, route template and status code.", ("method", "route", "status")
+)
+HTTP_LATENCY = REGISTRY.histogram(
+    "http_request_duration_seconds", "HTTP request latency by method and route template.", ("method", "route")
+)
+HTTP_IN_FLIGHT = REGISTRY.gauge("http_requests_in_flight", "HTTP requests currently being served.")
+HTTP_DB_TIME = REGISTRY.histogram(
+    "http_request_db_seconds", "Time a request spent in TimerRepo calls, by method and route template.",
+    ("method", "route"),
+)
+DB_CALLS = REGISTRY.histogram("db_call_duration_seconds", "TimerRepo call latency by operation.", ("op",))
+DB_POOL_ACQUIRE = REGISTRY.histogram("db_pool_acquire_seconds", "Time spent waiting for a pool connection.")
+TIMER_TRANSITIONS = REGISTRY.counter(
+    "timer_transitions_total", "Rows returned by timer transitions, by operation and resulting status.",
+    ("op", "status"),
+)
+
+# Seconds spent in repository calls by the current request; None outside one.
+_db_time: ContextVar[list[float] | None] = ContextVar("request_db_time", default=None)
+# Set while an instrumented repository call runs, so calls it makes to other
+# public methods (start -> start_many) are not counted twice.
+_in_repo_call: ContextVar[bool] = ContextVar("in_repo_call", default=False)
+
+
+def request_db_seconds() -> float | None:
+    """Seconds the current request has spent in repository calls so far; None outside MetricsMiddleware."""
+    spent = _db_time.get()
+    return spent[0] if spent is not None else None
+
+
+def instrument_repo(transitions: Iterable[str] = ()) -> Callable[[type], type]:
+    """Class decorator timing every public coroutine method of a repository.
+
+    Each call is observed in db_call_duration_seconds{op=<method>} and added
+    to the current request's DB time. For methods named in `transitions`, the
+    returned row (or dict of rows) is counted in timer_transitions_total by
+    its status.
+    """
+    transitions = set(transitions)
+
+    def decorate(cls: type) -> type:
+        for name, method in list(vars(cls).items()):
+            if not name.startswith("_") and inspect.iscoroutinefunction(method):
+                setattr(cls, name, _timed(name, method, name in transitions))
+        return cls
+
+    return decorate
+
+
+def _timed(op: str, method, counts_transitions: bool):
+    # Batch variants share their single-row operation's label.
+    transition_op = op.removesuffix("_many")
+
+    @functools.wraps(method)
+    async def wrapper(*args, **kwargs):
+        if _in_repo_call.get():
+            return await method(*args, **kwargs)
+        token = _in_repo_call.set(True)
+        started = time.perf_counter()
+        try:
+            result = await method(*args, **kwargs)
+        finally:
+            _in_repo_call.reset(token)
+            elapsed = time.perf_counter() - started
+            DB_CALLS.observe(elapsed, op)
+            spent = _db_time.get()
+            if spent is not None:
+                spent[0] += elapsed
+        if counts_transitions and result is not None:
+            for row in result.values() if isinstance(result, dict) else (result,):
+                TIMER_TRANSITIONS.inc(transition_op, getattr(row.status, "value", row.status))
+        return result
+
+    return wrapper
+
+
+class MetricsMiddleware:
+    """ASGI middleware recording per-route latency, status, in-flight and DB time.
+
+    Routes are labelled by their path template (not the raw path), so timer
+    ids do not create new series; unmatched requests share "unmatched".
+    `on_response`, if given, is called after every HTTP response.
+    """
+
+    def __init__(self, app, on_response: Callable[[], None] | None = None) -> None:
+        self.app = app
+        self._on_response = on_response
+        self._route_labels: dict[object, str] = {}
+
+    async def __call__(self, scope, receive, send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        status = 500
+        started = time.perf_counter()
+        token = _db_time.set([0.0])
+        spent = _db_time.get()
+
+        async def send_wrapper(message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        HTTP_IN_FLIGHT.inc()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            HTTP_IN_FLIGHT.dec()
+            _db_time.reset(token)
+            method = scope["method"]
+            route = self._route_label(scope)
+            HTTP_REQUESTS.inc(method, route, str(status))
+            HTTP_LATENCY.observe(time.perf_counter() - started, method, route)
+            HTTP_DB_TIME.observe(spent[0], method, route)
+            if self._on_response is not None:
+                self._on_response()
+
+    def _route_label(self, scope) -> str:
+        endpoint = scope.get("endpoint")
+        if endpoint is None:
+            return "unmatched"
+        label = self._route_labels.get(endpoint)
+        if label is None:
+            router = scope.get("router")
+            routes = router.routes if router is not None else []
+            label = next((route.path for route in routes if getattr(route, "endpoint", None) is endpoint), "unmatched")
+            self._route_labels[endpoint] = label
+        return label
@@ -0,0 +1,116 @@
+"""Versioned schema migrations from the migrations/ directory.
+
+    python -m app.migrate    # apply pending migrations to DATABASE_URL
+"""
+import asyncio
+import logging
+import re
+from pathlib import Path
+from typing import NamedTuple
+import asyncpg
+
+logger = logging.getLogger(__name__)
+
+MIGRATIONS_DIR = Path(__file__).resolve().parent.parent / "migrations"
+
+# pg_advisory_lock key serialising migrations across workers ("timers" in ASCII).
+MIGRATION_LOCK_KEY = 0x74696D657273
+
+_FILENAME = re.compile(r"^(\d+)_(\w+)\.sql$")
+
+_APPLIED_SQL = "SELECT coalesce(array_agg(version), '{}') FROM schema_migrations"
+_CREATE_TABLE_SQL = """
+    CREATE TABLE IF NOT EXISTS schema_migrations (
+        version INTEGER PRIMARY KEY,
+        name TEXT NOT NULL,
+        applied_at TIMESTAMPTZ NOT NULL DEFAULT now()
+    )
+"""
+
+
+class Migration(NamedTuple):
+    version: int
+    name: str
+    path: Path
+
+
+def load_migrations(directory: Path = MIGRATIONS_DIR) -> list[Migration]:
+    """Migration files ("NNN_name.sql") in version order."""
+    migrations = []
+    for path in directory.glob("*.sql"):
+        match = _FILENAME.match(path.name)
+        if match is None:
+            raise ValueError(f"migration file name must look like 001_name.sql: {path.name}")
+        migrations.append(Migration(int(match.group(1)), match.group(2), path))
+    migrations.sort()
+    versions = [m.version for m in migrations]
+    if len(set(versions)) != len(versions):
+        raise ValueError(f"duplicate migration versions in {directory}")
+    return migrations
+
+
+async def _applied_versions(conn: asyncpg.Connection) -> set[int] | None:
+    """Applied versions, or None when schema_migrations does not exist yet."""
+    try:
+        return set(await conn.fetchval(_APPLIED_SQL))
+    except asyncpg.UndefinedTableError:
+        return None
+
+
+async def migrate(conn: asyncpg.Connection, migrations: list[Migration] | None = None) -> list[int]:
+    """Apply pending migrations on `conn`. Returns the versions applied (empty when current).
+
+    A current schema costs one query and takes no lock. Otherwise the
+    migration advisory lock is taken, so concurrently starting workers apply
+    each pending file exactly once: the first does the work, the rest wait,
+    re-read the applied versions and find nothing left. Each file runs in
+    its own transaction together with its schema_migrations row.
+
+    The files are idempotent (IF NOT EXISTS / OR REPLACE), so a database set
+    up by hand before the runner existed is adopted by re-applying them.
+    """
+    migrations = load_migrations() if migrations is None else migrations
+    applied = await _applied_versions(conn)
+    if applied is not None and applied.issuperset(m.version for m in migrations):
+        return []
+    await conn.execute("SELECT pg_advisory_lock($1)", MIGRATION_LOCK_KEY)
+    try:
+        await conn.execute(_CREATE_TABLE_SQL)
+        applied = await _applied_versions(conn)
+        done = []
+        for migration in migrations:
+            if migration.version in applied:
+                continue
+            logger.info("applying migration %03d_%s", migration.version, migration.name)
+            async with conn.transaction():
+                await conn.execute(migration.path.read_text())
+                await conn.execute(
+                    "INSERT INTO schema_migrations (version, name) VALUES ($1, $2)",
+                    migration.version,
+                    migration.name,
+                )
+            done.append(migration.version)
+        return done
+    finally:
+        await conn.execute("SELECT pg_advisory_unlock($1)", MIGRATION_LOCK_KEY)
+
+
+async def migrate_database(dsn: str) -> list[int]:
+    """Apply pending migrations over a dedicated connection.
+
+    Runs before the pool is created: pool connections prepare the repo
+    statements, which need the migrated schema.
+    """
+    conn = await asyncpg.connect(dsn)
+    try:
+        return await migrate(conn)
+    finally:
+        await conn.close()
+
+
+if __name__ == "__main__":
+    from app.config import DATABASE_URL
+
+    logging.basicConfig(level=logging.INFO)
+    applied = asyncio.run(migrate_database(DATABASE_URL))
+    print(f"applied {len(applied)} migration(s)" + (f": {applied}" if applied else "; schema is current"))
@@ -0,0 +1,72 @@
+"""Direct JSON encoding of TimerRow values, bypassing pydantic.
+
+The output is byte-for-byte what FastAPI produces for the corresponding
+TimerResponse / TimerListResponse / BatchTimerResponse models, so routes can
+keep those models as their documented response_model while returning
+pre-encoded bytes.
+"""
+from datetime import datetime
+from typing import Iterable
+from fastapi.responses import Response
+from app.models.timer import TimerRow
+
+
+class RawJSONResponse(Response):
+    """Response whose body is already-encoded JSON bytes."""
+    media_type = "application/json"
+
+
+def timer_json(row: TimerRow) -> str:
+    """Encode one timer as a TimerResponse JSON object.
+
+    id/status/timestamps never contain characters that need escaping, so the
+    object is assembled with a single f-string.
+    """
+    return (
+        f'{{"id":"{row.id}","duration":{row.duration},"elapsed_time":{row.elapsed_time},'
+        f'"status":"{row.status}","urgency_level":{row.urgency_level},'
+        f'"created_at":"{_isoformat(row.created_at)}","updated_at":"{_isoformat(row.updated_at)}"}}'
+    )
+
+
+def encode_timer(row: TimerRow) -> bytes:
+    """TimerResponse body."""
+    return timer_json(row).encode()
+
+
+def encode_timer_list(
+    rows: Iterable[TimerRow],
+    next_cursor: str | None = None,
+    total_estimate: int | None = None,
+) -> bytes:
+    """TimerListResponse body; count is the number of rows."""
+    items = [timer_json(row) for row in rows]
+    return (
+        f'{{"items":[{",".join(items)}],"count":{len(items)},'
+        f'"next_cursor":{_optional_str(next_cursor)},'
+        f'"total_estimate":{"null" if total_estimate is None else total_estimate}}}'
+    ).encode()
+
+
+def encode_batch(pairs: Iterable[tuple[object, TimerRow | None]]) -> bytes:
+    """BatchTimerResponse body from (requested id, row or None) pairs."""
+    items = [
+        f'{{"id":"{timer_id}","timer":null,"error":"Timer not found"}}'
+        if row is None
+        else f'{{"id":"{timer_id}","timer":{timer_json(row)},"error":null}}'
+        for timer_id, row in pairs
+    ]
+    return f'{{"items":[{",".join(items)}]}}'.encode()
+
+
+def _isoformat(value: datetime) -> str:
+    """ISO 8601 the way pydantic emits it: UTC as 'Z'."""
+    text = value.isoformat()
+    if text.endswith("+00:00"):
+        return text[:-6] + "Z"
+    return text
+
+
+def _optional_str(value: str | None) -> str:
+    # Cursors are base64url, so no escaping is needed.
+    return "null" if value is None else f'"{value}"'
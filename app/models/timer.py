@@ -1,4 +1,5 @@
 from enum import Enum
+from typing import NamedTuple
 from uuid import UUID
 from datetime import datetime
 from pydantic import BaseModel, Field
@@ -21,16 +22,47 @@ class Timer(BaseModel):
     urgency_level: int = Field(default=0, description="0-3 based on elapsed percentage")
     created_at: datetime
     updated_at: datetime
+    started_at: datetime | None = Field(
+        default=None,
+        description="Wall-clock anchor of the current running span (wallclock engine only)",
+    )
 
     class Config:
         from_attributes = True
 
 
+class TimerRow(NamedTuple):
+    """Internal, slotted timer row built positionally from an asyncpg Record.
+
+    This is what TimerRepo returns: it skips pydantic validation entirely and is
+    encoded straight to JSON by app.models.encoding. Field order matches the
+    repo's column list. status is the raw column value. version is assigned by
+    the database (migration 010) and grows by one with every committed write.
+    """
+    id: UUID
+    duration: int
+    elapsed_time: int
+    status: str
+    urgency_level: int
+    created_at: datetime
+    updated_at: datetime
+    started_at: datetime | None = None
+    version: int = 1
+
+
 class CreateTimerRequest(BaseModel):
     """Request to create a new timer."""
     duration: int = Field(..., gt=0, description="Duration in seconds, must be positive")
 
 
+class BulkCreateTimersRequest(BaseModel):
+    """Request to create many timers at once."""
+    timers: list[CreateTimerRequest] = Field(
+        ..., min_length=1, max_length=10000, description="Timers to create, at most 10000"
+    )
+    start: bool = Field(default=False, description="Create the timers already running")
+
+
 class TimerResponse(BaseModel):
     """Response model for timer data."""
     id: UUID
@@ -48,4 +80,33 @@ class TimerResponse(BaseModel):
 class TimerListResponse(BaseModel):
     """Response model for listing timers."""
     items: list[TimerResponse]
-    count: int
+    count: int = Field(..., description="Number of items in this page")
+    next_cursor: str | None = Field(default=None, description="Pass as ?cursor= to fetch the next page")
+    total_estimate: int | None = Field(
+        default=None, description="Planner estimate of all matching timers (?estimate=true)"
+    )
+
+
+class TimerStatsResponse(BaseModel):
+    """Live counts of stored timers; every status and urgency level is present."""
+    total: int
+    by_status: dict[TimerStatus, int]
+    by_urgency: dict[int, int] = Field(..., description="Count per urgency_level")
+    by_status_and_urgency: dict[TimerStatus, dict[int, int]]
+
+
+class BatchTimerRequest(BaseModel):
+    """Request to apply one transition to many timers."""
+    ids: list[UUID] = Field(..., min_length=1, max_length=1000, description="Timer IDs, at most 1000")
+
+
+class BatchTimerResult(BaseModel):
+    """Outcome of a batch transition for one requested ID."""
+    id: UUID
+    timer: TimerResponse | None = None
+    error: str | None = None
+
+
+class BatchTimerResponse(BaseModel):
+    """Response model for batch transitions, in request order."""
+    items: list[BatchTimerResult]
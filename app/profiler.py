@@ -0,0 +1,72 @@
+import asyncio
+import signal
+import threading
+from collections import Counter
+
+
+def _frame_label(frame) -> str:
+    return f"{frame.f_globals.get('__name__', '?')}:{frame.f_code.co_qualname}"
+
+
+class SamplingProfiler:
+    """CPU sampling profiler for the main thread, driven by ITIMER_PROF.
+
+    The kernel delivers SIGPROF every `interval` seconds of process CPU time
+    and the handler counts the interrupted Python stack. Time the event loop
+    spends idle in select() burns no CPU and is not sampled, so the profile
+    shows where work happens. Nothing runs while stopped. Output is the
+    collapsed stack format ("root;caller;callee count" per line) read by
+    flamegraph.pl, speedscope and inferno.
+    """
+
+    def __init__(self) -> None:
+        self._stacks: Counter[str] = Counter()
+        self._previous_handler = None
+        self.running = False
+
+    def start(self, interval: float) -> None:
+        if threading.current_thread() is not threading.main_thread():
+            raise RuntimeError("the sampling profiler must be started from the main thread")
+        self._stacks.clear()
+        self._previous_handler = signal.signal(signal.SIGPROF, self._sample)
+        signal.setitimer(signal.ITIMER_PROF, interval, interval)
+        self.running = True
+
+    def stop(self) -> str:
+        """Stop sampling and return the collapsed stacks, hottest first."""
+        if self.running:
+            signal.setitimer(signal.ITIMER_PROF, 0, 0)
+            signal.signal(signal.SIGPROF, self._previous_handler or signal.SIG_DFL)
+            self.running = False
+        return "".join(f"{stack} {count}\n" for stack, count in self._stacks.most_common())
+
+    def _sample(self, _signum, frame) -> None:
+        labels = []
+        while frame is not None:
+            labels.append(_frame_label(frame))
+            frame = frame.f_back
+        if labels:
+            self._stacks[";".join(reversed(labels))] += 1
+
+
+_profiler = SamplingProfiler()
+
+
+def profiler_running() -> bool:
+    return _profiler.running
+
+
+async def profile_event_loop(seconds: float, interval: float) -> str:
+    """Sample the process for `seconds` of wall time; return collapsed stacks.
+
+    Must run on a loop in the main thread (as under uvicorn). Raises
+    RuntimeError if a profile is already being taken or off the main thread.
+    """
+    if _profiler.running:
+        raise RuntimeError("a profile is already running")
+    _profiler.start(interval)
+    try:
+        await asyncio.sleep(seconds)
+    finally:
+        stacks = _profiler.stop()
+    return stacks
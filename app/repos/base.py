@@ -0,0 +1,99 @@
+from datetime import datetime
+from typing import AsyncIterable, AsyncIterator, Protocol, runtime_checkable
+from uuid import UUID
+from app.models.timer import TimerRow, TimerStatus
+
+
+@runtime_checkable
+class TimerStore(Protocol):
+    """What TimerService and the background jobs need from a timer repo.
+
+    Implemented by TimerRepo (Postgres) and MemoryTimerRepo (TIMER_BACKEND=memory),
+    which follow the same transition rules. Transitions return the rows they
+    wrote; ids that do not exist (or whose guard did not match) are absent.
+    """
+
+    async def create(self, duration: int) -> TimerRow: ...
+
+    async def create_many(self, durations: list[int], start: bool = False, wallclock: bool = True) -> list[TimerRow]: ...
+
+    async def get_by_id(self, timer_id: UUID) -> TimerRow | None: ...
+
+    async def get_many(self, timer_ids: list[UUID]) -> dict[UUID, TimerRow]: ...
+
+    async def list_all(self) -> list[TimerRow]: ...
+
+    async def list_page(
+        self,
+        limit: int | None = None,
+        after: tuple[datetime, UUID] | None = None,
+        status: TimerStatus | None = None,
+        urgency_level: int | None = None,
+    ) -> list[TimerRow]: ...
+
+    def iter_all(
+        self,
+        status: TimerStatus | None = None,
+        urgency_level: int | None = None,
+        prefetch: int = 500,
+    ) -> AsyncIterator[TimerRow]: ...
+
+    def iter_running(self, prefetch: int = 2000) -> AsyncIterator[TimerRow]: ...
+
+    async def estimate_count(
+        self,
+        status: TimerStatus | None = None,
+        urgency_level: int | None = None,
+    ) -> int: ...
+
+    async def update(
+        self,
+        timer_id: UUID,
+        elapsed_time: int,
+        status: TimerStatus,
+        urgency_level: int,
+        started_at: datetime | None = None,
+    ) -> TimerRow | None: ...
+
+    async def start(self, timer_id: UUID, wallclock: bool = True) -> TimerRow | None: ...
+
+    async def stop(self, timer_id: UUID) -> TimerRow | None: ...
+
+    async def reset(self, timer_id: UUID) -> TimerRow | None: ...
+
+    async def tick(self, timer_id: UUID) -> TimerRow | None: ...
+
+    async def complete_if_due(self, timer_id: UUID) -> TimerRow | None: ...
+
+    async def start_many(self, timer_ids: list[UUID], wallclock: bool = True) -> dict[UUID, TimerRow]: ...
+
+    async def stop_many(self, timer_ids: list[UUID]) -> dict[UUID, TimerRow]: ...
+
+    async def reset_many(self, timer_ids: list[UUID]) -> dict[UUID, TimerRow]: ...
+
+    async def tick_many(self, timer_ids: list[UUID]) -> dict[UUID, TimerRow]: ...
+
+    async def complete_if_due_many(self, timer_ids: list[UUID]) -> dict[UUID, TimerRow]: ...
+
+    async def settle_due_many(self, timer_ids: list[UUID]) -> dict[UUID, TimerRow]: ...
+
+    async def flush_ticks(self, rows: list[TimerRow]) -> dict[UUID, TimerRow]: ...
+
+    async def recompute_urgency(self) -> int: ...
+
+    async def stats(self) -> dict[tuple[str, int], int]: ...
+
+    async def reconcile_stats(self, min_interval: float = 0.0) -> int | None: ...
+
+    async def archive_complete(self, before: datetime, limit: int) -> int: ...
+
+    async def delete_complete(self, before: datetime, limit: int) -> int: ...
+
+
+@runtime_checkable
+class BinaryTimerStore(TimerStore, Protocol):
+    """A TimerStore that can also dump and load PGCOPY binary streams (TimerRepo only)."""
+
+    def export_binary(self) -> AsyncIterator[bytes]: ...
+
+    async def import_binary(self, source: AsyncIterable[bytes]) -> tuple[int, int]: ...
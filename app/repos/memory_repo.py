@@ -0,0 +1,504 @@
+import asyncio
+import json
+import logging
+import math
+import os
+from bisect import bisect_left, insort
+from collections import Counter
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import AsyncIterator
+from uuid import UUID, uuid4
+from app.config import get_settings
+from app.metrics import instrument_repo
+from app.models.timer import TimerRow, TimerStatus
+from app.services.urgency import urgency_level
+
+logger = logging.getLogger(__name__)
+
+# Snapshot file format version, bumped if the layout below changes. Version 1
+# files (rows without their version) still load.
+SNAPSHOT_VERSION = 2
+
+
+def _elapsed_at(row: TimerRow, now: datetime) -> int:
+    """Python twin of the repo's _elapsed_at SQL: stored elapsed plus the running span, capped."""
+    if row.status == TimerStatus.running and row.started_at is not None:
+        span = max(0, math.floor((now - row.started_at).total_seconds()))
+        return min(row.duration, row.elapsed_time + span)
+    return row.elapsed_time
+
+
+def _urgency(elapsed_time: int, duration: int) -> int:
+    return urgency_level(elapsed_time, duration, get_settings().urgency_thresholds_tuple)
+
+
+@instrument_repo(transitions=(
+    "start", "stop", "reset", "tick", "complete_if_due",
+    "start_many", "stop_many", "reset_many", "tick_many", "complete_if_due_many",
+    "settle_due_many", "flush_ticks",
+))
+class MemoryTimerRepo:
+    """In-process TimerRepo: same methods and transition rules, no database.
+
+    Rows live in a dict keyed by id, with secondary indexes kept in step on
+    every write: a sorted list of (created_at, id) for newest-first keyset
+    pages, a set of ids per status, and a count per (status, urgency_level)
+    for stats(). Every method runs to completion without awaiting, so each
+    call is atomic on the event loop, the in-memory equivalent of the
+    single-statement transitions in TimerRepo.
+
+    State is per process: use it for a single-worker deployment, tests and
+    benchmarks. With `snapshot_path`, the rows are loaded from that file at
+    startup and written back by save_snapshot() (periodically and on close,
+    see start_memory_repo), so a restart loses at most one interval of writes.
+    """
+
+    def __init__(self, snapshot_path: str | None = None) -> None:
+        self._rows: dict[UUID, TimerRow] = {}
+        self._by_created: list[tuple[datetime, UUID]] = []
+        self._by_status: dict[str, set[UUID]] = {status.value: set() for status in TimerStatus}
+        self._counts: Counter[tuple[str, int]] = Counter()
+        self._archive: dict[UUID, TimerRow] = {}
+        self._snapshot_path = Path(snapshot_path) if snapshot_path else None
+        self._dirty = False
+        if self._snapshot_path is not None and self._snapshot_path.exists():
+            self._load(self._snapshot_path)
+
+    async def create(self, duration: int) -> TimerRow:
+        """Insert a new timer with idle status and elapsed_time=0. Return TimerRow."""
+        now = datetime.now(timezone.utc)
+        row = TimerRow(uuid4(), duration, 0, TimerStatus.idle.value, 0, now, now, None)
+        self._put(row)
+        return row
+
+    async def create_many(self, durations: list[int], start: bool = False, wallclock: bool = True) -> list[TimerRow]:
+        """Insert one timer per duration, idle or already running. Rows in input order."""
+        now = datetime.now(timezone.utc)
+        status = TimerStatus.running if start else TimerStatus.idle
+        started_at = now if start and wallclock else None
+        return [
+            self._put(TimerRow(uuid4(), duration, 0, status.value, 0, now, now, started_at)) for duration in durations
+        ]
+
+    async def get_by_id(self, timer_id: UUID) -> TimerRow | None:
+        """Fetch timer by ID. Return TimerRow or None."""
+        return self._rows.get(timer_id)
+
+    async def get_many(self, timer_ids: list[UUID]) -> dict[UUID, TimerRow]:
+        """Fetch a set of timers. Missing ids are absent from the result."""
+        return {timer_id: self._rows[timer_id] for timer_id in timer_ids if timer_id in self._rows}
+
+    async def list_all(self) -> list[TimerRow]:
+        """Fetch all timers, newest first."""
+        return [self._rows[timer_id] for _, timer_id in reversed(self._by_created)]
+
+    async def list_page(
+        self,
+        limit: int | None = None,
+        after: tuple[datetime, UUID] | None = None,
+        status: TimerStatus | None = None,
+        urgency_level: int | None = None,
+    ) -> list[TimerRow]:
+        """Fetch timers newest first, starting after the (created_at, id) keyset `after`."""
+        page = []
+        for row in self._scan(after, status, urgency_level):
+            if limit is not None and len(page) >= limit:
+                break
+            page.append(row)
+        return page
+
+    async def iter_all(
+        self,
+        status: TimerStatus | None = None,
+        urgency_level: int | None = None,
+        prefetch: int = 500,
+    ) -> AsyncIterator[TimerRow]:
+        """Yield matching timers newest first (a snapshot taken when iteration starts)."""
+        for row in list(self._scan(None, status, urgency_level)):
+            yield row
+
+    async def iter_running(self, prefetch: int = 2000) -> AsyncIterator[TimerRow]:
+        """Yield every running wall-clock timer, unordered (a snapshot)."""
+        running = [self._rows[timer_id] for timer_id in self._by_status[TimerStatus.running.value]]
+        for row in running:
+            if row.started_at is not None:
+                yield row
+
+    async def estimate_count(
+        self,
+        status: TimerStatus | None = None,
+        urgency_level: int | None = None,
+    ) -> int:
+        """Exact count of the filtered timers (cheap here, so no estimate is needed)."""
+        ids = self._by_status[status.value] if status is not None else self._rows.keys()
+        if urgency_level is None:
+            return len(ids)
+        return sum(1 for timer_id in ids if self._rows[timer_id].urgency_level == urgency_level)
+
+    async def stats(self) -> dict[tuple[str, int], int]:
+        """Timer counts per (status, urgency_level), kept by every write."""
+        return {key: count for key, count in self._counts.items() if count}
+
+    async def reconcile_stats(self, min_interval: float = 0.0) -> int | None:
+        """Recount the rows and repair the counts. Returns the total drift corrected.
+
+        Single process, so there is no other reconcile to defer to: min_interval
+        is accepted for TimerRepo compatibility and ignored.
+        """
+        actual = Counter((row.status, row.urgency_level) for row in self._rows.values())
+        drift = sum(abs(actual[key] - self._counts[key]) for key in actual.keys() | self._counts.keys())
+        self._counts = actual
+        return drift
+
+    async def update(
+        self,
+        timer_id: UUID,
+        elapsed_time: int,
+        status: TimerStatus,
+        urgency_level: int,
+        started_at: datetime | None = None,
+    ) -> TimerRow | None:
+        """Update timer fields and return updated TimerRow or None if not found."""
+        row = self._rows.get(timer_id)
+        if row is None:
+            return None
+        return self._put(row._replace(
+            elapsed_time=elapsed_time,
+            status=status.value,
+            urgency_level=urgency_level,
+            updated_at=datetime.now(timezone.utc),
+            started_at=started_at,
+        ))
+
+    async def start(self, timer_id: UUID, wallclock: bool = True) -> TimerRow | None:
+        """Set status to running, folding any running span into elapsed_time."""
+        return (await self.start_many([timer_id], wallclock)).get(timer_id)
+
+    async def stop(self, timer_id: UUID) -> TimerRow | None:
+        """Pause a timer (or complete it if its wall clock already ran out)."""
+        return (await self.stop_many([timer_id])).get(timer_id)
+
+    async def reset(self, timer_id: UUID) -> TimerRow | None:
+        """Reset a timer to idle with elapsed_time=0."""
+        return (await self.reset_many([timer_id])).get(timer_id)
+
+    async def tick(self, timer_id: UUID) -> TimerRow | None:
+        """Advance a running timer by one second (tick engine)."""
+        return (await self.tick_many([timer_id])).get(timer_id)
+
+    async def complete_if_due(self, timer_id: UUID) -> TimerRow | None:
+        """Persist completion of a wall-clock timer whose anchor ran past duration."""
+        return (await self.complete_if_due_many([timer_id])).get(timer_id)
+
+    async def start_many(self, timer_ids: list[UUID], wallclock: bool = True) -> dict[UUID, TimerRow]:
+        """Start every listed timer. Missing ids are absent from the result."""
+        now = datetime.now(timezone.utc)
+        result = {}
+        for row in self._existing(timer_ids):
+            elapsed = _elapsed_at(row, now)
+            result[row.id] = self._put(row._replace(
+                elapsed_time=elapsed,
+                status=TimerStatus.running.value,
+                urgency_level=_urgency(elapsed, row.duration),
+                started_at=now if wallclock else None,
+                updated_at=now,
+            ))
+        return result
+
+    async def stop_many(self, timer_ids: list[UUID]) -> dict[UUID, TimerRow]:
+        """Stop every listed timer. Missing ids are absent from the result."""
+        now = datetime.now(timezone.utc)
+        result = {}
+        for row in self._existing(timer_ids):
+            elapsed = _elapsed_at(row, now)
+            ran_out = row.status == TimerStatus.running and row.started_at is not None and elapsed >= row.duration
+            result[row.id] = self._put(row._replace(
+                elapsed_time=elapsed,
+                status=(TimerStatus.complete if ran_out else TimerStatus.paused).value,
+                urgency_level=_urgency(elapsed, row.duration),
+                started_at=None,
+                updated_at=now,
+            ))
+        return result
+
+    async def reset_many(self, timer_ids: list[UUID]) -> dict[UUID, TimerRow]:
+        """Reset every listed timer. Missing ids are absent from the result."""
+        now = datetime.now(timezone.utc)
+        return {
+            row.id: self._put(row._replace(
+                elapsed_time=0, status=TimerStatus.idle.value, urgency_level=0, started_at=None, updated_at=now
+            ))
+            for row in self._existing(timer_ids)
+        }
+
+    async def tick_many(self, timer_ids: list[UUID]) -> dict[UUID, TimerRow]:
+        """Tick every listed running timer; others are returned unchanged."""
+        now = datetime.now(timezone.utc)
+        result = {}
+        for row in self._existing(timer_ids):
+            if row.status == TimerStatus.running:
+                elapsed = row.elapsed_time + 1
+                row = self._put(row._replace(
+                    elapsed_time=elapsed,
+                    status=TimerStatus.complete.value if elapsed >= row.duration else row.status,
+                    urgency_level=_urgency(elapsed, row.duration),
+                    updated_at=now,
+                ))
+            result[row.id] = row
+        return result
+
+    async def complete_if_due_many(self, timer_ids: list[UUID]) -> dict[UUID, TimerRow]:
+        """complete_if_due for a set of timers; rows not due are returned unchanged."""
+        now = datetime.now(timezone.utc)
+        result = {}
+        for row in self._existing(timer_ids):
+            if row.status == TimerStatus.running and row.started_at is not None and _elapsed_at(row, now) >= row.duration:
+                row = self._put(row._replace(
+                    elapsed_time=row.duration,
+                    status=TimerStatus.complete.value,
+                    urgency_level=_urgency(row.duration, row.duration),
+                    started_at=None,
+                    updated_at=now,
+                ))
+            result[row.id] = row
+        return result
+
+    async def settle_due_many(self, timer_ids: list[UUID]) -> dict[UUID, TimerRow]:
+        """Persist due completions/urgency raises; rows with nothing due are returned unchanged."""
+        now = datetime.now(timezone.utc)
+        result = {}
+        for row in self._existing(timer_ids):
+            if row.status == TimerStatus.running and row.started_at is not None:
+                elapsed = _elapsed_at(row, now)
+                level = _urgency(elapsed, row.duration)
+                if elapsed >= row.duration:
+                    row = self._put(row._replace(
+                        elapsed_time=row.duration,
+                        status=TimerStatus.complete.value,
+                        urgency_level=level,
+                        started_at=None,
+                        updated_at=now,
+                    ))
+                elif level != row.urgency_level:
+                    row = self._put(row._replace(urgency_level=level))
+            result[row.id] = row
+        return result
+
+    async def flush_ticks(self, rows: list[TimerRow]) -> dict[UUID, TimerRow]:
+        """Persist buffered tick state for rows still running and unchanged since buffered."""
+        now = datetime.now(timezone.utc)
+        written = {}
+        for buffered in rows:
+            row = self._rows.get(buffered.id)
+            if row is None or row.status != TimerStatus.running or row.version != buffered.version:
+                continue
+            written[row.id] = self._put(row._replace(
+                elapsed_time=buffered.elapsed_time,
+                status=buffered.status,
+                urgency_level=buffered.urgency_level,
+                updated_at=now,
+            ))
+        return written
+
+    async def recompute_urgency(self) -> int:
+        """Refresh urgency_level for all running timers. Returns rows changed."""
+        now = datetime.now(timezone.utc)
+        changed = 0
+        for timer_id in list(self._by_status[TimerStatus.running.value]):
+            row = self._rows[timer_id]
+            level = _urgency(_elapsed_at(row, now), row.duration)
+            if level != row.urgency_level:
+                self._put(row._replace(urgency_level=level))
+                changed += 1
+        return changed
+
+    async def archive_complete(self, before: datetime, limit: int) -> int:
+        """Move up to `limit` timers completed before `before` to the archive. Returns rows moved."""
+        expired = self._expired(before, limit)
+        for row in expired:
+            self._remove(row.id)
+            self._archive.setdefault(row.id, row)
+        return len(expired)
+
+    async def delete_complete(self, before: datetime, limit: int) -> int:
+        """Delete up to `limit` timers completed before `before`. Returns rows deleted."""
+        expired = self._expired(before, limit)
+        for row in expired:
+            self._remove(row.id)
+        return len(expired)
+
+    def clear(self) -> None:
+        """Drop every timer (tests)."""
+        self._rows.clear()
+        self._by_created.clear()
+        for ids in self._by_status.values():
+            ids.clear()
+        self._counts.clear()
+        self._archive.clear()
+        self._dirty = True
+
+    def archived(self) -> dict[UUID, TimerRow]:
+        """Timers moved out by archive_complete, keyed by id."""
+        return dict(self._archive)
+
+    async def save_snapshot(self) -> bool:
+        """Write all rows to the snapshot file if anything changed. Returns whether it wrote.
+
+        The rows are copied on the loop and encoded and written in a worker
+        thread; the file is replaced atomically, so a crash mid-write leaves
+        the previous snapshot intact.
+        """
+        if self._snapshot_path is None or not self._dirty:
+            return False
+        # Cleared before the write so changes made while it runs mark the
+        # repo dirty again; restored if the write fails, to retry next time.
+        self._dirty = False
+        rows, archive = list(self._rows.values()), list(self._archive.values())
+        try:
+            await asyncio.to_thread(_write_snapshot, self._snapshot_path, rows, archive)
+        except BaseException:
+            self._dirty = True
+            raise
+        return True
+
+    def _scan(
+        self,
+        after: tuple[datetime, UUID] | None,
+        status: TimerStatus | None,
+        urgency_level: int | None,
+    ):
+        """Rows newest first from the created_at index, below the keyset `after`."""
+        end = bisect_left(self._by_created, after) if after is not None else len(self._by_created)
+        for index in range(end - 1, -1, -1):
+            row = self._rows[self._by_created[index][1]]
+            if status is not None and row.status != status.value:
+                continue
+            if urgency_level is not None and row.urgency_level != urgency_level:
+                continue
+            yield row
+
+    def _existing(self, timer_ids: list[UUID]) -> list[TimerRow]:
+        return [self._rows[timer_id] for timer_id in dict.fromkeys(timer_ids) if timer_id in self._rows]
+
+    def _expired(self, before: datetime, limit: int) -> list[TimerRow]:
+        """Up to `limit` complete timers last updated before `before`, oldest first."""
+        complete = (self._rows[timer_id] for timer_id in self._by_status[TimerStatus.complete.value])
+        return sorted((row for row in complete if row.updated_at < before), key=lambda row: row.updated_at)[:limit]
+
+    def _put(self, row: TimerRow) -> TimerRow:
+        """Insert or replace a row, keeping the secondary indexes in step.
+
+        A replaced row gets the next version, like the timers_bump_version trigger.
+        """
+        old = self._rows.get(row.id)
+        if old is None:
+            insort(self._by_created, (row.created_at, row.id))
+        else:
+            row = row._replace(version=old.version + 1)
+            if old.status != row.status:
+                self._by_status[old.status].discard(row.id)
+            self._counts[old.status, old.urgency_level] -= 1
+        self._by_status[row.status].add(row.id)
+        self._counts[row.status, row.urgency_level] += 1
+        self._rows[row.id] = row
+        self._dirty = True
+        return row
+
+    def _remove(self, timer_id: UUID) -> None:
+        row = self._rows.pop(timer_id)
+        index = bisect_left(self._by_created, (row.created_at, row.id))
+        del self._by_created[index]
+        self._by_status[row.status].discard(timer_id)
+        self._counts[row.status, row.urgency_level] -= 1
+        self._dirty = True
+
+    def _load(self, path: Path) -> None:
+        data = json.loads(path.read_text())
+        if data.get("version") not in (1, SNAPSHOT_VERSION):
+            raise ValueError(f"unsupported timer snapshot version in {path}: {data.get('version')!r}")
+        for values in data["timers"]:
+            self._put(_decode_row(values))
+        for values in data["archive"]:
+            row = _decode_row(values)
+            self._archive[row.id] = row
+        self._dirty = False
+        logger.info("loaded %d timers from snapshot %s", len(self._rows), path)
+
+
+def _encode_row(row: TimerRow) -> list:
+    return [
+        str(row.id), row.duration, row.elapsed_time, row.status, row.urgency_level,
+        row.created_at.isoformat(), row.updated_at.isoformat(),
+        row.started_at.isoformat() if row.started_at is not None else None,
+        row.version,
+    ]
+
+
+def _decode_row(values: list) -> TimerRow:
+    timer_id, duration, elapsed_time, status, level, created_at, updated_at, started_at, *version = values
+    return TimerRow(
+        UUID(timer_id), duration, elapsed_time, status, level,
+        datetime.fromisoformat(created_at), datetime.fromisoformat(updated_at),
+        datetime.fromisoformat(started_at) if started_at is not None else None,
+        *version,
+    )
+
+
+def _write_snapshot(path: Path, rows: list[TimerRow], archive: list[TimerRow]) -> None:
+    data = {
+        "version": SNAPSHOT_VERSION,
+        "timers": [_encode_row(row) for row in rows],
+        "archive": [_encode_row(row) for row in archive],
+    }
+    tmp = path.with_name(path.name + ".tmp")
+    with open(tmp, "w") as f:
+        json.dump(data, f, separators=(",", ":"))
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+
+
+_repo: MemoryTimerRepo | None = None
+_snapshot_task: asyncio.Task | None = None
+
+
+def get_memory_repo(snapshot_path: str | None = None) -> MemoryTimerRepo:
+    """Process-wide in-memory repo, created (and loaded from the snapshot) on first use."""
+    global _repo
+    if _repo is None:
+        _repo = MemoryTimerRepo(snapshot_path)
+    return _repo
+
+
+def start_memory_repo(snapshot_path: str | None, snapshot_interval: float) -> MemoryTimerRepo:
+    """Create the repo and, with a snapshot file, save it every `snapshot_interval` seconds."""
+    global _snapshot_task
+    repo = get_memory_repo(snapshot_path)
+    if snapshot_path and snapshot_interval > 0 and _snapshot_task is None:
+        _snapshot_task = asyncio.create_task(_snapshot_loop(repo, snapshot_interval))
+    return repo
+
+
+async def _snapshot_loop(repo: MemoryTimerRepo, interval: float) -> None:
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            await repo.save_snapshot()
+        except Exception:
+            logger.exception("timer snapshot failed; retrying next interval")
+
+
+async def close_memory_repo() -> None:
+    """Stop periodic snapshots, write a final one and drop the repo."""
+    global _repo, _snapshot_task
+    if _snapshot_task is not None:
+        _snapshot_task.cancel()
+        try:
+            await _snapshot_task
+        except asyncio.CancelledError:
+            pass
+        _snapshot_task = None
+    if _repo is not None:
+        await _repo.save_snapshot()
+        _repo = None
@@ -0,0 +1,73 @@
+from typing import Awaitable, Callable
+import asyncpg
+
+# name -> SQL for every fixed (non-dynamic) statement the repos issue. Repos
+# register their statements at import time; each pool connection prepares the
+# whole registry once, when it is opened (see app.database).
+STATEMENTS: dict[str, str] = {}
+
+# Functions registering statements whose SQL depends on settings. They run
+# first thing in prepare_all, so such statements are registered (and prepared)
+# before any connection is used without settings being read at import time.
+DEFERRED: list[Callable[[], object]] = []
+
+# Coroutines exercising a repo's per-request statements once; run on each new
+# pool connection after prepare_all (see warm_up).
+WARMUPS: list[Callable[[asyncpg.Connection], Awaitable[None]]] = []
+
+
+def register(name: str, sql: str) -> str:
+    """Add a statement to the registry and return its SQL, for use with conn.fetch*()."""
+    if STATEMENTS.get(name, sql) != sql:
+        raise ValueError(f"statement {name!r} is already registered with different SQL")
+    STATEMENTS[name] = sql
+    return sql
+
+
+async def prepare_all(conn: asyncpg.Connection) -> None:
+    """Prepare every registered statement into the connection's statement cache.
+
+    asyncpg looks statements up in that cache by query text, so the repos'
+    ordinary conn.fetch(sql, ...) calls reuse these server-side prepared
+    statements and never pay a Parse round trip. Preparing also fails fast if
+    a statement no longer matches the schema.
+
+    The public conn.prepare() bypasses that cache, so this uses asyncpg's
+    private _prepare(use_cache=True); requirements.txt pins asyncpg exactly
+    and tests/test_database.py checks the cache is still hit.
+    """
+    for build in DEFERRED:
+        build()
+    for sql in STATEMENTS.values():
+        await conn._prepare(sql, use_cache=True)
+
+
+def register_deferred(build: Callable[[], object]) -> Callable[[], object]:
+    """Decorator adding a statement-registering function to DEFERRED."""
+    DEFERRED.append(build)
+    return build
+
+
+def register_warmup(
+    warmup: Callable[[asyncpg.Connection], Awaitable[None]],
+) -> Callable[[asyncpg.Connection], Awaitable[None]]:
+    """Decorator adding a coroutine function to WARMUPS."""
+    WARMUPS.append(warmup)
+    return warmup
+
+
+async def warm_up(conn: asyncpg.Connection) -> None:
+    """Run every registered warm-up inside a transaction that is rolled back.
+
+    A backend plans a prepared statement, and compiles the plpgsql trigger
+    functions a write fires, on first execution: a few ms each that the
+    first requests on a fresh connection would otherwise pay. Nothing the
+    warm-ups write is kept, and a rolled-back transaction sends no NOTIFY.
+    """
+    transaction = conn.transaction()
+    await transaction.start()
+    try:
+        for warmup in WARMUPS:
+            await warmup(conn)
+    finally:
+        await transaction.rollback()
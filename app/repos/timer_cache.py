@@ -0,0 +1,102 @@
+import time
+from collections import OrderedDict
+from dataclasses import asdict, dataclass
+from uuid import UUID
+from app.models.timer import TimerRow
+
+@dataclass
+class CacheStats:
+    """Counters reported by TimerCache.stats()."""
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    invalidations: int = 0
+    size: int = 0
+
+
+class TimerCache:
+    """Bounded LRU + TTL cache of stored timer rows, keyed by id.
+
+    Entries are either a row or a tombstone: a version learned from the change
+    feed for which no row is cached. Versions are TimerRow.version, which the
+    database raises by one per committed write, so they follow commit order
+    whatever the writers' clocks. A row older than the cached version (row or
+    tombstone) is never stored, so a slow read cannot overwrite a newer write.
+    """
+
+    def __init__(self, max_size: int, ttl: float) -> None:
+        self._max_size = max_size
+        self._ttl = ttl
+        # id -> (row or None for a tombstone, version, monotonic expiry)
+        self._entries: OrderedDict[UUID, tuple[TimerRow | None, int, float]] = OrderedDict()
+        self._stats = CacheStats()
+
+    def get(self, timer_id: UUID) -> TimerRow | None:
+        """Return the cached row, or None on a miss."""
+        entry = self._entries.get(timer_id)
+        if entry is None or entry[0] is None or entry[2] < time.monotonic():
+            self._stats.misses += 1
+            return None
+        self._entries.move_to_end(timer_id)
+        self._stats.hits += 1
+        return entry[0]
+
+    def put(self, row: TimerRow) -> None:
+        """Store a row read from or written to the database, unless a newer version is known."""
+        entry = self._entries.get(row.id)
+        if entry is not None and entry[1] > row.version:
+            return
+        self._store(row.id, row, row.version)
+
+    def invalidate(self, timer_id: UUID, version: int | None = None) -> None:
+        """Drop a cached row. With a version, keep a tombstone so older rows are rejected."""
+        entry = self._entries.pop(timer_id, None)
+        if entry is not None and version is not None and entry[1] >= version:
+            # Already at (or past) the notified version, e.g. our own write-through.
+            self._entries[timer_id] = entry
+            return
+        if entry is not None and entry[0] is not None:
+            self._stats.invalidations += 1
+        if version is not None:
+            self._store(timer_id, None, version)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def stats(self) -> CacheStats:
+        return CacheStats(**{**asdict(self._stats), "size": len(self._entries)})
+
+    def _store(self, timer_id: UUID, row: TimerRow | None, version: int) -> None:
+        self._entries[timer_id] = (row, version, time.monotonic() + self._ttl)
+        self._entries.move_to_end(timer_id)
+        while len(self._entries) > self._max_size:
+            self._entries.popitem(last=False)
+            self._stats.evictions += 1
+
+    def on_changes(self, changes: dict[UUID, int | None]) -> None:
+        """Change feed consumer: invalidate written timers, tombstoning their version."""
+        for timer_id, version in changes.items():
+            self.invalidate(timer_id, version)
+
+    def on_reset(self) -> None:
+        """Change feed consumer: notifications were lost, so nothing cached can be trusted."""
+        self.clear()
+
+
+_cache: TimerCache | None = None
+
+
+def get_timer_cache(max_size: int, ttl: float) -> TimerCache | None:
+    """Process-wide cache, created on first use; None when max_size is 0 (disabled)."""
+    global _cache
+    if max_size <= 0:
+        return None
+    if _cache is None:
+        _cache = TimerCache(max_size, ttl)
+    return _cache
+
+
+async def close_timer_cache() -> None:
+    """Drop the cache."""
+    global _cache
+    _cache = None
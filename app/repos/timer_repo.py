@@ -1,27 +1,388 @@
+import asyncio
+import json
+from functools import lru_cache
+from typing import AsyncIterable, AsyncIterator, Callable, NamedTuple
 from uuid import UUID, uuid4
-from datetime import datetime
+from datetime import datetime, timezone
 import asyncpg
-from app.models.timer import Timer, TimerStatus
+from app.config import get_settings
+from app.metrics import instrument_repo
+from app.models.timer import TimerRow, TimerStatus
+from app.repos.statements import register, register_deferred, register_warmup
+from app.repos.timer_cache import TimerCache
 
+_COLUMNS = "id, duration, elapsed_time, status, urgency_level, created_at, updated_at, started_at, version"
+# Columns of the PGCOPY export/import format. version is not part of it: it
+# orders writes within one database, and imported rows start again at 1.
+_COPY_COLUMNS = _COLUMNS.split(", ")[:-1]
 
+# COPY chunks buffered between the export connection and a slow consumer;
+# beyond this asyncpg stops reading the socket and the server waits.
+EXPORT_QUEUE_CHUNKS = 8
+
+
+def _urgency_sql(elapsed: str, thresholds: tuple[int, ...]) -> str:
+    """SQL twin of TimerService.compute_urgency (app.services.urgency), in integer arithmetic."""
+    steps = " + ".join(
+        f"(({elapsed})::bigint * 100 >= duration::bigint * {threshold})::int" for threshold in thresholds
+    )
+    return f"""
+        CASE
+            WHEN duration <= 0 THEN 0
+            ELSE {steps}
+        END"""
+
+
+def _page_sql(where: str, limit_param: int | None) -> str:
+    """List query, newest first; shared by list_page and the registered page statements."""
+    query = f"SELECT {_COLUMNS} FROM timers{where} ORDER BY created_at DESC, id DESC"
+    return query if limit_param is None else f"{query} LIMIT ${limit_param}"
+
+
+# Elapsed seconds at `now`: the stored elapsed_time plus the wall-clock span of
+# a running timer, capped at duration. Timers without an anchor (tick engine,
+# paused, idle) just report elapsed_time.
+def _elapsed_at(now: str) -> str:
+    return f"""
+    CASE
+        WHEN status = 'running' AND started_at IS NOT NULL THEN LEAST(
+            duration,
+            elapsed_time + GREATEST(0, floor(extract(epoch FROM {now}::timestamptz - started_at))::int)
+        )
+        ELSE elapsed_time
+    END"""
+
+
+# Transitions take the transition instant as $2.
+_ELAPSED_AT = _elapsed_at("$2")
+
+# Each transition is one conditional UPDATE evaluated against the latest row
+# version, so concurrent requests serialize on the row lock instead of racing a
+# read-modify-write, and each request holds a single pool connection. $1 is an
+# array of ids: single-timer calls pass one id, batch calls apply the transition
+# to the whole set in the same statement. Statements that set urgency_level are
+# functions of the urgency expression, registered by _urgency_statements.
+def _start_sql(urgency: Callable[[str], str]) -> str:
+    return f"""
+    UPDATE timers
+    SET elapsed_time = {_ELAPSED_AT},
+        status = 'running',
+        urgency_level = {urgency(_ELAPSED_AT)},
+        started_at = CASE WHEN $3 THEN $2::timestamptz ELSE NULL END,
+        updated_at = $2
+    WHERE id = ANY($1::uuid[])
+    RETURNING {_COLUMNS}
+"""
+
+def _stop_sql(urgency: Callable[[str], str]) -> str:
+    return f"""
+    UPDATE timers
+    SET elapsed_time = {_ELAPSED_AT},
+        status = CASE
+            WHEN status = 'running' AND started_at IS NOT NULL AND {_ELAPSED_AT} >= duration THEN 'complete'
+            ELSE 'paused'
+        END,
+        urgency_level = {urgency(_ELAPSED_AT)},
+        started_at = NULL,
+        updated_at = $2
+    WHERE id = ANY($1::uuid[])
+    RETURNING {_COLUMNS}
+"""
+
+_RESET_SQL = register("timer_reset", f"""
+    UPDATE timers
+    SET elapsed_time = 0, status = 'idle', urgency_level = 0, started_at = NULL, updated_at = $2
+    WHERE id = ANY($1::uuid[])
+    RETURNING {_COLUMNS}
+""")
+
+# Tick engine: only running timers advance; other timers are returned as-is so
+# a late tick racing a stop cannot move a paused timer.
+def _tick_sql(urgency: Callable[[str], str]) -> str:
+    return f"""
+    WITH ticked AS (
+        UPDATE timers
+        SET elapsed_time = elapsed_time + 1,
+            status = CASE WHEN elapsed_time + 1 >= duration THEN 'complete' ELSE status END,
+            urgency_level = {urgency("elapsed_time + 1")},
+            updated_at = $2
+        WHERE id = ANY($1::uuid[]) AND status = 'running'
+        RETURNING {_COLUMNS}
+    )
+    SELECT {_COLUMNS} FROM ticked
+    UNION ALL
+    SELECT {_COLUMNS} FROM timers
+    WHERE id = ANY($1::uuid[]) AND id NOT IN (SELECT id FROM ticked)
+"""
+
+# Wall-clock engine: persist completion once the anchor has run past duration;
+# otherwise return the stored row unchanged for projection by the service.
+def _complete_if_due_sql(urgency: Callable[[str], str]) -> str:
+    return f"""
+    WITH done AS (
+        UPDATE timers
+        SET elapsed_time = duration,
+            status = 'complete',
+            urgency_level = {urgency("duration")},
+            started_at = NULL,
+            updated_at = $2
+        WHERE id = ANY($1::uuid[])
+          AND status = 'running'
+          AND started_at IS NOT NULL
+          AND {_ELAPSED_AT} >= duration
+        RETURNING {_COLUMNS}
+    )
+    SELECT {_COLUMNS} FROM done
+    UNION ALL
+    SELECT {_COLUMNS} FROM timers
+    WHERE id = ANY($1::uuid[]) AND id NOT IN (SELECT id FROM done)
+"""
+
+# Completion scheduler: persist whatever is due for each listed wall-clock
+# timer at $2 -- completion once the anchor has run past duration, otherwise a
+# raised urgency_level. Rows with nothing due are returned unchanged, so the
+# scheduler can re-arm them. updated_at only moves on completion (a state
+# change); an urgency refresh just catches a derived column up. Joining the
+# ids keeps this a primary-key lookup per id even when most rows are running.
+def _settle_due_sql(urgency: Callable[[str], str]) -> str:
+    return f"""
+    WITH settled AS (
+        UPDATE timers
+        SET elapsed_time = CASE WHEN {_ELAPSED_AT} >= duration THEN duration ELSE elapsed_time END,
+            status = CASE WHEN {_ELAPSED_AT} >= duration THEN 'complete' ELSE status END,
+            urgency_level = {urgency(_ELAPSED_AT)},
+            started_at = CASE WHEN {_ELAPSED_AT} >= duration THEN NULL ELSE started_at END,
+            updated_at = CASE WHEN {_ELAPSED_AT} >= duration THEN $2 ELSE updated_at END
+        FROM unnest($1::uuid[]) AS due(due_id)
+        WHERE id = due_id
+          AND status = 'running'
+          AND started_at IS NOT NULL
+          AND ({_ELAPSED_AT} >= duration OR urgency_level <> {urgency(_ELAPSED_AT)})
+        RETURNING {_COLUMNS}
+    )
+    SELECT {_COLUMNS} FROM settled
+    UNION ALL
+    SELECT {_COLUMNS} FROM timers
+    WHERE id = ANY($1::uuid[]) AND id NOT IN (SELECT id FROM settled)
+"""
+
+# Write-behind tick flush: apply buffered elapsed/status/urgency for many timers
+# in one statement. A row is only written if it is still running and unchanged
+# since the buffer last saw it (version), so a flush can never clobber a
+# stop/reset/start made in the meantime by this or another worker.
+_FLUSH_TICKS_SQL = register("timer_flush_ticks", f"""
+    UPDATE timers AS t
+    SET elapsed_time = v.elapsed_time,
+        status = v.status,
+        urgency_level = v.urgency_level,
+        updated_at = $6
+    FROM unnest($1::uuid[], $2::int[], $3::text[], $4::int[], $5::bigint[])
+        AS v(id, elapsed_time, status, urgency_level, expected_version)
+    WHERE t.id = v.id AND t.status = 'running' AND t.version = v.expected_version
+    RETURNING {", ".join(f"t.{c}" for c in _COLUMNS.split(", "))}
+""")
+
+# Refresh the stored urgency_level of every running timer in one statement
+# ($1 = now). Only rows whose level actually changes are written, and
+# updated_at is left alone: the timer's state has not changed, only a value
+# derived from it.
+def _recompute_urgency_sql(urgency: Callable[[str], str]) -> str:
+    return f"""
+    UPDATE timers
+    SET urgency_level = {urgency(_elapsed_at("$1"))}
+    WHERE status = 'running'
+      AND urgency_level <> {urgency(_elapsed_at("$1"))}
+"""
+
+
+class _UrgencyStatements(NamedTuple):
+    start: str
+    stop: str
+    tick: str
+    complete_if_due: str
+    settle_due: str
+    recompute_urgency: str
+
+
+@register_deferred
+@lru_cache(maxsize=1)
+def _urgency_statements() -> _UrgencyStatements:
+    """Build and register the statements above, which inline URGENCY_THRESHOLDS.
+
+    Built on first use (at the latest when a pool connection is prepared)
+    rather than at import, so importing the repo reads no settings.
+    """
+    thresholds = get_settings().urgency_thresholds_tuple
+
+    def urgency(elapsed: str) -> str:
+        return _urgency_sql(elapsed, thresholds)
+
+    return _UrgencyStatements(
+        start=register("timer_start", _start_sql(urgency)),
+        stop=register("timer_stop", _stop_sql(urgency)),
+        tick=register("timer_tick", _tick_sql(urgency)),
+        complete_if_due=register("timer_complete_if_due", _complete_if_due_sql(urgency)),
+        settle_due=register("timer_settle_due", _settle_due_sql(urgency)),
+        recompute_urgency=register("timer_recompute_urgency", _recompute_urgency_sql(urgency)),
+    )
+
+
+# Retention ($1 = cutoff, $2 = batch size): take up to $2 of the oldest
+# completed timers last written before $1 and move them to timers_archive
+# (or drop them) in one statement. SKIP LOCKED leaves rows another
+# transaction holds to a later batch instead of waiting on them, and the
+# bounded batch keeps each transaction's locks and WAL small.
+_RETENTION_BATCH = """
+    WITH batch AS (
+        SELECT id FROM timers
+        WHERE status = 'complete' AND updated_at < $1
+        ORDER BY updated_at
+        LIMIT $2
+        FOR UPDATE SKIP LOCKED
+    )"""
+_ARCHIVE_COMPLETE_SQL = register("timer_archive_complete", f"""{_RETENTION_BATCH},
+    moved AS (
+        DELETE FROM timers USING batch WHERE timers.id = batch.id
+        RETURNING timers.*
+    )
+    INSERT INTO timers_archive ({_COLUMNS})
+    SELECT {_COLUMNS} FROM moved
+    ON CONFLICT (id) DO NOTHING
+""")
+_DELETE_COMPLETE_SQL = register("timer_delete_complete", f"""{_RETENTION_BATCH}
+    DELETE FROM timers USING batch WHERE timers.id = batch.id
+""")
+
+# Live counts per (status, urgency_level): timer_stats is kept by triggers in
+# the same transaction as every write (migration 008), so this sums at most a
+# few hundred slot rows whatever the size of timers.
+_STATS_SQL = register("timer_stats", """
+    SELECT status, urgency_level, sum(count)::bigint FROM timer_stats GROUP BY 1, 2 HAVING sum(count) <> 0
+""")
+
+# pg_try_advisory_xact_lock key held while reconciling timer_stats ("stats"
+# in ASCII), and its job_runs row (migration 009).
+STATS_RECONCILE_LOCK_KEY = 0x7374617473
+STATS_RECONCILE_JOB = "stats_reconcile"
+
+# Claim this interval's run of a cluster-wide job: no row comes back if
+# another worker ran it less than $2 seconds ago.
+_CLAIM_JOB_RUN_SQL = register("job_run_claim", """
+    INSERT INTO job_runs AS j (name, last_run_at) VALUES ($1, now())
+    ON CONFLICT (name) DO UPDATE SET last_run_at = EXCLUDED.last_run_at
+    WHERE j.last_run_at <= now() - make_interval(secs => $2)
+    RETURNING true
+""")
+
+# Repair timer_stats drift. One statement, so the recount of timers and the
+# sum of timer_stats come from the same snapshot and their difference is exact
+# at it; the difference is then added as a delta, which commutes with the
+# deltas that writers committing meanwhile add through the triggers. Two
+# reconciles must not overlap (each would add the same difference), so it
+# runs under STATS_RECONCILE_LOCK_KEY, see TimerRepo.reconcile_stats. Scans
+# timers: run it periodically, never per request.
+_RECONCILE_STATS_SQL = register("timer_stats_reconcile", """
+    WITH actual AS (
+        SELECT status, urgency_level, count(*) AS n FROM timers GROUP BY 1, 2
+    ), recorded AS (
+        SELECT status, urgency_level, sum(count) AS n FROM timer_stats GROUP BY 1, 2
+    ), drift AS (
+        SELECT status, urgency_level, coalesce(actual.n, 0) - coalesce(recorded.n, 0) AS delta
+        FROM actual FULL JOIN recorded USING (status, urgency_level)
+    ), applied AS (
+        INSERT INTO timer_stats AS s (status, urgency_level, slot, count)
+        SELECT status, urgency_level, 0, delta FROM drift WHERE delta <> 0 ORDER BY 1, 2
+        ON CONFLICT (status, urgency_level, slot) DO UPDATE SET count = s.count + EXCLUDED.count
+    )
+    SELECT coalesce(sum(abs(delta)), 0)::bigint FROM drift
+""")
+
+# Binary import: the stream is COPYed into a temp table dropped at commit, then
+# merged in one statement, so a malformed stream or a row failing a constraint
+# imports nothing and timers that already exist are kept as they are. Not
+# registered: the temp table does not exist when pool connections prepare.
+_IMPORT_TABLE = "timers_import"
+_CREATE_IMPORT_TABLE_SQL = f"CREATE TEMP TABLE {_IMPORT_TABLE} (LIKE timers INCLUDING DEFAULTS) ON COMMIT DROP"
+_MERGE_IMPORT_SQL = f"""
+    INSERT INTO timers ({_COLUMNS})
+    SELECT {_COLUMNS} FROM {_IMPORT_TABLE}
+    ON CONFLICT (id) DO NOTHING
+"""
+
+# Other fixed statements. Everything passed to register() is prepared once per
+# pool connection (app.repos.statements); filtered/paginated queries are built
+# per call and go through asyncpg's statement cache on first use instead.
+_CREATE_SQL = register("timer_create", f"""
+    INSERT INTO timers (id, duration, elapsed_time, status, urgency_level, created_at, updated_at)
+    VALUES ($1, $2, $3, $4, $5, $6, $7)
+    RETURNING {_COLUMNS}
+""")
+# Bulk create: one statement for the whole batch. Ids are generated by the
+# caller so the result can be returned in request order; $3 is the new status
+# and $4 the started_at anchor (NULL unless auto-started on the wall clock).
+_CREATE_MANY_SQL = register("timer_create_many", f"""
+    INSERT INTO timers ({_COLUMNS})
+    SELECT id, duration, 0, $3, 0, $5, $5, $4, 1
+    FROM unnest($1::uuid[], $2::int[]) AS t(id, duration)
+    RETURNING {_COLUMNS}
+""")
+_RUNNING_SQL = register(
+    "timer_running", f"SELECT {_COLUMNS} FROM timers WHERE status = 'running' AND started_at IS NOT NULL"
+)
+_GET_SQL = register("timer_get", f"SELECT {_COLUMNS} FROM timers WHERE id = $1")
+_GET_MANY_SQL = register("timer_get_many", f"SELECT {_COLUMNS} FROM timers WHERE id = ANY($1::uuid[])")
+_LIST_ALL_SQL = register("timer_list_all", f"SELECT {_COLUMNS} FROM timers ORDER BY created_at DESC")
+_UPDATE_SQL = register("timer_update", f"""
+    UPDATE timers
+    SET elapsed_time = $2, status = $3, urgency_level = $4, updated_at = $5, started_at = $6
+    WHERE id = $1
+    RETURNING {_COLUMNS}
+""")
+# The unfiltered list pages (first and following) are what clients poll; the
+# filtered combinations stay per-call.
+_PAGE_SQL = register("timer_page", _page_sql("", 1))
+_PAGE_AFTER_SQL = register("timer_page_after", _page_sql(" WHERE (created_at, id) < ($1, $2)", 3))
+
+
+@register_warmup
+async def _warm_up(conn: asyncpg.Connection) -> None:
+    """Run the per-request statements once on a new connection (see statements.warm_up)."""
+    now = datetime.now(timezone.utc)
+    timer_id = uuid4()
+    await conn.fetchrow(_CREATE_SQL, timer_id, 60, 0, TimerStatus.idle.value, 0, now, now)
+    await conn.fetchrow(_GET_SQL, timer_id)
+    await conn.fetch(_GET_MANY_SQL, [timer_id])
+    sql = _urgency_statements()
+    await conn.fetch(sql.start, [timer_id], now, True)
+    for query in (sql.complete_if_due, sql.settle_due, sql.stop, _RESET_SQL):
+        await conn.fetch(query, [timer_id], now)
+    await conn.fetch(_PAGE_SQL, 1)
+    await conn.fetch(_PAGE_AFTER_SQL, now, timer_id, 1)
+
+
+@instrument_repo(transitions=(
+    "start", "stop", "reset", "tick", "complete_if_due",
+    "start_many", "stop_many", "reset_many", "tick_many", "complete_if_due_many",
+    "settle_due_many", "flush_ticks",
+))
 class TimerRepo:
-    """Data access for the timers table. All queries are parameterized."""
+    """Data access for the timers table. All queries are parameterized.
+
+    With a TimerCache, get_by_id/get_many read through it and every write path
+    stores the row it returned, so this worker's cache never lags its own writes.
+    """
 
-    def __init__(self, pool: asyncpg.Pool) -> None:
+    def __init__(self, pool: asyncpg.Pool, cache: TimerCache | None = None) -> None:
         self._pool = pool
+        self._cache = cache
 
-    async def create(self, duration: int) -> Timer:
-        """Insert a new timer with idle status and elapsed_time=0. Return Timer model."""
-        query = """
-            INSERT INTO timers (id, duration, elapsed_time, status, urgency_level, created_at, updated_at)
-            VALUES ($1, $2, $3, $4, $5, $6, $7)
-            RETURNING id, duration, elapsed_time, status, urgency_level, created_at, updated_at
-        """
-        now = datetime.utcnow()
+    async def create(self, duration: int) -> TimerRow:
+        """Insert a new timer with idle status and elapsed_time=0. Return TimerRow."""
+        now = datetime.now(timezone.utc)
         timer_id = uuid4()
         async with self._pool.acquire() as conn:
             row = await conn.fetchrow(
-                query,
+                _CREATE_SQL,
                 timer_id,
                 duration,
                 0,  # elapsed_time
@@ -30,31 +391,114 @@ class TimerRepo:
                 now,
                 now,
             )
-        return Timer(**dict(row))
-
-    async def get_by_id(self, timer_id: UUID) -> Timer | None:
-        """Fetch timer by ID. Return Timer model or None."""
-        query = """
-            SELECT id, duration, elapsed_time, status, urgency_level, created_at, updated_at
-            FROM timers
-            WHERE id = $1
-        """
+        return self._cached(TimerRow._make(row))
+
+    async def create_many(self, durations: list[int], start: bool = False, wallclock: bool = True) -> list[TimerRow]:
+        """Insert one timer per duration in a single statement, idle or already running. Rows in input order."""
+        if not durations:
+            return []
+        now = datetime.now(timezone.utc)
+        timer_ids = [uuid4() for _ in durations]
+        status = TimerStatus.running if start else TimerStatus.idle
+        started_at = now if start and wallclock else None
+        async with self._pool.acquire() as conn:
+            rows = await conn.fetch(_CREATE_MANY_SQL, timer_ids, durations, status.value, started_at, now)
+        created = {row[0]: self._cached(TimerRow._make(row)) for row in rows}
+        return [created[timer_id] for timer_id in timer_ids]
+
+    async def get_by_id(self, timer_id: UUID) -> TimerRow | None:
+        """Fetch timer by ID. Return TimerRow or None."""
+        if self._cache is not None:
+            cached = self._cache.get(timer_id)
+            if cached is not None:
+                return cached
         async with self._pool.acquire() as conn:
-            row = await conn.fetchrow(query, timer_id)
+            row = await conn.fetchrow(_GET_SQL, timer_id)
         if row is None:
             return None
-        return Timer(**dict(row))
-
-    async def list_all(self) -> list[Timer]:
-        """Fetch all timers. Return list of Timer models."""
-        query = """
-            SELECT id, duration, elapsed_time, status, urgency_level, created_at, updated_at
-            FROM timers
-            ORDER BY created_at DESC
+        return self._cached(TimerRow._make(row))
+
+    async def get_many(self, timer_ids: list[UUID]) -> dict[UUID, TimerRow]:
+        """Fetch a set of timers in one query. Missing ids are absent from the result."""
+        found: dict[UUID, TimerRow] = {}
+        missing = timer_ids
+        if self._cache is not None:
+            missing = []
+            for timer_id in timer_ids:
+                cached = self._cache.get(timer_id)
+                if cached is None:
+                    missing.append(timer_id)
+                else:
+                    found[timer_id] = cached
+            if not missing:
+                return found
+        async with self._pool.acquire() as conn:
+            rows = await conn.fetch(_GET_MANY_SQL, missing)
+        for row in rows:
+            found[row[0]] = self._cached(TimerRow._make(row))
+        return found
+
+    async def list_all(self) -> list[TimerRow]:
+        """Fetch all timers. Return list of TimerRows."""
+        async with self._pool.acquire() as conn:
+            rows = await conn.fetch(_LIST_ALL_SQL)
+        return [TimerRow._make(row) for row in rows]
+
+    async def list_page(
+        self,
+        limit: int | None = None,
+        after: tuple[datetime, UUID] | None = None,
+        status: TimerStatus | None = None,
+        urgency_level: int | None = None,
+    ) -> list[TimerRow]:
+        """Fetch timers newest first, starting after the (created_at, id) keyset `after`.
+
+        Keyset pagination keeps each page an index range scan no matter how deep
+        the caller pages; OFFSET would re-read every skipped row.
         """
+        where, args = _filters(after, status, urgency_level)
+        if limit is not None:
+            args.append(limit)
+        query = _page_sql(where, len(args) if limit is not None else None)
+        async with self._pool.acquire() as conn:
+            rows = await conn.fetch(query, *args)
+        return [TimerRow._make(row) for row in rows]
+
+    async def iter_all(
+        self,
+        status: TimerStatus | None = None,
+        urgency_level: int | None = None,
+        prefetch: int = 500,
+    ) -> AsyncIterator[TimerRow]:
+        """Yield matching timers newest first through a server-side cursor.
+
+        At most `prefetch` rows are held in memory at a time. The pool
+        connection is held until the iterator is exhausted or closed.
+        """
+        where, args = _filters(None, status, urgency_level)
+        query = _page_sql(where, None)
+        async with self._pool.acquire() as conn:
+            async with conn.transaction(readonly=True):
+                async for row in conn.cursor(query, *args, prefetch=prefetch):
+                    yield TimerRow._make(row)
+
+    async def iter_running(self, prefetch: int = 2000) -> AsyncIterator[TimerRow]:
+        """Yield every running wall-clock timer (idx_timers_running), unordered, through a cursor."""
+        async with self._pool.acquire() as conn:
+            async with conn.transaction(readonly=True):
+                async for row in conn.cursor(_RUNNING_SQL, prefetch=prefetch):
+                    yield TimerRow._make(row)
+
+    async def estimate_count(
+        self,
+        status: TimerStatus | None = None,
+        urgency_level: int | None = None,
+    ) -> int:
+        """Planner row estimate for the filtered table: O(1), no scan, approximate."""
+        where, args = _filters(None, status, urgency_level)
         async with self._pool.acquire() as conn:
-            rows = await conn.fetch(query)
-        return [Timer(**dict(row)) for row in rows]
+            plan = await conn.fetchval(f"EXPLAIN (FORMAT JSON) SELECT 1 FROM timers{where}", *args)
+        return int(json.loads(plan)[0]["Plan"]["Plan Rows"])
 
     async def update(
         self,
@@ -62,24 +506,221 @@ class TimerRepo:
         elapsed_time: int,
         status: TimerStatus,
         urgency_level: int,
-    ) -> Timer | None:
-        """Update timer fields and return updated Timer model or None if not found."""
-        query = """
-            UPDATE timers
-            SET elapsed_time = $2, status = $3, urgency_level = $4, updated_at = $5
-            WHERE id = $1
-            RETURNING id, duration, elapsed_time, status, urgency_level, created_at, updated_at
+        started_at: datetime | None = None,
+    ) -> TimerRow | None:
+        """Update timer fields and return updated TimerRow or None if not found.
+
+        started_at is the wall-clock anchor of the current running span; pass None
+        when the timer is not running (or when the tick engine is in use).
         """
-        now = datetime.utcnow()
+        now = datetime.now(timezone.utc)
         async with self._pool.acquire() as conn:
             row = await conn.fetchrow(
-                query,
+                _UPDATE_SQL,
                 timer_id,
                 elapsed_time,
                 status.value,
                 urgency_level,
                 now,
+                started_at,
             )
         if row is None:
             return None
-        return Timer(**dict(row))
+        return self._cached(TimerRow._make(row))
+
+    async def start(self, timer_id: UUID, wallclock: bool = True) -> TimerRow | None:
+        """Atomically set status to running, folding any running span into elapsed_time.
+
+        With wallclock=True a fresh started_at anchor is recorded.
+        """
+        return (await self.start_many([timer_id], wallclock)).get(timer_id)
+
+    async def stop(self, timer_id: UUID) -> TimerRow | None:
+        """Atomically pause a timer (or complete it if its wall clock already ran out)."""
+        return (await self.stop_many([timer_id])).get(timer_id)
+
+    async def reset(self, timer_id: UUID) -> TimerRow | None:
+        """Atomically reset a timer to idle with elapsed_time=0."""
+        return (await self.reset_many([timer_id])).get(timer_id)
+
+    async def tick(self, timer_id: UUID) -> TimerRow | None:
+        """Atomically advance a running timer by one second (tick engine)."""
+        return (await self.tick_many([timer_id])).get(timer_id)
+
+    async def complete_if_due(self, timer_id: UUID) -> TimerRow | None:
+        """Persist completion of a wall-clock timer whose anchor ran past duration.
+
+        Returns the (possibly unchanged) stored row, or None if not found.
+        """
+        return (await self.complete_if_due_many([timer_id])).get(timer_id)
+
+    async def start_many(self, timer_ids: list[UUID], wallclock: bool = True) -> dict[UUID, TimerRow]:
+        """Start every listed timer in one statement. Missing ids are absent from the result."""
+        return await self._transition(_urgency_statements().start, timer_ids, wallclock)
+
+    async def stop_many(self, timer_ids: list[UUID]) -> dict[UUID, TimerRow]:
+        """Stop every listed timer in one statement. Missing ids are absent from the result."""
+        return await self._transition(_urgency_statements().stop, timer_ids)
+
+    async def reset_many(self, timer_ids: list[UUID]) -> dict[UUID, TimerRow]:
+        """Reset every listed timer in one statement. Missing ids are absent from the result."""
+        return await self._transition(_RESET_SQL, timer_ids)
+
+    async def tick_many(self, timer_ids: list[UUID]) -> dict[UUID, TimerRow]:
+        """Tick every listed running timer in one statement. Missing ids are absent from the result."""
+        return await self._transition(_urgency_statements().tick, timer_ids)
+
+    async def complete_if_due_many(self, timer_ids: list[UUID]) -> dict[UUID, TimerRow]:
+        """complete_if_due for a set of timers in one statement."""
+        return await self._transition(_urgency_statements().complete_if_due, timer_ids)
+
+    async def settle_due_many(self, timer_ids: list[UUID]) -> dict[UUID, TimerRow]:
+        """Persist due completions/urgency raises for a set of timers in one statement."""
+        return await self._transition(_urgency_statements().settle_due, timer_ids)
+
+    async def _transition(self, query: str, timer_ids: list[UUID], *args) -> dict[UUID, TimerRow]:
+        now = datetime.now(timezone.utc)
+        async with self._pool.acquire() as conn:
+            rows = await conn.fetch(query, timer_ids, now, *args)
+        return {row[0]: self._cached(TimerRow._make(row)) for row in rows}
+
+    async def flush_ticks(self, rows: list[TimerRow]) -> dict[UUID, TimerRow]:
+        """Persist buffered tick state for many timers in one statement.
+
+        Each row's version must be the stored one it was derived from;
+        rows that no longer match (or stopped running) are skipped and absent
+        from the result.
+        """
+        if not rows:
+            return {}
+        now = datetime.now(timezone.utc)
+        async with self._pool.acquire() as conn:
+            written = await conn.fetch(
+                _FLUSH_TICKS_SQL,
+                [r.id for r in rows],
+                [r.elapsed_time for r in rows],
+                [r.status for r in rows],
+                [r.urgency_level for r in rows],
+                [r.version for r in rows],
+                now,
+            )
+        return {row[0]: self._cached(TimerRow._make(row)) for row in written}
+
+    async def recompute_urgency(self) -> int:
+        """Set-based refresh of urgency_level for all running timers. Returns rows changed."""
+        async with self._pool.acquire() as conn:
+            status = await conn.execute(_urgency_statements().recompute_urgency, datetime.now(timezone.utc))
+        return int(status.split()[-1])
+
+    async def stats(self) -> dict[tuple[str, int], int]:
+        """Timer counts per (status, urgency_level) from the trigger-kept timer_stats: O(1) in table size."""
+        async with self._pool.acquire() as conn:
+            rows = await conn.fetch(_STATS_SQL)
+        return {(status, level): count for status, level, count in rows}
+
+    async def reconcile_stats(self, min_interval: float = 0.0) -> int | None:
+        """Recount timers and correct timer_stats by the difference. Returns the total drift corrected.
+
+        Returns None without scanning when another worker is reconciling right
+        now, or did less than `min_interval` seconds ago. The recount runs
+        after the lock is taken, so it sees every correction committed before.
+        """
+        async with self._pool.acquire() as conn:
+            async with conn.transaction():
+                if not await conn.fetchval("SELECT pg_try_advisory_xact_lock($1)", STATS_RECONCILE_LOCK_KEY):
+                    return None
+                if not await conn.fetchval(_CLAIM_JOB_RUN_SQL, STATS_RECONCILE_JOB, min_interval):
+                    return None
+                return await conn.fetchval(_RECONCILE_STATS_SQL)
+
+    async def archive_complete(self, before: datetime, limit: int) -> int:
+        """Move up to `limit` timers completed before `before` to timers_archive. Returns rows moved."""
+        async with self._pool.acquire() as conn:
+            status = await conn.execute(_ARCHIVE_COMPLETE_SQL, before, limit)
+        return int(status.split()[-1])
+
+    async def delete_complete(self, before: datetime, limit: int) -> int:
+        """Delete up to `limit` timers completed before `before`. Returns rows deleted."""
+        async with self._pool.acquire() as conn:
+            status = await conn.execute(_DELETE_COMPLETE_SQL, before, limit)
+        return int(status.split()[-1])
+
+    async def export_binary(self) -> AsyncIterator[bytes]:
+        """Yield every stored timer as a PGCOPY binary stream, columns in _COPY_COLUMNS order.
+
+        COPY TO STDOUT runs on one pool connection in a background task that
+        feeds a queue of EXPORT_QUEUE_CHUNKS chunks, so memory stays flat
+        however large the table is. Closing the iterator early cancels the COPY.
+        """
+        chunks: asyncio.Queue[bytes | Exception | None] = asyncio.Queue(EXPORT_QUEUE_CHUNKS)
+        async with self._pool.acquire() as conn:
+
+            async def output(data: bytearray) -> None:
+                await chunks.put(bytes(data))
+
+            async def copy() -> None:
+                try:
+                    await conn.copy_from_table("timers", columns=_COPY_COLUMNS, format="binary", output=output)
+                except Exception as exc:
+                    await chunks.put(exc)
+                    return
+                await chunks.put(None)
+
+            task = asyncio.create_task(copy())
+            try:
+                while (chunk := await chunks.get()) is not None:
+                    if isinstance(chunk, Exception):
+                        raise chunk
+                    yield chunk
+            finally:
+                if not task.done():
+                    task.cancel()
+                    await asyncio.gather(task, return_exceptions=True)
+                    # Abandoned mid-COPY: the connection cannot be reset for
+                    # reuse, so drop it and let the pool open a fresh one.
+                    conn.terminate()
+
+    async def import_binary(self, source: AsyncIterable[bytes]) -> tuple[int, int]:
+        """Load a PGCOPY binary stream as produced by export_binary.
+
+        Chunks are forwarded to COPY FROM STDIN as they arrive. Returns
+        (rows received, rows inserted); rows whose id already exists are
+        skipped. Raises asyncpg.DataError or IntegrityConstraintViolationError
+        (and imports nothing) on a malformed stream or invalid row.
+        """
+        async with self._pool.acquire() as conn:
+            async with conn.transaction():
+                await conn.execute(_CREATE_IMPORT_TABLE_SQL)
+                copied = await conn.copy_to_table(
+                    _IMPORT_TABLE, source=source, columns=_COPY_COLUMNS, format="binary"
+                )
+                inserted = await conn.execute(_MERGE_IMPORT_SQL)
+        return int(copied.split()[-1]), int(inserted.split()[-1])
+
+    def _cached(self, row: TimerRow) -> TimerRow:
+        """Write a freshly read or written row through to the cache."""
+        if self._cache is not None:
+            self._cache.put(row)
+        return row
+
+
+def _filters(
+    after: tuple[datetime, UUID] | None,
+    status: TimerStatus | None,
+    urgency_level: int | None,
+) -> tuple[str, list]:
+    """Build the WHERE clause and its parameters for list queries."""
+    conditions: list[str] = []
+    args: list = []
+    if status is not None:
+        args.append(status.value)
+        conditions.append(f"status = ${len(args)}")
+    if urgency_level is not None:
+        args.append(urgency_level)
+        conditions.append(f"urgency_level = ${len(args)}")
+    if after is not None:
+        args.extend(after)
+        conditions.append(f"(created_at, id) < (${len(args) - 1}, ${len(args)})")
+    if not conditions:
+        return "", args
+    return " WHERE " + " AND ".join(conditions), args
@@ -1,4 +1,10 @@
+from dataclasses import asdict
 from fastapi import APIRouter
+from fastapi.responses import JSONResponse
+from app.config import get_settings
+from app.database import get_pool_stats
+from app.services.readiness import get_readiness_probe
+from app.startup import TIMELINE
 
 router = APIRouter(tags=["health"])
 
@@ -7,3 +13,38 @@ router = APIRouter(tags=["health"])
 async def health_check() -> dict:
     """Health check endpoint."""
     return {"status": "ok"}
+
+
+@router.get("/health/live")
+async def liveness() -> dict:
+    """Liveness: the process is up and its event loop answers. Touches no dependency."""
+    return {"status": "ok"}
+
+
+@router.get("/health/ready")
+async def readiness() -> JSONResponse:
+    """Readiness: pool acquire, DB round trip, event-loop lag and background subsystems.
+
+    503 when any check fails or exceeds its latency budget. Results are
+    cached for HEALTH_CACHE_TTL seconds. `startup` is this worker's startup
+    phase breakdown (app.startup).
+    """
+    settings = get_settings()
+    probe = get_readiness_probe(
+        settings.health_pool_acquire_budget_ms / 1000,
+        settings.health_db_budget_ms / 1000,
+        settings.health_loop_lag_budget_ms / 1000,
+        settings.health_cache_ttl,
+        database=settings.timer_backend == "postgres",
+    )
+    result = await probe.check()
+    return JSONResponse(
+        {**result.to_dict(), "startup": TIMELINE.to_dict()}, status_code=200 if result.ready else 503
+    )
+
+
+@router.get("/health/pool")
+async def pool_stats() -> dict:
+    """Connection pool utilisation: size, idle, waiters and acquire latency."""
+    stats = get_pool_stats()
+    return asdict(stats) if stats is not None else {}
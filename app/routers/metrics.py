@@ -0,0 +1,36 @@
+from fastapi import APIRouter, HTTPException, Query
+from fastapi.responses import PlainTextResponse
+from app.config import get_settings
+from app.metrics import REGISTRY
+from app.profiler import profile_event_loop, profiler_running
+
+router = APIRouter(tags=["metrics"])
+
+
+@router.get("/metrics", response_class=PlainTextResponse)
+async def metrics() -> PlainTextResponse:
+    """Prometheus text exposition of request, DB, pool and transition metrics."""
+    return PlainTextResponse(REGISTRY.render(), media_type="text/plain; version=0.0.4; charset=utf-8")
+
+
+@router.post("/debug/profile", response_class=PlainTextResponse)
+async def profile(
+    seconds: float = Query(default=10.0, gt=0),
+    interval_ms: float = Query(default=5.0, ge=1, le=1000),
+) -> PlainTextResponse:
+    """Sample CPU stacks for a fixed window and return them collapsed (flamegraph input).
+
+    Only available with PROFILER_ENABLED; one profile at a time per worker.
+    """
+    settings = get_settings()
+    if not settings.profiler_enabled:
+        raise HTTPException(status_code=404, detail="Profiler disabled")
+    if seconds > settings.profiler_max_seconds:
+        raise HTTPException(status_code=400, detail=f"seconds must be at most {settings.profiler_max_seconds:g}")
+    if profiler_running():
+        raise HTTPException(status_code=409, detail="A profile is already running")
+    try:
+        stacks = await profile_event_loop(seconds, interval_ms / 1000)
+    except RuntimeError as exc:
+        raise HTTPException(status_code=503, detail=str(exc))
+    return PlainTextResponse(stacks)
@@ -1,99 +1,475 @@
+import asyncio
+import base64
+import json
+from datetime import datetime
+from typing import Literal
 from uuid import UUID
-from fastapi import APIRouter, Depends, HTTPException
+import asyncpg
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, WebSocket, WebSocketDisconnect
+from fastapi.responses import Response, StreamingResponse
+from app.config import get_settings
 from app.database import get_pool
+from app.repos.base import TimerStore
+from app.repos.memory_repo import get_memory_repo
+from app.repos.timer_cache import get_timer_cache
 from app.repos.timer_repo import TimerRepo
+from app.services.completion_scheduler import get_completion_scheduler
+from app.services.tick_buffer import get_tick_buffer
 from app.services.timer_service import TimerService
+from app.services.timer_stream import TimerStreamHub, get_stream_hub
+from app.services.single_flight import get_single_flight
+from app.services.timer_watch import get_timer_watch
+from app.models.encoding import (
+    RawJSONResponse,
+    encode_batch,
+    encode_timer,
+    encode_timer_list,
+    timer_json,
+)
 from app.models.timer import (
+    BatchTimerRequest,
+    BatchTimerResponse,
+    BulkCreateTimersRequest,
     CreateTimerRequest,
     TimerResponse,
     TimerListResponse,
+    TimerRow,
+    TimerStatsResponse,
+    TimerStatus,
 )
 
+# Handlers return pre-encoded RawJSONResponse bodies built from TimerRow, so
+# the response_model declarations below only document the schema; FastAPI does
+# not re-validate a returned Response.
 router = APIRouter(prefix="/api/v1/timers", tags=["timers"])
 
+# Seconds of silence after which an SSE comment is sent to keep proxies from
+# closing the connection.
+SSE_KEEPALIVE_SECONDS = 15.0
+
+# NDJSON lines buffered per chunk written to the client.
+NDJSON_CHUNK_ROWS = 200
+
+# Timers inserted per statement by POST :bulk; each chunk's ids are streamed
+# to the client as soon as it commits.
+BULK_CREATE_CHUNK_ROWS = 1000
+
+# Longest ?wait= a GET /{timer_id} long-poll may park for.
+LONG_POLL_MAX_SECONDS = 60.0
+
+# Most timers one WebSocket connection may be subscribed to at once; every
+# subscribed timer is re-read on each hub poll.
+WS_MAX_TIMERS = 1000
+
+# Media type of GET /export and POST /import bodies: PostgreSQL's binary COPY
+# format with the columns id, duration, elapsed_time, status, urgency_level,
+# created_at, updated_at, started_at.
+PGCOPY_MEDIA_TYPE = "application/vnd.timers.pgcopy"
+
+
+async def get_timer_repo() -> TimerStore:
+    """Build a TimerRepo on the shared pool and read cache (or the in-memory repo, TIMER_BACKEND=memory)."""
+    settings = get_settings()
+    if settings.timer_backend == "memory":
+        return get_memory_repo(settings.memory_snapshot_path)
+    pool = await get_pool()
+    return TimerRepo(pool, cache=get_timer_cache(settings.timer_cache_size, settings.timer_cache_ttl))
+
 
 async def get_timer_service() -> TimerService:
     """Dependency: build TimerService from pool -> repo -> service."""
-    pool = await get_pool()
-    repo = TimerRepo(pool)
-    return TimerService(repo)
+    settings = get_settings()
+    repo = await get_timer_repo()
+    wallclock = settings.timer_engine == "wallclock"
+    tick_buffer = None if wallclock else get_tick_buffer(get_timer_repo, settings.tick_flush_interval_ms)
+    return TimerService(
+        repo,
+        wallclock=wallclock,
+        tick_buffer=tick_buffer,
+        urgency_thresholds=settings.urgency_thresholds_tuple,
+        completion_scheduler=get_completion_scheduler(),
+        watch=get_timer_watch(),
+        read_flight=get_single_flight("get_timer"),
+    )
+
+
+def get_timer_stream_hub() -> TimerStreamHub:
+    """Process-wide push scheduler shared by SSE and WebSocket clients."""
+    return get_stream_hub(get_timer_service, get_settings().stream_poll_interval)
+
+
+def _push_unavailable() -> str | None:
+    """Push frames only carry progress under the wall-clock engine; tick clients must keep ticking."""
+    if get_settings().timer_engine != "wallclock":
+        return "Push updates require TIMER_ENGINE=wallclock"
+    return None
+
+
+def _urgency_level_filter(
+    urgency_level: int | None = Query(default=None, ge=0, description="0 up to the number of URGENCY_THRESHOLDS"),
+) -> int | None:
+    """?urgency_level=, bounded by the configured levels rather than the default four."""
+    levels = len(get_settings().urgency_thresholds_tuple) + 1
+    if urgency_level is not None and urgency_level >= levels:
+        raise HTTPException(status_code=422, detail=f"urgency_level must be between 0 and {levels - 1}")
+    return urgency_level
 
 
 @router.post("", status_code=201, response_model=TimerResponse)
 async def create_timer(
     body: CreateTimerRequest,
     service: TimerService = Depends(get_timer_service),
-) -> TimerResponse:
+) -> RawJSONResponse:
     """Create a new timer with the given duration in seconds."""
     timer = await service.create_timer(body.duration)
-    return TimerResponse.model_validate(timer, from_attributes=True)
+    return RawJSONResponse(encode_timer(timer), status_code=201)
 
 
 @router.get("", response_model=TimerListResponse)
 async def list_timers(
+    limit: int = Query(default=100, ge=1, le=1000, description="Page size"),
+    cursor: str | None = Query(default=None, description="next_cursor from the previous page"),
+    status: TimerStatus | None = Query(default=None),
+    urgency_level: int | None = Depends(_urgency_level_filter),
+    estimate: bool = Query(default=False, description="Include a cheap total_estimate"),
+    format: Literal["json", "ndjson"] = Query(
+        default="json", description="ndjson streams every matching timer, one per line"
+    ),
     service: TimerService = Depends(get_timer_service),
-) -> TimerListResponse:
-    """List all timers with current status and urgency_level."""
-    timers = await service.list_timers()
-    items = [TimerResponse.model_validate(t, from_attributes=True) for t in timers]
-    return TimerListResponse(items=items, count=len(items))
+):
+    """List timers newest first with current status and urgency_level.
+
+    Pages are keyset-paginated on (created_at, id). With format=ndjson all
+    matching timers are streamed from a server-side cursor instead.
+    """
+    if format == "ndjson":
+        return StreamingResponse(
+            _ndjson(service.stream_timers(status, urgency_level)),
+            media_type="application/x-ndjson",
+        )
+    after = _decode_cursor(cursor) if cursor else None
+    timers = await service.list_timers(limit + 1, after, status, urgency_level)
+    next_cursor = _encode_cursor(timers[limit - 1]) if len(timers) > limit else None
+    total_estimate = await service.estimate_count(status, urgency_level) if estimate else None
+    return RawJSONResponse(encode_timer_list(timers[:limit], next_cursor, total_estimate))
+
+
+@router.get("/stats", response_model=TimerStatsResponse)
+async def timer_stats(service: TimerService = Depends(get_timer_service)) -> dict:
+    """Count timers by status and urgency_level.
+
+    Read from counters every write keeps up to date (a trigger-maintained
+    table in PostgreSQL), so the cost does not grow with the number of timers.
+    Counts reflect stored state, like ?status= and ?urgency_level= filters.
+    """
+    return await service.stats()
+
+
+@router.get("/export", response_class=StreamingResponse)
+async def export_timers(service: TimerService = Depends(get_timer_service)) -> StreamingResponse:
+    """Stream every stored timer in PostgreSQL binary COPY format, for backup or migration.
+
+    Rows are stored state (elapsed_time is not projected; running timers keep
+    their started_at anchor). Memory use is flat regardless of table size.
+    """
+    _require_postgres("Export")
+    return StreamingResponse(
+        service.export_timers(),
+        media_type=PGCOPY_MEDIA_TYPE,
+        headers={"Content-Disposition": 'attachment; filename="timers.pgcopy"'},
+    )
+
+
+@router.post("/import")
+async def import_timers(request: Request, service: TimerService = Depends(get_timer_service)) -> dict:
+    """Load a GET /export body. Timers whose id already exists are left untouched.
+
+    The upload is streamed into COPY as it arrives and applied in one
+    transaction: a malformed stream or invalid row imports nothing (400).
+    """
+    _require_postgres("Import")
+    try:
+        received, imported = await service.import_timers(request.stream())
+    except (asyncpg.DataError, asyncpg.IntegrityConstraintViolationError) as exc:
+        raise HTTPException(status_code=400, detail=f"Invalid import stream: {exc}")
+    return {"received": received, "imported": imported, "skipped": received - imported}
+
+
+def _require_postgres(operation: str) -> None:
+    if get_settings().timer_backend != "postgres":
+        raise HTTPException(status_code=501, detail=f"{operation} requires TIMER_BACKEND=postgres")
+
+
+def _encode_cursor(timer: TimerRow) -> str:
+    """Opaque keyset cursor for the page after `timer`."""
+    raw = f"{timer.created_at.isoformat()}|{timer.id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def _decode_cursor(cursor: str) -> tuple[datetime, UUID]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)).decode()
+        created_at, timer_id = raw.split("|")
+        return datetime.fromisoformat(created_at), UUID(timer_id)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+async def _ndjson(timers, encode=timer_json):
+    """Encode timers as NDJSON, flushing every NDJSON_CHUNK_ROWS lines."""
+    lines: list[str] = []
+    async for timer in timers:
+        lines.append(encode(timer))
+        if len(lines) >= NDJSON_CHUNK_ROWS:
+            yield "\n".join(lines) + "\n"
+            lines.clear()
+    if lines:
+        yield "\n".join(lines) + "\n"
+
+
+def _batch_response(timer_ids: list[UUID], timers: list[TimerRow | None]) -> RawJSONResponse:
+    """Pair each requested id with its timer or a not-found error, in request order."""
+    return RawJSONResponse(encode_batch(zip(timer_ids, timers)))
 
 
-@router.get("/{timer_id}", response_model=TimerResponse)
+@router.post(":bulk", status_code=201, response_class=StreamingResponse)
+async def bulk_create_timers(
+    body: BulkCreateTimersRequest,
+    service: TimerService = Depends(get_timer_service),
+) -> StreamingResponse:
+    """Create up to 10000 timers, optionally already running, in a few INSERT statements.
+
+    Streams NDJSON, one {"id": ...} line per timer in request order, as each
+    chunk of BULK_CREATE_CHUNK_ROWS commits. If a chunk fails the stream ends
+    early; every id already received was created.
+    """
+    timers = service.create_timers([t.duration for t in body.timers], body.start, BULK_CREATE_CHUNK_ROWS)
+    return StreamingResponse(_ndjson(timers, _id_json), status_code=201, media_type="application/x-ndjson")
+
+
+def _id_json(timer: TimerRow) -> str:
+    return f'{{"id":"{timer.id}"}}'
+
+
+@router.post(":start", response_model=BatchTimerResponse)
+async def start_timers(
+    body: BatchTimerRequest,
+    service: TimerService = Depends(get_timer_service),
+) -> RawJSONResponse:
+    """Start many timers in one request."""
+    return _batch_response(body.ids, await service.start_timers(body.ids))
+
+
+@router.post(":stop", response_model=BatchTimerResponse)
+async def stop_timers(
+    body: BatchTimerRequest,
+    service: TimerService = Depends(get_timer_service),
+) -> RawJSONResponse:
+    """Stop many timers in one request."""
+    return _batch_response(body.ids, await service.stop_timers(body.ids))
+
+
+@router.post(":reset", response_model=BatchTimerResponse)
+async def reset_timers(
+    body: BatchTimerRequest,
+    service: TimerService = Depends(get_timer_service),
+) -> RawJSONResponse:
+    """Reset many timers in one request."""
+    return _batch_response(body.ids, await service.reset_timers(body.ids))
+
+
+@router.post(":tick", response_model=BatchTimerResponse)
+async def tick_timers(
+    body: BatchTimerRequest,
+    service: TimerService = Depends(get_timer_service),
+) -> RawJSONResponse:
+    """Tick many timers in one request."""
+    return _batch_response(body.ids, await service.tick_timers(body.ids))
+
+
+@router.websocket("/ws")
+async def timers_websocket(websocket: WebSocket) -> None:
+    """Multiplexed push channel for many timers over one connection.
+
+    Client messages: {"subscribe": [ids], "cadence": seconds | null} and
+    {"unsubscribe": [ids]}, with at most WS_MAX_TIMERS ids subscribed; a
+    message that is not valid JSON or breaks a rule gets {"error": ...} and
+    changes nothing. Frames are sent when a timer's status or
+    urgency_level changes, or every `cadence` seconds if one is set.
+    """
+    await websocket.accept()
+    unavailable = _push_unavailable()
+    if unavailable:
+        await websocket.close(code=1008, reason=unavailable)
+        return
+    hub = get_timer_stream_hub()
+    subscription = hub.subscribe(set())
+
+    async def pump() -> None:
+        while True:
+            frame = await subscription.next_frame()
+            await websocket.send_text(frame)
+
+    sender = asyncio.create_task(pump())
+    try:
+        while True:
+            frame = await websocket.receive()
+            if frame["type"] == "websocket.disconnect":
+                break
+            try:
+                message = json.loads(frame["text"])
+                subscribe = {UUID(str(i)) for i in message.get("subscribe", [])}
+                unsubscribe = {UUID(str(i)) for i in message.get("unsubscribe", [])}
+                cadence = message.get("cadence", subscription.cadence)
+                cadence = float(cadence) if cadence is not None else None
+            except (AttributeError, KeyError, TypeError, ValueError):
+                # Includes binary frames, which carry "bytes" instead of "text".
+                await websocket.send_json({"error": "Invalid message"})
+                continue
+            if cadence is not None and cadence <= 0:
+                await websocket.send_json({"error": "cadence must be positive"})
+                continue
+            if len((subscription.timer_ids - unsubscribe) | subscribe) > WS_MAX_TIMERS:
+                await websocket.send_json({"error": f"at most {WS_MAX_TIMERS} timers per connection"})
+                continue
+            subscription.cadence = cadence
+            subscription.unsubscribe_ids(unsubscribe)
+            subscription.timer_ids |= subscribe
+            hub.wake()
+    except WebSocketDisconnect:
+        pass
+    finally:
+        sender.cancel()
+        # Retrieve its outcome: a send to an already closed socket may have failed it.
+        await asyncio.gather(sender, return_exceptions=True)
+        hub.unsubscribe(subscription)
+
+
+@router.get("/{timer_id}/stream")
+async def stream_timer(
+    timer_id: UUID,
+    cadence: float | None = Query(default=None, gt=0, description="Seconds between frames for an unchanged timer"),
+    service: TimerService = Depends(get_timer_service),
+) -> StreamingResponse:
+    """Server-Sent Events for one timer: a frame when status or urgency_level changes, or every `cadence` seconds."""
+    unavailable = _push_unavailable()
+    if unavailable:
+        raise HTTPException(status_code=409, detail=unavailable)
+    if await service.get_timer(timer_id) is None:
+        raise HTTPException(status_code=404, detail="Timer not found")
+    hub = get_timer_stream_hub()
+
+    async def events():
+        subscription = hub.subscribe({timer_id}, cadence)
+        try:
+            while True:
+                frame = await subscription.next_frame(timeout=SSE_KEEPALIVE_SECONDS)
+                yield ": keepalive\n\n" if frame is None else f"data: {frame}\n\n"
+        finally:
+            hub.unsubscribe(subscription)
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@router.get("/{timer_id}", response_model=TimerResponse, responses={304: {"description": "Not modified"}})
 async def get_timer(
     timer_id: UUID,
+    request: Request,
+    wait: float | None = Query(
+        default=None, gt=0, le=LONG_POLL_MAX_SECONDS, description="Long-poll: seconds to wait for a change"
+    ),
+    since: int | None = Query(default=None, description="Long-poll: X-Timer-Version the client already has"),
     service: TimerService = Depends(get_timer_service),
-) -> TimerResponse:
-    """Retrieve details of a specific timer."""
-    timer = await service._repo.get_by_id(timer_id)
+) -> Response:
+    """Retrieve details of a specific timer.
+
+    Responses carry an ETag and the stored version (X-Timer-Version, which
+    the database raises by one per committed write); a matching
+    If-None-Match gets 304 without a body. With ?wait=&since= the
+    request parks until the timer's version is no longer `since`, or its
+    projected status/urgency_level changes, and 304s if `wait` passes first.
+    """
+    if wait is not None:
+        if since is None:
+            raise HTTPException(status_code=400, detail="wait requires since")
+        timer, changed = await service.wait_for_change(timer_id, since, wait)
+    else:
+        timer = await service.get_timer(timer_id)
+        changed = True
     if timer is None:
         raise HTTPException(status_code=404, detail="Timer not found")
-    return TimerResponse.model_validate(timer, from_attributes=True)
+    etag = _etag(timer)
+    headers = {"ETag": etag, "X-Timer-Version": str(timer.version), "Cache-Control": "no-cache"}
+    if not changed or _etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=headers)
+    return RawJSONResponse(encode_timer(timer), headers=headers)
+
+
+def _etag(timer: TimerRow) -> str:
+    """Strong validator of a timer response: stored version and updated_at plus the (projected) elapsed_time.
+
+    The rest of the body is either stored with that version or derived from
+    elapsed_time, so equal tags mean identical bodies. updated_at tells apart
+    rows that restart at version 1, such as a timer re-imported after deletion.
+    """
+    return f'"{timer.version}.{timer.updated_at.timestamp():.6f}.{timer.elapsed_time}"'
+
+
+def _etag_matches(if_none_match: str | None, etag: str) -> bool:
+    """If-None-Match uses weak comparison: a W/ prefix is ignored."""
+    if not if_none_match:
+        return False
+    tags = [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]
+    return "*" in tags or etag in tags
 
 
 @router.post("/{timer_id}/start", response_model=TimerResponse)
 async def start_timer(
     timer_id: UUID,
     service: TimerService = Depends(get_timer_service),
-) -> TimerResponse:
+) -> RawJSONResponse:
     """Start a timer by setting status to running."""
     timer = await service.start_timer(timer_id)
     if timer is None:
         raise HTTPException(status_code=404, detail="Timer not found")
-    return TimerResponse.model_validate(timer, from_attributes=True)
+    return RawJSONResponse(encode_timer(timer))
 
 
 @router.post("/{timer_id}/stop", response_model=TimerResponse)
 async def stop_timer(
     timer_id: UUID,
     service: TimerService = Depends(get_timer_service),
-) -> TimerResponse:
+) -> RawJSONResponse:
     """Stop a timer by setting status to paused."""
     timer = await service.stop_timer(timer_id)
     if timer is None:
         raise HTTPException(status_code=404, detail="Timer not found")
-    return TimerResponse.model_validate(timer, from_attributes=True)
+    return RawJSONResponse(encode_timer(timer))
 
 
 @router.post("/{timer_id}/reset", response_model=TimerResponse)
 async def reset_timer(
     timer_id: UUID,
     service: TimerService = Depends(get_timer_service),
-) -> TimerResponse:
+) -> RawJSONResponse:
     """Reset a timer to idle status with elapsed_time=0."""
     timer = await service.reset_timer(timer_id)
     if timer is None:
         raise HTTPException(status_code=404, detail="Timer not found")
-    return TimerResponse.model_validate(timer, from_attributes=True)
+    return RawJSONResponse(encode_timer(timer))
 
 
 @router.post("/{timer_id}/tick", response_model=TimerResponse)
 async def tick_timer(
     timer_id: UUID,
     service: TimerService = Depends(get_timer_service),
-) -> TimerResponse:
-    """Advance the timer by 1 second. Called by the client each second while running."""
+) -> RawJSONResponse:
+    """Advance the timer by 1 second (tick engine) or report its wall-clock state (wallclock engine)."""
     timer = await service.tick_timer(timer_id)
     if timer is None:
         raise HTTPException(status_code=404, detail="Timer not found")
-    return TimerResponse.model_validate(timer, from_attributes=True)
+    return RawJSONResponse(encode_timer(timer))
@@ -0,0 +1,233 @@
+import asyncio
+import logging
+from dataclasses import asdict, dataclass
+from typing import Protocol
+from uuid import UUID
+import asyncpg
+
+logger = logging.getLogger(__name__)
+
+# Channel the timers_notify_* triggers (migration 005) publish to.
+CHANGE_CHANNEL = "timer_changes"
+
+# Changed timer id -> its new version (TimerRow.version, migration 010), or
+# None when the timer was deleted.
+Changes = dict[UUID, int | None]
+
+
+class ChangeConsumer(Protocol):
+    """In-process consumer of the change feed.
+
+    Both methods run on the event loop inside the dispatch step and must not
+    block: consumers that need I/O record the ids and wake their own task.
+    """
+
+    def on_changes(self, changes: Changes) -> None:
+        """Timers written since the last dispatch, one entry per id."""
+
+    def on_reset(self) -> None:
+        """Notifications may have been lost (reconnect or overflow); resync."""
+
+
+@dataclass
+class FeedStats:
+    """Counters reported by ChangeFeed.stats()."""
+    connected: bool = False
+    notifications: int = 0
+    changes: int = 0
+    coalesced: int = 0
+    dispatches: int = 0
+    overflows: int = 0
+    reconnects: int = 0
+    pending: int = 0
+
+
+def parse_payload(payload: str) -> Changes:
+    """Parse a trigger payload: newline-separated "<id>,<version>" or "<id>" (delete) entries."""
+    changes: Changes = {}
+    for entry in payload.splitlines():
+        timer_id, _, version = entry.partition(",")
+        try:
+            changes[UUID(timer_id)] = int(version) if version else None
+        except ValueError:
+            logger.warning("ignoring malformed %s entry: %r", CHANGE_CHANNEL, entry)
+    return changes
+
+
+class ChangeFeed:
+    """Per-worker feed of timer writes made by any worker.
+
+    Holds one dedicated LISTEN connection outside the pool. Notifications are
+    coalesced into a pending map keyed by timer id (latest version wins) and
+    dispatched to the consumers at most once per `coalesce_window` seconds, so
+    a burst of writes to the same timers costs one dispatch. Pending ids are
+    bounded by `max_pending`: past it the pending changes are dropped and the
+    consumers are reset instead, which turns a write storm into one resync
+    rather than unbounded memory. Losing the connection resets the consumers
+    too, since notifications sent meanwhile are gone.
+    """
+
+    def __init__(
+        self,
+        dsn: str,
+        coalesce_window: float = 0.02,
+        max_pending: int = 10000,
+        reconnect_delay: float = 1.0,
+    ) -> None:
+        self._dsn = dsn
+        self._coalesce_window = coalesce_window
+        self._max_pending = max_pending
+        self._reconnect_delay = reconnect_delay
+        self._consumers: list[ChangeConsumer] = []
+        self._pending: Changes = {}
+        self._overflowed = False
+        self._ready = asyncio.Event()
+        self._connected = asyncio.Event()
+        self._stats = FeedStats()
+        self._tasks: list[asyncio.Task] = []
+
+    def subscribe(self, consumer: ChangeConsumer) -> None:
+        """Add a consumer; consumers are dispatched to in subscription order."""
+        if consumer not in self._consumers:
+            self._consumers.append(consumer)
+
+    def unsubscribe(self, consumer: ChangeConsumer) -> None:
+        if consumer in self._consumers:
+            self._consumers.remove(consumer)
+
+    @property
+    def running(self) -> bool:
+        """Both the listener and the dispatcher tasks are alive (the connection may be down)."""
+        return bool(self._tasks) and not any(task.done() for task in self._tasks)
+
+    def start(self) -> None:
+        if not self._tasks:
+            self._tasks = [asyncio.create_task(self._listen()), asyncio.create_task(self._dispatch_loop())]
+
+    async def wait_connected(self, timeout: float) -> bool:
+        """Wait until the LISTEN connection is up. Returns False on timeout."""
+        try:
+            await asyncio.wait_for(self._connected.wait(), timeout)
+        except asyncio.TimeoutError:
+            return False
+        return True
+
+    async def close(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        for task in self._tasks:
+            try:
+                await task
+            except asyncio.CancelledError:
+                pass
+        self._tasks = []
+        self._consumers.clear()
+
+    def stats(self) -> FeedStats:
+        return FeedStats(**{**asdict(self._stats), "pending": len(self._pending)})
+
+    def handle_payload(self, payload: str) -> None:
+        """Coalesce one notification into the pending changes (the LISTEN callback)."""
+        self._stats.notifications += 1
+        if self._overflowed:
+            return
+        for timer_id, version in parse_payload(payload).items():
+            self._stats.changes += 1
+            if timer_id in self._pending:
+                self._stats.coalesced += 1
+                known = self._pending[timer_id]
+                # A delete is final; otherwise keep the newest version.
+                if known is None or (version is not None and version <= known):
+                    continue
+            self._pending[timer_id] = version
+        if len(self._pending) > self._max_pending:
+            self._stats.overflows += 1
+            self._pending.clear()
+            self._overflowed = True
+        self._ready.set()
+
+    def request_reset(self) -> None:
+        """Reset the consumers at the next dispatch (pending changes are subsumed)."""
+        self._pending.clear()
+        self._overflowed = True
+        self._ready.set()
+
+    def dispatch_pending(self) -> None:
+        """Hand the pending changes (or a reset) to every consumer."""
+        changes, self._pending = self._pending, {}
+        reset, self._overflowed = self._overflowed, False
+        self._ready.clear()
+        if not changes and not reset:
+            return
+        self._stats.dispatches += 1
+        for consumer in list(self._consumers):
+            try:
+                if reset:
+                    consumer.on_reset()
+                else:
+                    consumer.on_changes(changes)
+            except Exception:
+                logger.exception("change feed consumer %r failed", consumer)
+
+    async def _dispatch_loop(self) -> None:
+        while True:
+            await self._ready.wait()
+            if self._coalesce_window > 0:
+                await asyncio.sleep(self._coalesce_window)
+            self.dispatch_pending()
+
+    async def _listen(self) -> None:
+        connected_before = False
+        while True:
+            conn = None
+            try:
+                conn = await asyncpg.connect(self._dsn)
+                lost = asyncio.Event()
+                conn.add_termination_listener(lambda _conn: lost.set())
+                await conn.add_listener(
+                    CHANGE_CHANNEL, lambda _conn, _pid, _channel, payload: self.handle_payload(payload)
+                )
+                self._stats.connected = True
+                self._connected.set()
+                if connected_before:
+                    # Writes made while we were not listening were never seen.
+                    self._stats.reconnects += 1
+                    self.request_reset()
+                connected_before = True
+                await lost.wait()
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("change feed listener failed")
+            finally:
+                self._stats.connected = False
+                self._connected.clear()
+                if conn is not None and not conn.is_closed():
+                    await conn.close()
+            if connected_before:
+                self.request_reset()
+            await asyncio.sleep(self._reconnect_delay)
+
+
+_feed: ChangeFeed | None = None
+
+
+def start_change_feed(dsn: str, coalesce_window: float, max_pending: int) -> ChangeFeed:
+    """Start the process-wide feed (called from the app lifespan)."""
+    global _feed
+    if _feed is None:
+        _feed = ChangeFeed(dsn, coalesce_window, max_pending)
+        _feed.start()
+    return _feed
+
+
+def get_change_feed() -> ChangeFeed | None:
+    """The running feed, or None when it was not started (tests, scripts)."""
+    return _feed
+
+
+async def close_change_feed() -> None:
+    global _feed
+    if _feed is not None:
+        await _feed.close()
+        _feed = None
@@ -0,0 +1,302 @@
+import asyncio
+import heapq
+import logging
+import time
+from collections import OrderedDict
+from datetime import timezone
+from typing import Awaitable, Callable, Iterable
+from uuid import UUID
+from app.models.timer import TimerRow, TimerStatus
+from app.repos.base import TimerStore
+from app.services.urgency import DEFAULT_THRESHOLDS
+
+logger = logging.getLogger(__name__)
+
+# Due timers settled per statement; the loop yields to other tasks between
+# batches, which bounds event-loop lag when many deadlines coincide.
+SETTLE_BATCH_SIZE = 1000
+
+# Re-arm delay for a timer the database did not consider due yet (clock skew
+# between workers, or a wake-up a hair early).
+RETRY_DELAY = 0.05
+
+# Re-arm delay for a batch whose settle statement failed.
+FAILURE_BACKOFF = 1.0
+
+# Versions remembered for recently disarmed timers, so the change feed's echo
+# of our own completions does not trigger a re-read.
+RECENT_VERSIONS = 10000
+
+
+def next_deadline(timer: TimerRow, thresholds: tuple[int, ...] = DEFAULT_THRESHOLDS) -> float | None:
+    """Epoch seconds at which a running wall-clock timer next needs a write.
+
+    That is the next urgency threshold above its stored urgency_level, or its
+    completion if that comes first. None for timers that are not running on
+    a wall-clock anchor.
+    """
+    if timer.status != TimerStatus.running or timer.started_at is None:
+        return None
+    target = timer.duration
+    if timer.duration > 0 and timer.urgency_level < len(thresholds):
+        # First whole second at which elapsed * 100 >= duration * threshold.
+        crossing = -(-timer.duration * thresholds[timer.urgency_level] // 100)
+        target = min(target, crossing)
+    started_at = timer.started_at
+    if started_at.tzinfo is None:
+        started_at = started_at.replace(tzinfo=timezone.utc)
+    return started_at.timestamp() + max(0, target - timer.elapsed_time)
+
+
+class CompletionScheduler:
+    """In-process scheduler that completes wall-clock timers on time.
+
+    Keeps one deadline per running timer (next_deadline) in a min-heap:
+    O(log n) to arm, O(1) to peek the earliest. The heap is rebuilt from the
+    running timers at startup and every `resync_interval` seconds (picking up
+    timers started by other workers); local transitions re-arm or disarm
+    their timers immediately through track(). As a change feed consumer it
+    re-reads timers other workers wrote (skipping versions it already has) and
+    rebuilds on a feed reset, so the periodic resync is only a backstop. Due
+    timers are settled in
+    batches with TimerRepo.settle_due_many, whose guards make a stale or
+    duplicate (another worker's) deadline harmless.
+    """
+
+    def __init__(
+        self,
+        repo_factory: Callable[[], Awaitable[TimerStore]],
+        thresholds: tuple[int, ...] = DEFAULT_THRESHOLDS,
+        resync_interval: float = 60.0,
+    ) -> None:
+        self._repo_factory = repo_factory
+        self._thresholds = thresholds
+        self._resync_interval = resync_interval
+        # Authoritative deadline per timer; heap entries that disagree are stale.
+        self._deadlines: dict[UUID, float] = {}
+        self._heap: list[tuple[float, UUID]] = []
+        # Stored version (TimerRow.version) of each armed timer and of recently disarmed ones.
+        self._versions: dict[UUID, int] = {}
+        self._recent: OrderedDict[UUID, int] = OrderedDict()
+        self._refresh: set[UUID] = set()
+        self._rebuild_requested = False
+        self._tracked_during_rebuild: list[TimerRow] | None = None
+        self._wakeup = asyncio.Event()
+        # Set once the first rebuild has loaded the running timers.
+        self._loaded = asyncio.Event()
+        self._task: asyncio.Task | None = None
+        self.settled = 0
+
+    @property
+    def pending(self) -> int:
+        return len(self._deadlines)
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def wait_loaded(self, timeout: float) -> bool:
+        """Wait until the running timers have been loaded once. Returns False on timeout."""
+        try:
+            await asyncio.wait_for(self._loaded.wait(), timeout)
+        except asyncio.TimeoutError:
+            return False
+        return True
+
+    async def close(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def next_due(self) -> float | None:
+        """Earliest armed deadline (epoch seconds), or None."""
+        self._drop_stale()
+        return self._heap[0][0] if self._heap else None
+
+    def track(self, timers: Iterable[TimerRow], not_before: float | None = None) -> None:
+        """Arm running timers at their next deadline and disarm everything else."""
+        timers = list(timers)
+        if self._tracked_during_rebuild is not None:
+            self._tracked_during_rebuild.extend(timers)
+        earliest = self.next_due()
+        for timer in timers:
+            deadline = next_deadline(timer, self._thresholds)
+            if deadline is None:
+                self._disarm(timer.id)
+                self._remember(timer.id, timer.version)
+                continue
+            self._versions[timer.id] = timer.version
+            if not_before is not None:
+                deadline = max(deadline, not_before)
+            if self._deadlines.get(timer.id) == deadline:
+                continue
+            self._deadlines[timer.id] = deadline
+            heapq.heappush(self._heap, (deadline, timer.id))
+            if earliest is None or deadline < earliest:
+                earliest = deadline
+                self._wakeup.set()
+        if len(self._heap) > 2 * len(self._deadlines) + 1024:
+            self._compact()
+
+    async def rebuild(self) -> None:
+        """Reload every running wall-clock timer's deadline from the database."""
+        repo = await self._repo_factory()
+        self._tracked_during_rebuild = []
+        deadlines: dict[UUID, float] = {}
+        versions: dict[UUID, int] = {}
+        try:
+            async for timer in repo.iter_running():
+                deadline = next_deadline(timer, self._thresholds)
+                if deadline is not None:
+                    deadlines[timer.id] = deadline
+                    versions[timer.id] = timer.version
+        finally:
+            tracked, self._tracked_during_rebuild = self._tracked_during_rebuild, None
+        self._deadlines = deadlines
+        self._versions = versions
+        self._compact()
+        # Transitions made while the snapshot was being read win over it.
+        self.track(tracked)
+        self._loaded.set()
+        self._wakeup.set()
+
+    async def run_due(self, now: float | None = None) -> int:
+        """Settle up to SETTLE_BATCH_SIZE timers whose deadline has passed. Returns how many."""
+        now = time.time() if now is None else now
+        due: list[UUID] = []
+        while self._heap and self._heap[0][0] <= now and len(due) < SETTLE_BATCH_SIZE:
+            deadline, timer_id = heapq.heappop(self._heap)
+            if self._deadlines.get(timer_id) == deadline:
+                self._disarm(timer_id)
+                due.append(timer_id)
+        if not due:
+            return 0
+        try:
+            repo = await self._repo_factory()
+            settled = await repo.settle_due_many(due)
+        except Exception:
+            retry_at = time.time() + FAILURE_BACKOFF
+            for timer_id in due:
+                self._deadlines.setdefault(timer_id, retry_at)
+                heapq.heappush(self._heap, (self._deadlines[timer_id], timer_id))
+            raise
+        self.settled += len(due)
+        # Deleted timers are simply not re-armed.
+        self.track(settled.values(), not_before=time.time() + RETRY_DELAY)
+        return len(due)
+
+    async def refresh(self) -> None:
+        """Re-read the timers the change feed reported and re-arm them from their stored state."""
+        timer_ids, self._refresh = list(self._refresh), set()
+        if not timer_ids:
+            return
+        try:
+            repo = await self._repo_factory()
+            timers = await repo.get_many(timer_ids)
+        except Exception:
+            self._refresh.update(timer_ids)
+            raise
+        self.track(timers.values())
+        for timer_id in timer_ids:
+            if timer_id not in timers:
+                self._disarm(timer_id)
+
+    def on_changes(self, changes: dict[UUID, int | None]) -> None:
+        """Change feed consumer: queue timers written elsewhere for refresh()."""
+        for timer_id, version in changes.items():
+            if version is None:
+                self._disarm(timer_id)
+                continue
+            known = self._versions.get(timer_id, self._recent.get(timer_id))
+            if known is None or version > known:
+                self._refresh.add(timer_id)
+        if self._refresh:
+            self._wakeup.set()
+
+    def on_reset(self) -> None:
+        """Change feed consumer: notifications were lost, rebuild from the database."""
+        self._rebuild_requested = True
+        self._wakeup.set()
+
+    async def _run(self) -> None:
+        next_resync = 0.0
+        while True:
+            # Cleared before the pass, not after: anything queued while it
+            # runs (a change feed batch during refresh) must wake the next one.
+            self._wakeup.clear()
+            try:
+                if self._rebuild_requested or time.monotonic() >= next_resync:
+                    self._rebuild_requested = False
+                    await self.rebuild()
+                    next_resync = time.monotonic() + self._resync_interval
+                await self.refresh()
+                while await self.run_due():
+                    await asyncio.sleep(0)
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("completion scheduler pass failed")
+                await asyncio.sleep(FAILURE_BACKOFF)
+            next_due = self.next_due()
+            delay = next_resync - time.monotonic()
+            if next_due is not None:
+                delay = min(delay, next_due - time.time())
+            if delay > 0:
+                try:
+                    await asyncio.wait_for(self._wakeup.wait(), delay)
+                except asyncio.TimeoutError:
+                    pass
+
+    def _disarm(self, timer_id: UUID) -> None:
+        self._deadlines.pop(timer_id, None)
+        self._versions.pop(timer_id, None)
+
+    def _remember(self, timer_id: UUID, version: int) -> None:
+        self._recent[timer_id] = version
+        self._recent.move_to_end(timer_id)
+        if len(self._recent) > RECENT_VERSIONS:
+            self._recent.popitem(last=False)
+
+    def _drop_stale(self) -> None:
+        while self._heap and self._deadlines.get(self._heap[0][1]) != self._heap[0][0]:
+            heapq.heappop(self._heap)
+
+    def _compact(self) -> None:
+        self._heap = [(deadline, timer_id) for timer_id, deadline in self._deadlines.items()]
+        heapq.heapify(self._heap)
+
+
+_scheduler: CompletionScheduler | None = None
+
+
+def start_completion_scheduler(
+    repo_factory: Callable[[], Awaitable[TimerStore]],
+    thresholds: tuple[int, ...],
+    resync_interval: float,
+) -> CompletionScheduler:
+    """Start the process-wide scheduler (called from the app lifespan)."""
+    global _scheduler
+    if _scheduler is None:
+        _scheduler = CompletionScheduler(repo_factory, thresholds, resync_interval)
+        _scheduler.start()
+    return _scheduler
+
+
+def get_completion_scheduler() -> CompletionScheduler | None:
+    """The running scheduler, or None when it was not started (tests, tick engine)."""
+    return _scheduler
+
+
+async def close_completion_scheduler() -> None:
+    global _scheduler
+    if _scheduler is not None:
+        await _scheduler.close()
+        _scheduler = None
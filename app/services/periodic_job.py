@@ -0,0 +1,75 @@
+import asyncio
+import logging
+from typing import Any, Awaitable, Callable
+
+logger = logging.getLogger(__name__)
+
+
+class PeriodicJob:
+    """Runs `run_once` every `interval` seconds in a background task.
+
+    A failed pass is logged and retried on the next interval; the task only
+    ends when the job is closed.
+    """
+
+    def __init__(self, name: str, run_once: Callable[[], Awaitable[Any]], interval: float) -> None:
+        self.name = name
+        self._run_once = run_once
+        self._interval = interval
+        self._task: asyncio.Task | None = None
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def close(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await self._run_once()
+            except Exception:
+                logger.exception("%s job failed; retrying next interval", self.name)
+            await asyncio.sleep(self._interval)
+
+
+_jobs: dict[str, PeriodicJob] = {}
+
+
+def start_periodic_job(name: str, run_once: Callable[[], Awaitable[Any]], interval: float) -> PeriodicJob | None:
+    """Start the process-wide job `name`; None when interval is 0 (disabled)."""
+    if interval <= 0:
+        return None
+    job = _jobs.get(name)
+    if job is None:
+        job = _jobs[name] = PeriodicJob(name, run_once, interval)
+        job.start()
+    return job
+
+
+def get_periodic_job(name: str) -> PeriodicJob | None:
+    """The running job `name`, or None when it is disabled or not started."""
+    return _jobs.get(name)
+
+
+def periodic_jobs() -> list[PeriodicJob]:
+    """Every started job, in start order."""
+    return list(_jobs.values())
+
+
+async def close_periodic_jobs() -> None:
+    """Stop every job (called from the app lifespan on shutdown)."""
+    while _jobs:
+        _, job = _jobs.popitem()
+        await job.close()
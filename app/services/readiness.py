@@ -0,0 +1,231 @@
+import asyncio
+import time
+from collections import deque
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timezone
+from app.database import get_pool
+from app.services.change_feed import get_change_feed
+from app.services.completion_scheduler import get_completion_scheduler
+from app.services.periodic_job import periodic_jobs
+
+# Interval of the loop-lag probe and how many samples the reported max covers.
+LAG_PROBE_INTERVAL = 0.1
+LAG_SAMPLES = 50
+
+
+class LoopLagMonitor:
+    """Measures event-loop lag: how late a fixed-interval sleep wakes up.
+
+    A lagging loop answers every request late, including probes, so the
+    worst lag over the last LAG_SAMPLES probes (about 5 s) is what readiness
+    reports.
+    """
+
+    def __init__(self, interval: float = LAG_PROBE_INTERVAL) -> None:
+        self._interval = interval
+        self._samples: deque[float] = deque(maxlen=LAG_SAMPLES)
+        self._task: asyncio.Task | None = None
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def close(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def max_lag(self) -> float | None:
+        """Worst recent lag in seconds, or None before the first sample."""
+        return max(self._samples) if self._samples else None
+
+    async def _run(self) -> None:
+        while True:
+            started = time.perf_counter()
+            await asyncio.sleep(self._interval)
+            self._samples.append(max(0.0, time.perf_counter() - started - self._interval))
+
+
+@dataclass
+class Check:
+    """One readiness check: whether it passed, what was measured and the budget."""
+    ok: bool
+    ms: float | None = None
+    budget_ms: float | None = None
+    error: str | None = None
+
+
+@dataclass
+class Readiness:
+    """Result of ReadinessProbe.check(); `ready` is False if any check failed."""
+    ready: bool
+    checked_at: datetime
+    checks: dict[str, Check] = field(default_factory=dict)
+    subsystems: dict[str, str] = field(default_factory=dict)
+
+    def to_dict(self) -> dict:
+        return {
+            "status": "ready" if self.ready else "unready",
+            "checked_at": self.checked_at.isoformat(),
+            "checks": {name: asdict(check) for name, check in self.checks.items()},
+            "subsystems": self.subsystems,
+        }
+
+
+class ReadinessProbe:
+    """Deep readiness check with per-dependency latency budgets.
+
+    One pass acquires a pool connection (timed against the acquire budget),
+    runs SELECT 1 on it (timed against the DB budget), reads the loop-lag
+    monitor and the state of the background subsystems this worker started.
+    Results are cached for `cache_ttl` seconds and concurrent probes share a
+    single pass, so probe traffic adds at most one round trip per TTL per
+    worker. With `database=False` (in-memory backend) the pool and DB checks
+    are skipped.
+    """
+
+    def __init__(
+        self,
+        acquire_budget: float,
+        db_budget: float,
+        loop_lag_budget: float,
+        cache_ttl: float,
+        lag_monitor: LoopLagMonitor | None = None,
+        database: bool = True,
+    ) -> None:
+        self._acquire_budget = acquire_budget
+        self._db_budget = db_budget
+        self._loop_lag_budget = loop_lag_budget
+        self._cache_ttl = cache_ttl
+        self._lag_monitor = lag_monitor
+        self._database = database
+        self._cached: Readiness | None = None
+        self._cached_until = 0.0
+        self._lock = asyncio.Lock()
+
+    async def check(self) -> Readiness:
+        """Cached readiness, refreshed at most once per cache_ttl."""
+        if self._cached is not None and time.monotonic() < self._cached_until:
+            return self._cached
+        async with self._lock:
+            if self._cached is None or time.monotonic() >= self._cached_until:
+                self._cached = await self._run_checks()
+                self._cached_until = time.monotonic() + self._cache_ttl
+        return self._cached
+
+    async def _run_checks(self) -> Readiness:
+        checks = {"event_loop_lag": await self._check_loop_lag()}
+        if self._database:
+            checks.update(await self._check_database())
+        subsystems = subsystem_states()
+        checks["subsystems"] = Check(ok=all(state != "stopped" for state in subsystems.values()))
+        return Readiness(
+            ready=all(check.ok for check in checks.values()),
+            checked_at=datetime.now(timezone.utc),
+            checks=checks,
+            subsystems=subsystems,
+        )
+
+    async def _check_database(self) -> dict[str, Check]:
+        acquire_budget_ms = _ms(self._acquire_budget)
+        db_budget_ms = _ms(self._db_budget)
+        pool = await get_pool()
+        started = time.perf_counter()
+        # Timeouts are twice the budget: a slow dependency is reported with
+        # its measured latency, only a hopeless one is cut off.
+        try:
+            async with pool.acquire(timeout=2 * self._acquire_budget) as conn:
+                acquire_ms = _ms(time.perf_counter() - started)
+                acquire = Check(acquire_ms <= acquire_budget_ms, acquire_ms, acquire_budget_ms)
+                started = time.perf_counter()
+                try:
+                    await conn.fetchval("SELECT 1", timeout=2 * self._db_budget)
+                except Exception as exc:
+                    return {"pool_acquire": acquire, "database": Check(False, None, db_budget_ms, _error(exc))}
+                db_ms = _ms(time.perf_counter() - started)
+                return {"pool_acquire": acquire, "database": Check(db_ms <= db_budget_ms, db_ms, db_budget_ms)}
+        except Exception as exc:
+            return {
+                "pool_acquire": Check(False, None, acquire_budget_ms, _error(exc)),
+                "database": Check(False, None, db_budget_ms, "no connection"),
+            }
+
+    async def _check_loop_lag(self) -> Check:
+        budget_ms = _ms(self._loop_lag_budget)
+        lag = self._lag_monitor.max_lag() if self._lag_monitor is not None else None
+        if lag is None:
+            # No monitor history yet: time one trip through the ready queue.
+            started = time.perf_counter()
+            await asyncio.sleep(0)
+            lag = time.perf_counter() - started
+        return Check(_ms(lag) <= budget_ms, _ms(lag), budget_ms)
+
+
+def subsystem_states() -> dict[str, str]:
+    """State ("running" or "stopped") of each background subsystem started in this worker.
+
+    A subsystem that is disabled (never started) is not listed. The change
+    feed reports "disconnected" while it is reconnecting; that alone does not
+    fail readiness since the feed resyncs its consumers once back.
+    """
+    states = {}
+    feed = get_change_feed()
+    if feed is not None:
+        if not feed.running:
+            states["change_feed"] = "stopped"
+        else:
+            states["change_feed"] = "running" if feed.stats().connected else "disconnected"
+    scheduler = get_completion_scheduler()
+    if scheduler is not None:
+        states["completion_scheduler"] = "running" if scheduler.running else "stopped"
+    for job in periodic_jobs():
+        states[f"{job.name}_job"] = "running" if job.running else "stopped"
+    return states
+
+
+def _ms(seconds: float) -> float:
+    return round(seconds * 1000, 3)
+
+
+def _error(exc: Exception) -> str:
+    return "timeout" if isinstance(exc, asyncio.TimeoutError) else type(exc).__name__
+
+
+_lag_monitor: LoopLagMonitor | None = None
+_probe: ReadinessProbe | None = None
+
+
+def start_loop_lag_monitor() -> LoopLagMonitor:
+    """Start the process-wide loop-lag monitor (called from the app lifespan)."""
+    global _lag_monitor
+    if _lag_monitor is None:
+        _lag_monitor = LoopLagMonitor()
+        _lag_monitor.start()
+    return _lag_monitor
+
+
+def get_readiness_probe(
+    acquire_budget: float,
+    db_budget: float,
+    loop_lag_budget: float,
+    cache_ttl: float,
+    database: bool = True,
+) -> ReadinessProbe:
+    """Get the process-wide probe, creating it on first use."""
+    global _probe
+    if _probe is None:
+        _probe = ReadinessProbe(acquire_budget, db_budget, loop_lag_budget, cache_ttl, _lag_monitor, database)
+    return _probe
+
+
+async def close_readiness() -> None:
+    """Stop the loop-lag monitor and drop the probe and its cached result."""
+    global _lag_monitor, _probe
+    if _lag_monitor is not None:
+        await _lag_monitor.close()
+        _lag_monitor = None
+    _probe = None
@@ -0,0 +1,53 @@
+import asyncio
+import logging
+from datetime import datetime, timedelta, timezone
+from typing import Awaitable, Callable, Literal
+from app.repos.base import TimerStore
+
+logger = logging.getLogger(__name__)
+
+# Pause between batches of one pass, so retention yields the pool and the
+# disk to request traffic instead of running back-to-back statements.
+BATCH_PAUSE = 0.1
+
+
+class RetentionJob:
+    """Archives (or deletes) old completed timers in bounded batches.
+
+    Each pass (run periodically by app.services.periodic_job) moves timers
+    completed more than `max_age` ago to timers_archive ("archive") or drops
+    them ("delete"), at most
+    `batch_size` per statement, until a batch comes back short. Each batch is
+    its own short transaction, and rows locked by a concurrent writer are
+    skipped rather than waited on, so no long-held locks block the API.
+    """
+
+    def __init__(
+        self,
+        repo_factory: Callable[[], Awaitable[TimerStore]],
+        mode: Literal["archive", "delete"],
+        max_age: timedelta,
+        batch_size: int,
+    ) -> None:
+        self._repo_factory = repo_factory
+        self._mode = mode
+        self._max_age = max_age
+        self._batch_size = batch_size
+        self.last_removed = 0
+
+    async def run_once(self) -> int:
+        """Run one retention pass now. Returns the number of timers archived or deleted."""
+        repo = await self._repo_factory()
+        cutoff = datetime.now(timezone.utc) - self._max_age
+        remove = repo.archive_complete if self._mode == "archive" else repo.delete_complete
+        removed = 0
+        while True:
+            batch = await remove(cutoff, self._batch_size)
+            removed += batch
+            if batch < self._batch_size:
+                break
+            await asyncio.sleep(BATCH_PAUSE)
+        self.last_removed = removed
+        if removed:
+            logger.info("retention %sd %d completed timers", self._mode, removed)
+        return removed
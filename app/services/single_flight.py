@@ -0,0 +1,67 @@
+import asyncio
+from typing import Awaitable, Callable, Hashable, TypeVar
+from app.metrics import REGISTRY
+
+T = TypeVar("T")
+
+SINGLE_FLIGHT_CALLS = REGISTRY.counter(
+    "single_flight_calls_total",
+    "Coalesced calls by operation; result is leader (executed) or shared (joined one in flight).",
+    ("op", "result"),
+)
+
+
+class SingleFlight:
+    """Collapses concurrent calls with the same key into one execution.
+
+    The first caller for a key starts the call as a task; callers arriving
+    while it is in flight await that same task and get its result or
+    exception. Nothing is kept once it finishes, so the dedup window is
+    exactly the call's duration and memory is bounded by concurrency. A
+    caller that is cancelled (client gone) does not cancel the shared call.
+    """
+
+    def __init__(self, op: str) -> None:
+        self._op = op
+        self._calls: dict[Hashable, asyncio.Task] = {}
+
+    async def do(self, key: Hashable, call: Callable[[], Awaitable[T]]) -> T:
+        task = self._calls.get(key)
+        if task is None:
+            task = asyncio.ensure_future(call())
+            self._calls[key] = task
+            task.add_done_callback(lambda done: self._finished(key, done))
+            SINGLE_FLIGHT_CALLS.inc(self._op, "leader")
+        else:
+            SINGLE_FLIGHT_CALLS.inc(self._op, "shared")
+        return await asyncio.shield(task)
+
+    def forget(self, key: Hashable) -> None:
+        """Stop sharing the call in flight for `key`: later callers start a new one.
+
+        Callers already waiting still get the old call's result. Writers call
+        this once their change is committed, so a read issued after the write
+        cannot join one that began before it and return the old value.
+        """
+        self._calls.pop(key, None)
+
+    def in_flight(self) -> int:
+        return len(self._calls)
+
+    def _finished(self, key: Hashable, task: asyncio.Task) -> None:
+        if self._calls.get(key) is task:
+            del self._calls[key]
+        if not task.cancelled():
+            # Mark the exception retrieved in case every caller was cancelled.
+            task.exception()
+
+
+_flights: dict[str, SingleFlight] = {}
+
+
+def get_single_flight(op: str) -> SingleFlight:
+    """Process-wide SingleFlight for `op`, created on first use."""
+    flight = _flights.get(op)
+    if flight is None:
+        flight = _flights[op] = SingleFlight(op)
+    return flight
@@ -0,0 +1,41 @@
+import logging
+from typing import Awaitable, Callable
+from app.metrics import REGISTRY
+from app.repos.base import TimerStore
+
+logger = logging.getLogger(__name__)
+
+STATS_DRIFT = REGISTRY.counter(
+    "timer_stats_drift_total", "Timer count corrections applied to the stats counters by the reconcile job."
+)
+
+
+class StatsReconcileJob:
+    """Repairs drift in the timer count aggregates behind GET /timers/stats.
+
+    The counters are kept by triggers (or, in memory, by every write), so
+    drift only comes from writes that bypass them, such as a bulk load with
+    triggers disabled. In each pass (run periodically by
+    app.services.periodic_job) TimerRepo.reconcile_stats recounts timers in
+    one scan and adds the difference.
+
+    Every worker runs the job, but a pass given `min_interval` only scans
+    after claiming that interval in the database: the other workers' passes
+    (and a restarted worker's first one) are skipped until it has gone by.
+    """
+
+    def __init__(self, repo_factory: Callable[[], Awaitable[TimerStore]]) -> None:
+        self._repo_factory = repo_factory
+        self.last_drift = 0
+
+    async def run_once(self, min_interval: float = 0.0) -> int | None:
+        """Reconcile now. Returns the total drift corrected, None if another worker's pass was recent or running."""
+        repo = await self._repo_factory()
+        drift = await repo.reconcile_stats(min_interval)
+        if drift is None:
+            return None
+        self.last_drift = drift
+        if self.last_drift:
+            STATS_DRIFT.inc(amount=self.last_drift)
+            logger.warning("timer stats drifted by %d; corrected", self.last_drift)
+        return self.last_drift
@@ -0,0 +1,143 @@
+import asyncio
+import logging
+from typing import Awaitable, Callable
+from uuid import UUID
+from app.models.timer import TimerRow, TimerStatus
+from app.repos.base import TimerStore
+
+logger = logging.getLogger(__name__)
+
+
+class TickBuffer:
+    """Write-behind buffer for tick-engine ticks.
+
+    Running timers' state lives in memory once ticked; dirty rows are written
+    back every `interval` seconds with one TimerRepo.flush_ticks statement.
+    Ticks that change status or urgency_level are flushed immediately, so a
+    crash loses at most one interval of plain elapsed_time increments.
+
+    Flushes are guarded on the row version: if the row was changed elsewhere
+    (a transition, another worker) the buffered copy is dropped and reloaded
+    on the next tick instead of overwriting the newer state.
+    """
+
+    def __init__(self, repo_factory: Callable[[], Awaitable[TimerStore]], interval: float) -> None:
+        self._repo_factory = repo_factory
+        self._interval = interval
+        self._rows: dict[UUID, TimerRow] = {}
+        self._dirty: set[UUID] = set()
+        self._flush_lock = asyncio.Lock()
+        self._task: asyncio.Task | None = None
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    def peek(self, timer_id: UUID) -> TimerRow | None:
+        """The buffered (possibly unflushed) state of a timer, if any."""
+        return self._rows.get(timer_id)
+
+    @property
+    def dirty_count(self) -> int:
+        return len(self._dirty)
+
+    async def tick(self, timer_id: UUID, advance: Callable[[TimerRow], TimerRow]) -> TimerRow | None:
+        """Apply `advance` to the buffered row, loading it on first use."""
+        row = self._rows.get(timer_id)
+        if row is None:
+            repo = await self._repo_factory()
+            loaded = await repo.get_by_id(timer_id)
+            if loaded is None or loaded.status != TimerStatus.running:
+                return loaded
+            # Another tick may have loaded and advanced it while we awaited.
+            row = self._rows.setdefault(timer_id, loaded)
+        self.start()
+        advanced = advance(row)
+        self._rows[timer_id] = advanced
+        self._dirty.add(timer_id)
+        if advanced.status == row.status and advanced.urgency_level == row.urgency_level:
+            return advanced
+        written = await self.flush([timer_id])
+        if timer_id in written:
+            return written[timer_id]
+        repo = await self._repo_factory()
+        return await repo.get_by_id(timer_id)
+
+    async def flush(self, timer_ids: list[UUID] | None = None) -> dict[UUID, TimerRow]:
+        """Write dirty rows (all, or just `timer_ids`) back in one statement."""
+        async with self._flush_lock:
+            ids = self._dirty if timer_ids is None else self._dirty.intersection(timer_ids)
+            snapshot = [self._rows[timer_id] for timer_id in ids]
+            if not snapshot:
+                return {}
+            repo = await self._repo_factory()
+            written = await repo.flush_ticks(snapshot)
+            for sent in snapshot:
+                current = self._rows.get(sent.id)
+                result = written.get(sent.id)
+                if current is None:
+                    continue
+                if result is None or result.status != TimerStatus.running:
+                    # Changed elsewhere, or finished: stop buffering this timer.
+                    self._rows.pop(sent.id, None)
+                    self._dirty.discard(sent.id)
+                elif current.elapsed_time == sent.elapsed_time:
+                    self._rows[sent.id] = result
+                    self._dirty.discard(sent.id)
+                else:
+                    # Ticked again during the flush; keep it dirty on the new version.
+                    self._rows[sent.id] = current._replace(updated_at=result.updated_at, version=result.version)
+            return written
+
+    async def settle(self, timer_ids: list[UUID]) -> None:
+        """Flush and forget these timers before a transition writes them directly."""
+        if not self._rows.keys() & set(timer_ids):
+            return
+        await self.flush(timer_ids)
+        for timer_id in timer_ids:
+            self._rows.pop(timer_id, None)
+            self._dirty.discard(timer_id)
+
+    async def close(self) -> None:
+        """Stop the flush loop and write out everything still dirty."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        await self.flush()
+        self._rows.clear()
+
+    async def _run(self) -> None:
+        while True:
+            await asyncio.sleep(self._interval)
+            try:
+                await self.flush()
+            except Exception:
+                logger.exception("tick buffer flush failed; retrying next interval")
+
+
+_buffer: TickBuffer | None = None
+
+
+def get_tick_buffer(
+    repo_factory: Callable[[], Awaitable[TimerStore]],
+    interval_ms: int,
+) -> TickBuffer | None:
+    """Process-wide tick buffer; None when interval_ms is 0 (write-through ticks)."""
+    global _buffer
+    if interval_ms <= 0:
+        return None
+    if _buffer is None:
+        _buffer = TickBuffer(repo_factory, interval_ms / 1000)
+    return _buffer
+
+
+async def close_tick_buffer() -> None:
+    """Flush and stop the tick buffer (called from the app lifespan on shutdown)."""
+    global _buffer
+    if _buffer is not None:
+        await _buffer.close()
+        _buffer = None
@@ -1,90 +1,367 @@
+import time
+from typing import AsyncIterable, AsyncIterator, cast
 from uuid import UUID
-from app.models.timer import Timer, TimerStatus
-from app.repos.timer_repo import TimerRepo
+from datetime import datetime, timezone
+import numpy as np
+from app.models.timer import TimerRow, TimerStatus
+from app.repos.base import BinaryTimerStore, TimerStore
+from app.services.tick_buffer import TickBuffer
+from app.services.completion_scheduler import CompletionScheduler, next_deadline
+from app.services.single_flight import SingleFlight
+from app.services.timer_watch import TimerWatch
+from app.services.urgency import DEFAULT_THRESHOLDS, completed, urgency_level, urgency_levels
+
+# Shortest sleep before re-reading a timer whose urgency threshold is due: the
+# projection truncates to whole seconds, so waking exactly on the deadline can
+# still see the old level.
+THRESHOLD_WAKE_SLACK = 0.01
 
 
 class TimerService:
     """Orchestrates timer lifecycle and business logic."""
 
-    def __init__(self, repo: TimerRepo) -> None:
+    def __init__(
+        self,
+        repo: TimerStore,
+        wallclock: bool = True,
+        tick_buffer: TickBuffer | None = None,
+        urgency_thresholds: tuple[int, ...] = DEFAULT_THRESHOLDS,
+        completion_scheduler: CompletionScheduler | None = None,
+        watch: TimerWatch | None = None,
+        read_flight: SingleFlight | None = None,
+    ) -> None:
         self._repo = repo
+        # Wall-clock engine: running timers store an anchor (started_at) and their
+        # elapsed time is projected on read instead of being persisted every tick.
+        self._wallclock = wallclock
+        # Tick engine only: optional write-behind buffer for per-second ticks.
+        self._tick_buffer = None if wallclock else tick_buffer
+        self._urgency_thresholds = urgency_thresholds
+        # Wall-clock engine only: re-armed after every transition so running
+        # timers complete on time even if no client is left to tick them.
+        self._scheduler = completion_scheduler if wallclock else None
+        # Woken after every transition so long-polling readers on this worker
+        # see it without waiting for the change feed.
+        self._watch = watch
+        # Shared across requests: concurrent reads of one timer issue one query.
+        self._read_flight = read_flight
 
-    async def create_timer(self, duration: int) -> Timer:
+    async def create_timer(self, duration: int) -> TimerRow:
         """Create a new timer with the given duration in seconds."""
         return await self._repo.create(duration)
 
-    async def start_timer(self, timer_id: UUID) -> Timer:
-        """Start a timer by setting status to running."""
-        timer = await self._repo.get_by_id(timer_id)
+    async def create_timers(
+        self,
+        durations: list[int],
+        start: bool = False,
+        chunk_size: int = 1000,
+    ) -> AsyncIterator[TimerRow]:
+        """Create many timers, optionally already running, yielding them in input order.
+
+        Each chunk of `chunk_size` timers is one INSERT that commits on its own,
+        so every timer yielded exists even if a later chunk fails.
+        """
+        for offset in range(0, len(durations), chunk_size):
+            timers = await self._repo.create_many(durations[offset:offset + chunk_size], start, self._wallclock)
+            if start and self._scheduler is not None:
+                self._scheduler.track(timers)
+            for timer in timers:
+                yield timer
+
+    async def get_timer(self, timer_id: UUID) -> TimerRow | None:
+        """Fetch a timer with elapsed_time/urgency projected to the current instant."""
+        if self._tick_buffer is not None:
+            buffered = self._tick_buffer.peek(timer_id)
+            if buffered is not None:
+                return buffered
+        timer = await self._get_stored(timer_id)
         if timer is None:
             return None
-        urgency = self.compute_urgency(timer.elapsed_time, timer.duration)
-        return await self._repo.update(
-            timer_id,
-            elapsed_time=timer.elapsed_time,
-            status=TimerStatus.running,
-            urgency_level=urgency,
-        )
+        return self._view(timer)
 
-    async def stop_timer(self, timer_id: UUID) -> Timer:
+    async def wait_for_change(self, timer_id: UUID, since: int, timeout: float) -> tuple[TimerRow | None, bool]:
+        """Long-poll a timer: wait up to `timeout` seconds for it to differ from version `since`.
+
+        Returns (timer, changed) as soon as the timer's version is not `since`
+        (it was written, or deleted: timer None), or, for a running wall-clock
+        timer, once its projected status or urgency_level moves on. On
+        timeout returns the current timer with changed False. Needs a watch.
+        """
+        deadline = time.monotonic() + timeout
+        stored, timer = await self._read(timer_id)
+        if timer is None or timer.version != since:
+            return timer, True
+        seen = (timer.status, timer.urgency_level)
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return timer, False
+            wake_at = next_deadline(stored._replace(urgency_level=timer.urgency_level), self._urgency_thresholds)
+            if wake_at is not None:
+                remaining = min(remaining, max(wake_at - time.time(), THRESHOLD_WAKE_SLACK))
+            await self._watch.wait(timer_id, remaining)
+            stored, timer = await self._read(timer_id)
+            if timer is None or timer.version != since or (timer.status, timer.urgency_level) != seen:
+                return timer, True
+
+    async def get_timers(self, timer_ids: list[UUID]) -> dict[UUID, TimerRow]:
+        """Fetch and project a set of timers in one query, keyed by id."""
+        timers = await self._repo.get_many(_unique(timer_ids))
+        return dict(zip(timers.keys(), self._view_many(list(timers.values()))))
+
+    async def start_timer(self, timer_id: UUID) -> TimerRow:
+        """Start a timer by setting status to running."""
+        await self._settle([timer_id])
+        return self._track(await self._repo.start(timer_id, wallclock=self._wallclock))
+
+    async def stop_timer(self, timer_id: UUID) -> TimerRow:
         """Stop a timer by setting status to paused."""
-        timer = await self._repo.get_by_id(timer_id)
-        if timer is None:
-            return None
-        urgency = self.compute_urgency(timer.elapsed_time, timer.duration)
-        return await self._repo.update(
-            timer_id,
-            elapsed_time=timer.elapsed_time,
-            status=TimerStatus.paused,
-            urgency_level=urgency,
-        )
+        await self._settle([timer_id])
+        return self._track(await self._repo.stop(timer_id))
 
-    async def reset_timer(self, timer_id: UUID) -> Timer:
+    async def reset_timer(self, timer_id: UUID) -> TimerRow:
         """Reset a timer to idle status with elapsed_time=0."""
-        timer = await self._repo.get_by_id(timer_id)
-        if timer is None:
-            return None
-        return await self._repo.update(
-            timer_id,
-            elapsed_time=0,
-            status=TimerStatus.idle,
-            urgency_level=0,
+        await self._settle([timer_id])
+        return self._track(await self._repo.reset(timer_id))
+
+    async def tick_timer(self, timer_id: UUID) -> TimerRow:
+        """Increment elapsed_time by 1 second and recompute urgency.
+
+        With the wall-clock engine a tick is a read: the projected state is
+        returned and a write only happens once, when the timer completes.
+        """
+        if self._wallclock:
+            timer = self._track(await self._repo.complete_if_due(timer_id), notify=False)
+            if timer is None:
+                return None
+            return self.project(timer)
+        if self._tick_buffer is not None:
+            return await self._tick_buffer.tick(timer_id, self.advance)
+        return self._track(await self._repo.tick(timer_id), notify=False)
+
+    async def start_timers(self, timer_ids: list[UUID]) -> list[TimerRow | None]:
+        """Batch start_timer. Results follow input order; None marks a missing timer."""
+        await self._settle(timer_ids)
+        found = self._track_many(await self._repo.start_many(_unique(timer_ids), wallclock=self._wallclock))
+        return [found.get(timer_id) for timer_id in timer_ids]
+
+    async def stop_timers(self, timer_ids: list[UUID]) -> list[TimerRow | None]:
+        """Batch stop_timer. Results follow input order; None marks a missing timer."""
+        await self._settle(timer_ids)
+        found = self._track_many(await self._repo.stop_many(_unique(timer_ids)))
+        return [found.get(timer_id) for timer_id in timer_ids]
+
+    async def reset_timers(self, timer_ids: list[UUID]) -> list[TimerRow | None]:
+        """Batch reset_timer. Results follow input order; None marks a missing timer."""
+        await self._settle(timer_ids)
+        found = self._track_many(await self._repo.reset_many(_unique(timer_ids)))
+        return [found.get(timer_id) for timer_id in timer_ids]
+
+    async def tick_timers(self, timer_ids: list[UUID]) -> list[TimerRow | None]:
+        """Batch tick_timer. Results follow input order; None marks a missing timer."""
+        if self._wallclock:
+            found = self._track_many(await self._repo.complete_if_due_many(_unique(timer_ids)), notify=False)
+            now = _utcnow()
+            found = {timer_id: self.project(timer, now) for timer_id, timer in found.items()}
+        elif self._tick_buffer is not None:
+            found = {}
+            for timer_id in _unique(timer_ids):
+                timer = await self._tick_buffer.tick(timer_id, self.advance)
+                if timer is not None:
+                    found[timer_id] = timer
+        else:
+            found = self._track_many(await self._repo.tick_many(_unique(timer_ids)), notify=False)
+        return [found.get(timer_id) for timer_id in timer_ids]
+
+    async def list_timers(
+        self,
+        limit: int | None = None,
+        after: tuple[datetime, UUID] | None = None,
+        status: TimerStatus | None = None,
+        urgency_level: int | None = None,
+    ) -> list[TimerRow]:
+        """Fetch timers newest first, optionally filtered and keyset-paginated.
+
+        Filters match the persisted status/urgency_level; items are projected.
+        """
+        timers = await self._repo.list_page(limit, after, status, urgency_level)
+        return self._view_many(timers)
+
+    async def stream_timers(
+        self,
+        status: TimerStatus | None = None,
+        urgency_level: int | None = None,
+    ) -> AsyncIterator[TimerRow]:
+        """Yield all matching timers, projected, without loading the table into memory."""
+        async for timer in self._repo.iter_all(status, urgency_level):
+            yield self._view(timer)
+
+    async def stats(self) -> dict:
+        """Counts of stored timers by status and urgency_level (a TimerStatsResponse), zero-filled.
+
+        These are stored values: under the wall-clock engine a running timer
+        moves to the next level or to complete when the completion scheduler
+        persists it, which it does at the projected deadline.
+        """
+        counts = await self._repo.stats()
+        levels = sorted(set(range(len(self._urgency_thresholds) + 1)) | {level for _, level in counts})
+        grid = {
+            status.value: {level: counts.get((status.value, level), 0) for level in levels}
+            for status in TimerStatus
+        }
+        return {
+            "total": sum(counts.values()),
+            "by_status": {status: sum(row.values()) for status, row in grid.items()},
+            "by_urgency": {level: sum(row[level] for row in grid.values()) for level in levels},
+            "by_status_and_urgency": grid,
+        }
+
+    def export_timers(self) -> AsyncIterator[bytes]:
+        """Stored timers as a PGCOPY binary stream: a backup, so rows are not projected.
+
+        Needs a BinaryTimerStore (TimerRepo); the router only calls it on Postgres.
+        """
+        return cast(BinaryTimerStore, self._repo).export_binary()
+
+    async def import_timers(self, source: AsyncIterable[bytes]) -> tuple[int, int]:
+        """Load an export_timers stream. Returns (rows received, rows inserted)."""
+        return await cast(BinaryTimerStore, self._repo).import_binary(source)
+
+    async def estimate_count(
+        self,
+        status: TimerStatus | None = None,
+        urgency_level: int | None = None,
+    ) -> int:
+        """Cheap approximate number of matching timers."""
+        return await self._repo.estimate_count(status, urgency_level)
+
+    def elapsed_at(self, timer: TimerRow, now: datetime | None = None) -> int:
+        """Elapsed seconds at `now`: stored elapsed_time plus the running span, capped at duration."""
+        if timer.status != TimerStatus.running or timer.started_at is None:
+            return timer.elapsed_time
+        now = now or _utcnow()
+        span = int((now - _as_utc(timer.started_at)).total_seconds())
+        return min(timer.duration, timer.elapsed_time + max(span, 0))
+
+    def project(self, timer: TimerRow, now: datetime | None = None) -> TimerRow:
+        """Return the timer as it looks at `now` under the wall-clock engine.
+
+        Timers without a running anchor are returned unchanged.
+        """
+        if timer.status != TimerStatus.running or timer.started_at is None:
+            return timer
+        elapsed = self.elapsed_at(timer, now)
+        status = TimerStatus.complete if elapsed >= timer.duration else TimerStatus.running
+        return timer._replace(
+            elapsed_time=elapsed,
+            status=status.value,
+            urgency_level=self.compute_urgency(elapsed, timer.duration),
         )
 
-    async def tick_timer(self, timer_id: UUID) -> Timer:
-        """Increment elapsed_time by 1 second and recompute urgency."""
-        timer = await self._repo.get_by_id(timer_id)
-        if timer is None:
-            return None
+    def project_many(self, timers: list[TimerRow], now: datetime | None = None) -> list[TimerRow]:
+        """project() for a list of timers, with urgency and completion computed in one vectorized pass."""
+        running = [i for i, t in enumerate(timers) if t.status == TimerStatus.running and t.started_at is not None]
+        if not running:
+            return list(timers)
+        now = now or _utcnow()
+        elapsed = np.fromiter((self.elapsed_at(timers[i], now) for i in running), np.int64, len(running))
+        duration = np.fromiter((timers[i].duration for i in running), np.int64, len(running))
+        levels = urgency_levels(elapsed, duration, self._urgency_thresholds).tolist()
+        done = completed(elapsed, duration).tolist()
+        projected = list(timers)
+        for k, i in enumerate(running):
+            projected[i] = timers[i]._replace(
+                elapsed_time=int(elapsed[k]),
+                status=TimerStatus.complete.value if done[k] else TimerStatus.running.value,
+                urgency_level=levels[k],
+            )
+        return projected
+
+    def advance(self, timer: TimerRow) -> TimerRow:
+        """The timer one tick later (tick engine)."""
         new_elapsed = timer.elapsed_time + 1
-        new_status = timer.status
-        if new_elapsed >= timer.duration:
-            new_status = TimerStatus.complete
-        urgency = self.compute_urgency(new_elapsed, timer.duration)
-        return await self._repo.update(
-            timer_id,
+        status = TimerStatus.complete.value if new_elapsed >= timer.duration else timer.status
+        return timer._replace(
             elapsed_time=new_elapsed,
-            status=new_status,
-            urgency_level=urgency,
+            status=status,
+            urgency_level=self.compute_urgency(new_elapsed, timer.duration),
         )
 
-    async def list_timers(self) -> list[Timer]:
-        """Fetch all timers."""
-        return await self._repo.list_all()
+    def _view(self, timer: TimerRow, now: datetime | None = None) -> TimerRow:
+        """What readers see: buffered tick state if any, else the projected row."""
+        if self._tick_buffer is not None:
+            buffered = self._tick_buffer.peek(timer.id)
+            if buffered is not None:
+                return buffered
+        return self.project(timer, now)
+
+    def _view_many(self, timers: list[TimerRow], now: datetime | None = None) -> list[TimerRow]:
+        if self._tick_buffer is not None:
+            timers = [self._tick_buffer.peek(t.id) or t for t in timers]
+        return self.project_many(timers, now)
+
+    async def _read(self, timer_id: UUID) -> tuple[TimerRow | None, TimerRow | None]:
+        """The stored row and what readers see of it (get_timer), or (None, None)."""
+        stored = await self._get_stored(timer_id)
+        if stored is None:
+            return None, None
+        return stored, self._view(stored)
+
+    async def _get_stored(self, timer_id: UUID) -> TimerRow | None:
+        if self._read_flight is None:
+            return await self._repo.get_by_id(timer_id)
+        return await self._read_flight.do(timer_id, lambda: self._repo.get_by_id(timer_id))
+
+    def _track(self, timer: TimerRow | None, notify: bool = True) -> TimerRow | None:
+        """Re-arm (or disarm) the completion deadline of a just-written timer.
+
+        Also detaches reads of it already in flight, so later GETs see the
+        write. With `notify`, wakes local long-polls on it; ticks pass False.
+        """
+        if timer is not None:
+            if self._read_flight is not None:
+                self._read_flight.forget(timer.id)
+            if self._scheduler is not None:
+                self._scheduler.track([timer])
+            if notify and self._watch is not None:
+                self._watch.notify([timer.id])
+        return timer
+
+    def _track_many(self, timers: dict[UUID, TimerRow], notify: bool = True) -> dict[UUID, TimerRow]:
+        if self._read_flight is not None:
+            for timer_id in timers:
+                self._read_flight.forget(timer_id)
+        if self._scheduler is not None:
+            self._scheduler.track(timers.values())
+        if notify and self._watch is not None:
+            self._watch.notify(timers)
+        return timers
+
+    async def _settle(self, timer_ids: list[UUID]) -> None:
+        """Write back buffered ticks before a transition updates these timers directly."""
+        if self._tick_buffer is not None:
+            await self._tick_buffer.settle(timer_ids)
 
     def compute_urgency(self, elapsed_time: int, duration: int) -> int:
         """Compute urgency level (0-3) based on elapsed percentage.
-        
-        0: 0-33%, 1: 33-66%, 2: 66-90%, 3: 90%+
+
+        0: 0-33%, 1: 33-66%, 2: 66-90%, 3: 90%+ with the default thresholds.
+        Integer arithmetic; batch callers use app.services.urgency.urgency_levels.
         """
-        if duration <= 0:
-            return 0
-        percentage = (elapsed_time / duration) * 100
-        if percentage < 33:
-            return 0
-        elif percentage < 66:
-            return 1
-        elif percentage < 90:
-            return 2
-        else:
-            return 3
+        return urgency_level(elapsed_time, duration, self._urgency_thresholds)
+
+
+def _unique(timer_ids: list[UUID]) -> list[UUID]:
+    """Drop duplicate ids (keeping order) so each row is transitioned once."""
+    return list(dict.fromkeys(timer_ids))
+
+
+def _utcnow() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+def _as_utc(value: datetime) -> datetime:
+    """asyncpg returns aware datetimes for TIMESTAMPTZ; treat naive values as UTC."""
+    if value.tzinfo is None:
+        return value.replace(tzinfo=timezone.utc)
+    return value
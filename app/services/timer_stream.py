@@ -0,0 +1,178 @@
+import asyncio
+import logging
+import time
+from typing import Awaitable, Callable
+from uuid import UUID
+from app.models.encoding import timer_json
+from app.models.timer import TimerRow
+from app.services.change_feed import get_change_feed
+from app.services.timer_service import TimerService
+
+logger = logging.getLogger(__name__)
+
+# Frames a slow client may fall behind by before its oldest frames are dropped.
+SUBSCRIPTION_QUEUE_SIZE = 64
+
+
+class Subscription:
+    """One client's interest in a set of timers.
+
+    Frames are JSON strings queued by the hub; a subscriber only ever awaits
+    its own queue, so no per-subscriber task is needed on the server side.
+    """
+
+    def __init__(self, timer_ids: set[UUID], cadence: float | None) -> None:
+        self.timer_ids = set(timer_ids)
+        # Seconds between frames for an unchanged timer; None sends on change only.
+        self.cadence = cadence
+        self._queue: asyncio.Queue[str] = asyncio.Queue(maxsize=SUBSCRIPTION_QUEUE_SIZE)
+        # timer_id -> ((status, urgency_level), monotonic time of last frame)
+        self._last: dict[UUID, tuple[tuple[str, int], float]] = {}
+
+    async def next_frame(self, timeout: float | None = None) -> str | None:
+        """Wait for the next frame; None when `timeout` passes without one."""
+        if not self._queue.empty():
+            return self._queue.get_nowait()
+        try:
+            return await asyncio.wait_for(self._queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return None
+
+    def unsubscribe_ids(self, timer_ids: set[UUID]) -> None:
+        self.timer_ids -= timer_ids
+        for timer_id in timer_ids:
+            self._last.pop(timer_id, None)
+
+    def offer(self, timer_id: UUID, timer: TimerRow | None, now: float) -> None:
+        """Queue a frame if the timer's status/urgency changed or its cadence is due."""
+        if timer is None:
+            self.unsubscribe_ids({timer_id})
+            self._put(f'{{"id":"{timer_id}","timer":null,"error":"Timer not found"}}')
+            return
+        key = (timer.status, timer.urgency_level)
+        last = self._last.get(timer_id)
+        if last is not None:
+            last_key, sent_at = last
+            cadence_due = self.cadence is not None and now - sent_at >= self.cadence
+            if last_key == key and not cadence_due:
+                return
+        self._last[timer_id] = (key, now)
+        self._put(f'{{"id":"{timer_id}","timer":{timer_json(timer)}}}')
+
+    def _put(self, frame: str) -> None:
+        if self._queue.full():
+            # Drop the oldest frame: a newer state supersedes it.
+            self._queue.get_nowait()
+        self._queue.put_nowait(frame)
+
+
+class TimerStreamHub:
+    """Single in-process scheduler that fans timer updates out to subscribers.
+
+    Every `poll_interval` seconds the hub loads all subscribed timers with one
+    query and offers each subscription its timers' projected state. Cost per
+    worker is one query per poll, independent of the number of clients. A
+    write to a subscribed timer from any worker, seen through the change
+    feed, triggers a poll right away.
+    """
+
+    def __init__(
+        self,
+        service_factory: Callable[[], Awaitable[TimerService]],
+        poll_interval: float,
+    ) -> None:
+        self._service_factory = service_factory
+        self._poll_interval = poll_interval
+        self._subscriptions: set[Subscription] = set()
+        self._wakeup = asyncio.Event()
+        self._task: asyncio.Task | None = None
+
+    def subscribe(self, timer_ids: set[UUID], cadence: float | None = None) -> Subscription:
+        """Register a subscription and make sure the scheduler is running."""
+        subscription = Subscription(timer_ids, cadence)
+        self._subscriptions.add(subscription)
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+        self._wakeup.set()
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        self._subscriptions.discard(subscription)
+
+    def wake(self) -> None:
+        """Poll now instead of at the next interval (e.g. a subscription changed)."""
+        self._wakeup.set()
+
+    def on_changes(self, changes: dict[UUID, int | None]) -> None:
+        """Change feed consumer: poll now if any subscribed timer was written."""
+        if any(not subscription.timer_ids.isdisjoint(changes) for subscription in self._subscriptions):
+            self._wakeup.set()
+
+    def on_reset(self) -> None:
+        """Change feed consumer: writes may have been missed, poll now."""
+        self._wakeup.set()
+
+    async def close(self) -> None:
+        """Stop the scheduler task."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        self._subscriptions.clear()
+
+    async def poll_once(self) -> None:
+        """Load every subscribed timer in one query and offer frames to subscribers."""
+        timer_ids = set().union(*(s.timer_ids for s in self._subscriptions)) if self._subscriptions else set()
+        if not timer_ids:
+            return
+        service = await self._service_factory()
+        timers = await service.get_timers(list(timer_ids))
+        now = time.monotonic()
+        for subscription in list(self._subscriptions):
+            for timer_id in list(subscription.timer_ids):
+                subscription.offer(timer_id, timers.get(timer_id), now)
+
+    async def _run(self) -> None:
+        while True:
+            if not self._subscriptions:
+                await self._wakeup.wait()
+            self._wakeup.clear()
+            try:
+                await self.poll_once()
+            except Exception:
+                logger.exception("timer stream poll failed")
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), self._poll_interval)
+            except asyncio.TimeoutError:
+                pass
+
+
+_hub: TimerStreamHub | None = None
+
+
+def get_stream_hub(
+    service_factory: Callable[[], Awaitable[TimerService]],
+    poll_interval: float,
+) -> TimerStreamHub:
+    """Get the process-wide hub, creating it on first use."""
+    global _hub
+    if _hub is None:
+        _hub = TimerStreamHub(service_factory, poll_interval)
+        feed = get_change_feed()
+        if feed is not None:
+            feed.subscribe(_hub)
+    return _hub
+
+
+async def close_stream_hub() -> None:
+    """Stop the hub's scheduler task."""
+    global _hub
+    if _hub is not None:
+        feed = get_change_feed()
+        if feed is not None:
+            feed.unsubscribe(_hub)
+        await _hub.close()
+        _hub = None
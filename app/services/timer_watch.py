@@ -0,0 +1,80 @@
+import asyncio
+from typing import Iterable
+from uuid import UUID
+from app.metrics import REGISTRY
+from app.services.change_feed import Changes, get_change_feed
+
+
+class TimerWatch:
+    """Lets requests park until a given timer is written.
+
+    Waiters are woken by this worker's own transitions (TimerService calls
+    notify) and, as a change feed consumer, by any other worker's writes. A
+    feed reset wakes everyone, since writes may have been missed. Waking only
+    means "re-read": a waiter decides for itself whether anything changed.
+    """
+
+    def __init__(self) -> None:
+        self._waiters: dict[UUID, set[asyncio.Event]] = {}
+
+    async def wait(self, timer_id: UUID, timeout: float) -> bool:
+        """Wait until `timer_id` is written or `timeout` seconds pass. Returns False on timeout."""
+        event = asyncio.Event()
+        self._waiters.setdefault(timer_id, set()).add(event)
+        try:
+            await asyncio.wait_for(event.wait(), timeout)
+            return True
+        except asyncio.TimeoutError:
+            return False
+        finally:
+            waiters = self._waiters.get(timer_id)
+            if waiters is not None:
+                waiters.discard(event)
+                if not waiters:
+                    del self._waiters[timer_id]
+
+    def notify(self, timer_ids: Iterable[UUID]) -> None:
+        for timer_id in timer_ids:
+            for event in self._waiters.get(timer_id, ()):
+                event.set()
+
+    def waiting(self) -> int:
+        return sum(len(waiters) for waiters in self._waiters.values())
+
+    def on_changes(self, changes: Changes) -> None:
+        """Change feed consumer: wake waiters on the written timers."""
+        self.notify(changes)
+
+    def on_reset(self) -> None:
+        """Change feed consumer: writes may have been missed, wake everyone."""
+        self.notify(list(self._waiters))
+
+
+_watch: TimerWatch | None = None
+
+REGISTRY.gauge(
+    "timer_watch_waiters", "Requests parked waiting for a timer to change (long-poll GETs).",
+    collect=lambda: {(): _watch.waiting() if _watch is not None else 0},
+)
+
+
+def get_timer_watch() -> TimerWatch:
+    """Get the process-wide watch, creating it (and subscribing it to the change feed) on first use."""
+    global _watch
+    if _watch is None:
+        _watch = TimerWatch()
+        feed = get_change_feed()
+        if feed is not None:
+            feed.subscribe(_watch)
+    return _watch
+
+
+async def close_timer_watch() -> None:
+    """Wake every parked request and drop the watch."""
+    global _watch
+    if _watch is not None:
+        feed = get_change_feed()
+        if feed is not None:
+            feed.unsubscribe(_watch)
+        _watch.on_reset()
+        _watch = None
@@ -0,0 +1,41 @@
+import numpy as np
+
+# Elapsed percentages at which urgency steps up: level n is reached once
+# elapsed >= duration * thresholds[n-1] / 100. The default reproduces the
+# original 0-33% / 33-66% / 66-90% / 90%+ bands.
+DEFAULT_THRESHOLDS: tuple[int, ...] = (33, 66, 90)
+
+
+def urgency_level(elapsed_time: int, duration: int, thresholds: tuple[int, ...] = DEFAULT_THRESHOLDS) -> int:
+    """Scalar urgency in integer arithmetic: the number of thresholds reached."""
+    if duration <= 0:
+        return 0
+    scaled = elapsed_time * 100
+    level = 0
+    for threshold in thresholds:
+        if scaled < duration * threshold:
+            break
+        level += 1
+    return level
+
+
+def urgency_levels(
+    elapsed: np.ndarray,
+    duration: np.ndarray,
+    thresholds: tuple[int, ...] = DEFAULT_THRESHOLDS,
+) -> np.ndarray:
+    """Vectorized urgency_level over arrays of elapsed seconds and durations (int8 result)."""
+    elapsed = np.asarray(elapsed, dtype=np.int64)
+    duration = np.asarray(duration, dtype=np.int64)
+    scaled = elapsed * 100
+    levels = np.zeros(np.broadcast(elapsed, duration).shape, dtype=np.int8)
+    for threshold in thresholds:
+        levels += scaled >= duration * threshold
+    levels[duration <= 0] = 0
+    return levels
+
+
+def completed(elapsed: np.ndarray, duration: np.ndarray) -> np.ndarray:
+    """Vectorized completion test: elapsed has reached duration."""
+    return np.asarray(elapsed, dtype=np.int64) >= np.asarray(duration, dtype=np.int64)
+
@@ -0,0 +1,23 @@
+from typing import Awaitable, Callable
+from app.repos.base import TimerStore
+
+
+class UrgencyRecomputeJob:
+    """Refreshes the stored urgency_level of running timers.
+
+    Under the wall-clock engine urgency is projected on read and only
+    persisted on transitions, so the stored column drifts while a timer runs.
+    Run periodically (app.services.periodic_job), one set-based UPDATE
+    (TimerRepo.recompute_urgency) brings it up to date, which keeps
+    ?urgency_level= filters accurate.
+    """
+
+    def __init__(self, repo_factory: Callable[[], Awaitable[TimerStore]]) -> None:
+        self._repo_factory = repo_factory
+        self.last_updated = 0
+
+    async def run_once(self) -> int:
+        """Recompute now. Returns the number of timers whose level changed."""
+        repo = await self._repo_factory()
+        self.last_updated = await repo.recompute_urgency()
+        return self.last_updated
@@ -0,0 +1,93 @@
+"""Startup timeline: how long this worker took from process start to serving.
+
+The lifespan wraps each startup step in TIMELINE.phase(name) and calls
+TIMELINE.mark_ready() once it yields; MetricsMiddleware reports each response
+to TIMELINE.request_served, which records the first. The breakdown is
+exported as startup_phase_seconds{phase}, startup_ready_seconds and
+startup_first_request_seconds, logged once ready, and included in
+GET /health/ready.
+"""
+import logging
+import os
+import time
+from contextlib import contextmanager
+from typing import Iterator
+from app.metrics import REGISTRY
+
+logger = logging.getLogger(__name__)
+
+STARTUP_PHASES = REGISTRY.gauge(
+    "startup_phase_seconds", "Duration of each startup phase of this worker.", ("phase",)
+)
+STARTUP_READY = REGISTRY.gauge("startup_ready_seconds", "Seconds from process start until startup completed.")
+STARTUP_FIRST_REQUEST = REGISTRY.gauge(
+    "startup_first_request_seconds", "Seconds from process start until the first response was sent."
+)
+
+
+def _process_age() -> float:
+    """Seconds since this process was created (Linux /proc), or 0.0 where unavailable."""
+    try:
+        with open("/proc/self/stat") as f:
+            # starttime is field 22, in clock ticks since boot; split after the
+            # command name (field 2), which may itself contain spaces.
+            fields = f.read().rsplit(")", 1)[1].split()
+        started = int(fields[19]) / os.sysconf("SC_CLK_TCK")
+        return max(0.0, time.clock_gettime(time.CLOCK_BOOTTIME) - started)
+    except (OSError, ValueError, IndexError, AttributeError):
+        return 0.0
+
+
+class StartupTimeline:
+    """Phase durations and milestones, in seconds since `origin` (a perf_counter value)."""
+
+    def __init__(self, origin: float) -> None:
+        self._origin = origin
+        self.phases: dict[str, float] = {}
+        self.ready: float | None = None
+        self.first_request: float | None = None
+
+    def begin(self) -> None:
+        """Start of the lifespan: everything before it (interpreter, imports, server setup) is "boot"."""
+        self._record("boot", time.perf_counter() - self._origin)
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        started = time.perf_counter()
+        try:
+            yield
+        finally:
+            self._record(name, time.perf_counter() - started)
+
+    def mark_ready(self) -> None:
+        self.ready = time.perf_counter() - self._origin
+        STARTUP_READY.set(self.ready)
+        logger.info(
+            "ready %.0f ms after process start (%s)",
+            self.ready * 1000,
+            ", ".join(f"{name} {seconds * 1000:.0f} ms" for name, seconds in self.phases.items()),
+        )
+
+    def request_served(self) -> None:
+        if self.first_request is None:
+            self.first_request = time.perf_counter() - self._origin
+            STARTUP_FIRST_REQUEST.set(self.first_request)
+
+    def to_dict(self) -> dict:
+        return {
+            "ready_ms": _ms(self.ready),
+            "first_request_ms": _ms(self.first_request),
+            "phases_ms": {name: _ms(seconds) for name, seconds in self.phases.items()},
+        }
+
+    def _record(self, name: str, seconds: float) -> None:
+        self.phases[name] = seconds
+        STARTUP_PHASES.set(seconds, name)
+
+
+def _ms(seconds: float | None) -> float | None:
+    return None if seconds is None else round(seconds * 1000, 1)
+
+
+# This process's timeline; its origin is the process start time, estimated at import.
+TIMELINE = StartupTimeline(time.perf_counter() - _process_age())
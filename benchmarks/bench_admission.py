@@ -0,0 +1,79 @@
+"""Benchmark: transition latency while list requests flood the worker.
+
+Seeds the table, then keeps --flood concurrent GET /api/v1/timers?limit=1000
+requests running in process over ASGI while a stream of POST /{id}/start and
+/{id}/stop transitions is timed. Reports transition p50/p99, throughput and
+how many requests were shed (503). Run once as is and once with
+ADMISSION_MAX_LIMIT=0 to compare against no admission control; a small
+DB_POOL_MAX_SIZE makes the pool the bottleneck sooner. Requires DATABASE_URL
+to point at a migrated database; the timers table is emptied.
+
+    DB_POOL_MAX_SIZE=5 python -m benchmarks.bench_admission --seconds 10
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import time
+
+import asyncpg
+from httpx import ASGITransport, AsyncClient
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--seconds", type=float, default=10.0)
+    parser.add_argument("--flood", type=int, default=200)
+    parser.add_argument("--timers", type=int, default=5000)
+    parser.add_argument("--transitions", type=int, default=20, help="Concurrent transition clients")
+    args = parser.parse_args()
+
+    from app.main import app, lifespan
+
+    pool = await asyncpg.create_pool(os.environ["DATABASE_URL"], min_size=1, max_size=2)
+    async with pool.acquire() as conn:
+        await conn.execute("DELETE FROM timers")
+
+    async with lifespan(app), AsyncClient(transport=ASGITransport(app=app), base_url="http://bench", timeout=60) as client:
+        await client.post("/api/v1/timers:bulk", json={"timers": [{"duration": 3600}] * args.timers})
+        ids = [t["id"] for t in (await client.get("/api/v1/timers?limit=1000")).json()["items"]]
+        deadline = time.perf_counter() + args.seconds
+        counts = {"list_ok": 0, "list_shed": 0, "transition_ok": 0, "transition_shed": 0}
+        latencies: list[float] = []
+
+        async def flood() -> None:
+            while time.perf_counter() < deadline:
+                response = await client.get("/api/v1/timers?limit=1000")
+                counts["list_ok" if response.status_code == 200 else "list_shed"] += 1
+                if response.status_code == 503:
+                    await asyncio.sleep(0.01)
+
+        async def transitions(worker: int) -> None:
+            i = worker
+            while time.perf_counter() < deadline:
+                action = "start" if (i // len(ids)) % 2 == 0 else "stop"
+                started = time.perf_counter()
+                response = await client.post(f"/api/v1/timers/{ids[i % len(ids)]}/{action}")
+                if response.status_code == 200:
+                    latencies.append(time.perf_counter() - started)
+                    counts["transition_ok"] += 1
+                else:
+                    counts["transition_shed"] += 1
+                i += args.transitions
+
+        await asyncio.gather(*(flood() for _ in range(args.flood)), *(transitions(w) for w in range(args.transitions)))
+
+    async with pool.acquire() as conn:
+        await conn.execute("DELETE FROM timers")
+    await pool.close()
+
+    latencies.sort()
+    p99 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))] if latencies else 0.0
+    print(f"admission max limit      {os.environ.get('ADMISSION_MAX_LIMIT', 'default')}")
+    print(f"transitions ok / shed    {counts['transition_ok']} / {counts['transition_shed']}")
+    print(f"transition p50 / p99     {statistics.median(latencies) * 1000:.1f} / {p99 * 1000:.1f} ms")
+    print(f"lists ok / shed          {counts['list_ok']} / {counts['list_shed']}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,92 @@
+"""Benchmark: per-row timer creation vs POST /api/v1/timers:bulk.
+
+Creates N timers four ways and reports timers/s: TimerRepo.create one at a
+time, TimerRepo.create concurrently (pool-bound), TimerRepo.create_many in
+BULK_CREATE_CHUNK_ROWS chunks, and end to end through the app (N POSTs vs
+one :bulk request, in process over ASGI). Requires DATABASE_URL to point at a
+migrated database; the timers table is emptied.
+
+    python -m benchmarks.bench_bulk_create --timers 5000
+"""
+import argparse
+import asyncio
+import os
+import time
+
+import asyncpg
+from httpx import ASGITransport, AsyncClient
+
+from app.repos.timer_repo import TimerRepo
+from app.routers.timers import BULK_CREATE_CHUNK_ROWS
+
+
+async def _clear(pool: asyncpg.Pool) -> None:
+    async with pool.acquire() as conn:
+        await conn.execute("DELETE FROM timers")
+
+
+async def _rate(name: str, n: int, pool: asyncpg.Pool, create) -> None:
+    started = time.perf_counter()
+    await create()
+    elapsed = time.perf_counter() - started
+    async with pool.acquire() as conn:
+        created = await conn.fetchval("SELECT count(*) FROM timers")
+    assert created == n, (name, created)
+    await _clear(pool)
+    print(f"{name:<28} {n / elapsed:>10,.0f} timers/s  ({elapsed * 1000:,.0f} ms)")
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--timers", type=int, default=5000)
+    parser.add_argument("--concurrency", type=int, default=20)
+    args = parser.parse_args()
+    n = args.timers
+    durations = [60] * n
+
+    pool = await asyncpg.create_pool(os.environ["DATABASE_URL"], min_size=args.concurrency, max_size=args.concurrency)
+    repo = TimerRepo(pool)
+    await _clear(pool)
+
+    async def sequential() -> None:
+        for duration in durations:
+            await repo.create(duration)
+
+    async def concurrent() -> None:
+        sem = asyncio.Semaphore(args.concurrency)
+
+        async def one(duration: int) -> None:
+            async with sem:
+                await repo.create(duration)
+
+        await asyncio.gather(*(one(d) for d in durations))
+
+    async def chunked() -> None:
+        for offset in range(0, n, BULK_CREATE_CHUNK_ROWS):
+            await repo.create_many(durations[offset:offset + BULK_CREATE_CHUNK_ROWS])
+
+    from app.main import app, lifespan
+
+    async with lifespan(app), AsyncClient(transport=ASGITransport(app=app), base_url="http://bench") as client:
+
+        async def http_per_row() -> None:
+            for duration in durations:
+                await client.post("/api/v1/timers", json={"duration": duration})
+
+        async def http_bulk() -> None:
+            response = await client.post("/api/v1/timers:bulk", json={"timers": [{"duration": d} for d in durations]})
+            assert response.text.count("\n") == n
+
+        try:
+            await _rate("repo.create sequential", n, pool, sequential)
+            await _rate(f"repo.create x{args.concurrency} concurrent", n, pool, concurrent)
+            await _rate("repo.create_many chunked", n, pool, chunked)
+            await _rate("POST /timers per row", n, pool, http_per_row)
+            await _rate("POST /timers:bulk", n, pool, http_bulk)
+        finally:
+            await _clear(pool)
+            await pool.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,83 @@
+"""Benchmark: cold start to first served request.
+
+Starts `uvicorn app.main:app` as a fresh process N times and measures, from
+spawn, when the first GET /api/v1/timers succeeds, plus the latency of that
+first request and of the ones right after it. Also prints the worker's own
+startup phase breakdown from GET /health/ready. Requires DATABASE_URL to
+point at a reachable database.
+
+    python -m benchmarks.bench_cold_start --runs 5
+"""
+import argparse
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import time
+
+import httpx
+
+POLL_INTERVAL = 0.005
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def _timed_get(client: httpx.Client, url: str) -> float:
+    started = time.perf_counter()
+    client.get(url).raise_for_status()
+    return time.perf_counter() - started
+
+
+def run_once() -> dict:
+    port = _free_port()
+    base = f"http://127.0.0.1:{port}"
+    spawned = time.perf_counter()
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(port), "--log-level", "warning"],
+    )
+    try:
+        with httpx.Client(timeout=5.0) as client:
+            while True:
+                if server.poll() is not None:
+                    raise RuntimeError(f"server exited with {server.returncode}")
+                try:
+                    first = _timed_get(client, f"{base}/api/v1/timers")
+                    break
+                except httpx.TransportError:
+                    time.sleep(POLL_INTERVAL)
+            served = time.perf_counter() - spawned
+            following = [_timed_get(client, f"{base}/api/v1/timers") for _ in range(20)]
+            startup = client.get(f"{base}/health/ready").json()["startup"]
+    finally:
+        server.terminate()
+        server.wait()
+    return {"served": served, "first": first, "following": statistics.median(following), "startup": startup}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+    os.environ["DATABASE_URL"]  # fail fast: the spawned server needs it
+
+    results = [run_once() for _ in range(args.runs)]
+
+    def median_ms(key: str) -> float:
+        return statistics.median(r[key] for r in results) * 1000
+
+    print(f"spawn -> first response   {median_ms('served'):8.1f} ms (median of {args.runs})")
+    print(f"first request latency     {median_ms('first'):8.1f} ms")
+    print(f"steady request latency    {median_ms('following'):8.1f} ms")
+    print("worker startup phases (last run):")
+    for name, ms in results[-1]["startup"]["phases_ms"].items():
+        print(f"  {name:<22}{ms:8.1f} ms")
+    print(f"  {'ready':<22}{results[-1]['startup']['ready_ms']:8.1f} ms after process start")
+
+
+if __name__ == "__main__":
+    main()
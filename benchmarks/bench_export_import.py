@@ -0,0 +1,93 @@
+"""Benchmark: binary export/import vs list_all and per-row TimerRepo.create.
+
+Seeds N timers, then reports rows/s for export_binary (COPY TO STDOUT) and
+list_all, and for import_binary (COPY FROM STDIN + merge) versus creating the
+same number of timers one INSERT at a time. Peak Python heap during export is
+measured with tracemalloc to show it does not grow with N. Requires
+DATABASE_URL to point at a migrated database; the timers table is emptied.
+
+    python -m benchmarks.bench_export_import --rows 100000
+"""
+import argparse
+import asyncio
+import os
+import time
+import tracemalloc
+
+import asyncpg
+
+from app.repos.timer_repo import TimerRepo
+
+_SEED_SQL = """
+    INSERT INTO timers (id, duration, elapsed_time, status, urgency_level, created_at, updated_at)
+    SELECT gen_random_uuid(), 60, 0, 'idle', 0, now(), now() FROM generate_series(1, $1)
+"""
+
+
+async def _timed(coro) -> tuple[object, float]:
+    started = time.perf_counter()
+    result = await coro
+    return result, time.perf_counter() - started
+
+
+async def _drain(repo: TimerRepo) -> int:
+    """Stream one export, discarding it. Returns its size in bytes."""
+    size = 0
+    async for chunk in repo.export_binary():
+        size += len(chunk)
+    return size
+
+
+async def _peak_heap(repo: TimerRepo) -> int:
+    tracemalloc.start()
+    try:
+        await _drain(repo)
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+async def _source(chunks: list[bytes]):
+    for chunk in chunks:
+        yield chunk
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=100000)
+    parser.add_argument("--create-rows", type=int, default=5000, help="per-row INSERTs timed (extrapolated)")
+    args = parser.parse_args()
+
+    pool = await asyncpg.create_pool(os.environ["DATABASE_URL"], min_size=2, max_size=4)
+    repo = TimerRepo(pool)
+    try:
+        async with pool.acquire() as conn:
+            await conn.execute("DELETE FROM timers")
+            await conn.execute(_SEED_SQL, args.rows)
+
+        size, export_s = await _timed(_drain(repo))
+        peak = await _peak_heap(repo)
+        _, list_s = await _timed(repo.list_all())
+        print(f"export_binary: {args.rows / export_s:,.0f} rows/s, {size / 1e6:.1f} MB, peak heap {peak / 1e6:.2f} MB")
+        print(f"list_all:      {args.rows / list_s:,.0f} rows/s")
+
+        chunks = [chunk async for chunk in repo.export_binary()]
+        async with pool.acquire() as conn:
+            await conn.execute("DELETE FROM timers")
+        (received, imported), import_s = await _timed(repo.import_binary(_source(chunks)))
+        assert received == imported == args.rows
+        print(f"import_binary: {args.rows / import_s:,.0f} rows/s")
+
+        started = time.perf_counter()
+        for _ in range(args.create_rows):
+            await repo.create(60)
+        create_s = time.perf_counter() - started
+        print(f"create:        {args.create_rows / create_s:,.0f} rows/s")
+    finally:
+        async with pool.acquire() as conn:
+            await conn.execute("DELETE FROM timers")
+        await pool.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,98 @@
+"""Benchmark: completion scheduler with many active timers.
+
+Inserts N running wall-clock timers whose completions are spread over a
+window, rebuilds the scheduler from the database and lets it run until every
+timer has completed. Reports rebuild time, how late completions were
+persisted (p50/p99/max) and the worst event-loop lag seen by a 10 ms probe
+task meanwhile. Requires DATABASE_URL to point at a migrated database; the
+rows are deleted afterwards.
+
+    python -m benchmarks.bench_scheduler --timers 100000 --window 20
+"""
+import argparse
+import asyncio
+import os
+import time
+
+import asyncpg
+
+from app.repos.timer_repo import TimerRepo
+from app.services.completion_scheduler import CompletionScheduler
+
+
+async def probe_lag(stop: asyncio.Event, interval: float = 0.01) -> float:
+    worst = 0.0
+    while not stop.is_set():
+        started = time.perf_counter()
+        await asyncio.sleep(interval)
+        worst = max(worst, time.perf_counter() - started - interval)
+    return worst
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--timers", type=int, default=100_000)
+    parser.add_argument("--window", type=float, default=20.0, help="seconds over which completions are spread")
+    args = parser.parse_args()
+
+    pool = await asyncpg.create_pool(os.environ["DATABASE_URL"], min_size=2, max_size=4)
+    repo = TimerRepo(pool)
+
+    async def factory():
+        return repo
+
+    # Every timer is already at urgency 3 with 5 s left at `base`, so each one
+    # needs exactly one write (its completion) at base + 5 + offset.
+    base = time.time() + 5
+    async with pool.acquire() as conn:
+        ids = await conn.fetchval(
+            """
+            WITH inserted AS (
+                INSERT INTO timers (id, duration, elapsed_time, status, urgency_level,
+                                    created_at, updated_at, started_at)
+                SELECT gen_random_uuid(), 100, 95, 'running', 3, now(), now(),
+                       to_timestamp($2 + (g::float / $1) * $3 - 5)
+                FROM generate_series(1, $1) AS g
+                RETURNING id
+            )
+            SELECT array_agg(id) FROM inserted
+            """,
+            args.timers,
+            base,
+            args.window,
+        )
+    stop = asyncio.Event()
+    lag_task = asyncio.create_task(probe_lag(stop))
+    scheduler = CompletionScheduler(factory, resync_interval=3600)
+    try:
+        started = time.perf_counter()
+        await scheduler.rebuild()
+        print(f"rebuild timers={scheduler.pending} seconds={time.perf_counter() - started:.3f}")
+
+        lateness = []
+        while scheduler.pending:
+            due_at = scheduler.next_due()
+            delay = due_at - time.time()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            settled = await scheduler.run_due()
+            if settled:
+                lateness.append(time.time() - due_at)
+            await asyncio.sleep(0)
+        stop.set()
+        lateness.sort()
+        print(
+            f"completed={scheduler.settled} batches={len(lateness)} "
+            f"batch_lateness_ms p50={lateness[len(lateness) // 2] * 1000:.1f} "
+            f"p99={lateness[int(len(lateness) * 0.99)] * 1000:.1f} max={lateness[-1] * 1000:.1f}"
+        )
+        print(f"event_loop_lag_max_ms={await lag_task * 1000:.1f}")
+    finally:
+        stop.set()
+        async with pool.acquire() as conn:
+            await conn.execute("DELETE FROM timers WHERE id = ANY($1::uuid[])", ids)
+        await pool.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,106 @@
+"""Benchmark: response serialization for GET /timers/{id} and GET /timers.
+
+Measures in-process requests/s through httpx.ASGITransport (no network) and,
+separately, the per-row encode cost of the pydantic pipeline
+(Timer -> TimerResponse -> JSON) against the raw TimerRow encoder. Requires
+DATABASE_URL to point at a migrated database.
+
+    python -m benchmarks.bench_serialization --requests 2000 --rows 100
+"""
+import argparse
+import asyncio
+import os
+import time
+
+import asyncpg
+from httpx import ASGITransport, AsyncClient
+
+from app.main import app
+from app.database import close_pool
+
+
+async def requests_per_second(client: AsyncClient, url: str, requests: int, concurrency: int) -> float:
+    sem = asyncio.Semaphore(concurrency)
+
+    async def one() -> None:
+        async with sem:
+            response = await client.get(url)
+            response.raise_for_status()
+
+    started = time.perf_counter()
+    await asyncio.gather(*(one() for _ in range(requests)))
+    return requests / (time.perf_counter() - started)
+
+
+async def bench_endpoints(requests: int, rows: int, concurrency: int) -> None:
+    transport = ASGITransport(app=app)
+    async with AsyncClient(transport=transport, base_url="http://bench") as client:
+        ids = [
+            (await client.post("/api/v1/timers", json={"duration": 60 + i})).json()["id"]
+            for i in range(rows)
+        ]
+        try:
+            for label, url in (
+                ("GET /timers/{id}", f"/api/v1/timers/{ids[0]}"),
+                (f"GET /timers?limit={rows}", f"/api/v1/timers?limit={rows}"),
+            ):
+                await requests_per_second(client, url, min(requests, 100), concurrency)  # warm-up
+                rps = await requests_per_second(client, url, requests, concurrency)
+                print(f"endpoint={label!r} requests_per_s={rps:.0f}")
+        finally:
+            pool = await asyncpg.connect(os.environ["DATABASE_URL"])
+            await pool.execute("DELETE FROM timers WHERE id = ANY($1::uuid[])", ids)
+            await pool.close()
+    await close_pool()
+
+
+async def bench_encoding(rows: int, rounds: int) -> None:
+    from app.models.encoding import encode_timer_list
+    from app.models.timer import Timer, TimerListResponse, TimerResponse, TimerRow
+
+    conn = await asyncpg.connect(os.environ["DATABASE_URL"])
+    try:
+        records = await conn.fetch(
+            """
+            SELECT gen_random_uuid() AS id, 60 AS duration, 10 AS elapsed_time,
+                   'running' AS status, 0 AS urgency_level, now() AS created_at,
+                   now() AS updated_at, NULL::timestamptz AS started_at
+            FROM generate_series(1, $1)
+            """,
+            rows,
+        )
+    finally:
+        await conn.close()
+
+    def pydantic_path() -> bytes:
+        timers = [Timer(**dict(r)) for r in records]
+        items = [TimerResponse.model_validate(t, from_attributes=True) for t in timers]
+        return TimerListResponse(items=items, count=len(items)).model_dump_json().encode()
+
+    def raw_path() -> bytes:
+        return encode_timer_list([TimerRow._make(r) for r in records])
+
+    for label, fn in (("pydantic", pydantic_path), ("raw", raw_path)):
+        started = time.perf_counter()
+        for _ in range(rounds):
+            fn()
+        elapsed = time.perf_counter() - started
+        print(f"encode={label} rows_per_s={rows * rounds / elapsed:.0f}")
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--rows", type=int, default=100)
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--rounds", type=int, default=200)
+    parser.add_argument("--skip-encoding", action="store_true")
+    args = parser.parse_args()
+
+    await bench_endpoints(args.requests, args.rows, args.concurrency)
+    if not args.skip_encoding:
+        await bench_encoding(args.rows, args.rounds)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
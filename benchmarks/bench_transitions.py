@@ -0,0 +1,89 @@
+"""Benchmark: read-modify-write ticks vs atomic single-statement ticks.
+
+Fires concurrent ticks at one running timer (tick engine) through both paths
+and reports p50/p99 latency plus lost updates (ticks issued minus ticks
+persisted). Requires DATABASE_URL to point at a migrated database.
+
+    python -m benchmarks.bench_transitions --ticks 2000 --concurrency 50
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import time
+from uuid import UUID
+
+import asyncpg
+
+from app.models.timer import TimerStatus
+from app.repos.timer_repo import TimerRepo
+from app.services.timer_service import TimerService
+
+
+async def legacy_tick(repo: TimerRepo, service: TimerService, timer_id: UUID) -> None:
+    """The pre-atomic path: get_by_id then update, on two pool connections."""
+    timer = await repo.get_by_id(timer_id)
+    new_elapsed = timer.elapsed_time + 1
+    await repo.update(
+        timer_id,
+        elapsed_time=new_elapsed,
+        status=TimerStatus.complete if new_elapsed >= timer.duration else timer.status,
+        urgency_level=service.compute_urgency(new_elapsed, timer.duration),
+    )
+
+
+async def atomic_tick(repo: TimerRepo, service: TimerService, timer_id: UUID) -> None:
+    await repo.tick(timer_id)
+
+
+async def run(name: str, tick, pool: asyncpg.Pool, ticks: int, concurrency: int) -> dict:
+    repo = TimerRepo(pool)
+    service = TimerService(repo, wallclock=False)
+    timer = await repo.create(ticks * 10)
+    await repo.start(timer.id, wallclock=False)
+
+    latencies: list[float] = []
+    sem = asyncio.Semaphore(concurrency)
+
+    async def one() -> None:
+        async with sem:
+            started = time.perf_counter()
+            await tick(repo, service, timer.id)
+            latencies.append(time.perf_counter() - started)
+
+    wall = time.perf_counter()
+    await asyncio.gather(*(one() for _ in range(ticks)))
+    wall = time.perf_counter() - wall
+
+    final = await repo.get_by_id(timer.id)
+    async with pool.acquire() as conn:
+        await conn.execute("DELETE FROM timers WHERE id = $1", timer.id)
+
+    quantiles = statistics.quantiles(latencies, n=100)
+    return {
+        "path": name,
+        "ticks": ticks,
+        "ticks_per_s": round(ticks / wall, 1),
+        "p50_ms": round(quantiles[49] * 1000, 3),
+        "p99_ms": round(quantiles[98] * 1000, 3),
+        "lost_updates": ticks - final.elapsed_time,
+    }
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--ticks", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=50)
+    args = parser.parse_args()
+
+    pool = await asyncpg.create_pool(os.environ["DATABASE_URL"], min_size=5, max_size=20)
+    try:
+        for name, tick in (("read-modify-write", legacy_tick), ("atomic", atomic_tick)):
+            result = await run(name, tick, pool, args.ticks, args.concurrency)
+            print(" ".join(f"{k}={v}" for k, v in result.items()))
+    finally:
+        await pool.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
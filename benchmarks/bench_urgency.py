@@ -0,0 +1,102 @@
+"""Benchmark: scalar vs vectorized urgency, and the set-based recompute job.
+
+Computes urgency for N random (elapsed, duration) pairs with the original
+float if-chain, the integer scalar TimerService.compute_urgency and the NumPy
+batch API, and reports timers/s for each. With --db it also inserts N running
+timers and times one TimerRepo.recompute_urgency pass over them (requires
+DATABASE_URL to point at a migrated database; the rows are deleted afterwards).
+
+    python -m benchmarks.bench_urgency --timers 1000000 --db
+"""
+import argparse
+import asyncio
+import os
+import time
+
+import asyncpg
+import numpy as np
+
+from app.services.timer_service import TimerService
+from app.services.urgency import completed, urgency_levels
+
+
+def float_urgency(elapsed_time: int, duration: int) -> int:
+    """The pre-vectorization implementation (float percentage + if-chain)."""
+    if duration <= 0:
+        return 0
+    percentage = (elapsed_time / duration) * 100
+    if percentage < 33:
+        return 0
+    elif percentage < 66:
+        return 1
+    elif percentage < 90:
+        return 2
+    else:
+        return 3
+
+
+def bench_compute(timers: int) -> None:
+    rng = np.random.default_rng(0)
+    duration = rng.integers(1, 86_400, timers)
+    elapsed = rng.integers(0, duration + 1)
+    pairs = list(zip(elapsed.tolist(), duration.tolist()))
+    service = TimerService(repo=None)
+
+    def run(label: str, fn) -> None:
+        started = time.perf_counter()
+        fn()
+        elapsed_s = time.perf_counter() - started
+        print(f"compute={label} timers={timers} seconds={elapsed_s:.3f} timers_per_s={timers / elapsed_s:,.0f}")
+
+    run("float_scalar", lambda: [float_urgency(e, d) for e, d in pairs])
+    run("int_scalar", lambda: [service.compute_urgency(e, d) for e, d in pairs])
+    run("numpy_batch", lambda: (urgency_levels(elapsed, duration), completed(elapsed, duration)))
+
+
+async def bench_recompute(timers: int) -> None:
+    from app.repos.timer_repo import TimerRepo
+
+    pool = await asyncpg.create_pool(os.environ["DATABASE_URL"], min_size=1, max_size=2)
+    try:
+        async with pool.acquire() as conn:
+            ids = await conn.fetchval(
+                """
+                WITH inserted AS (
+                    INSERT INTO timers (id, duration, elapsed_time, status, urgency_level,
+                                        created_at, updated_at, started_at)
+                    SELECT gen_random_uuid(), 60 + (g % 3600), 0, 'running', 0,
+                           now(), now(), now() - make_interval(secs => g % 3600)
+                    FROM generate_series(1, $1) AS g
+                    RETURNING id
+                )
+                SELECT array_agg(id) FROM inserted
+                """,
+                timers,
+            )
+        repo = TimerRepo(pool)
+        try:
+            for label in ("first_pass", "steady_state"):
+                started = time.perf_counter()
+                changed = await repo.recompute_urgency()
+                elapsed_s = time.perf_counter() - started
+                print(f"recompute={label} timers={timers} changed={changed} seconds={elapsed_s:.3f}")
+        finally:
+            async with pool.acquire() as conn:
+                await conn.execute("DELETE FROM timers WHERE id = ANY($1::uuid[])", ids)
+    finally:
+        await pool.close()
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--timers", type=int, default=1_000_000)
+    parser.add_argument("--db", action="store_true", help="also time the SQL recompute job")
+    args = parser.parse_args()
+
+    bench_compute(args.timers)
+    if args.db:
+        await bench_recompute(args.timers)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,325 @@
+"""Load test: scripted scenarios against the timer API with latency percentiles.
+
+Drives the real FastAPI app either in-process through httpx.ASGITransport
+(as tests/conftest.py does, with the app lifespan running), against a local
+uvicorn this script starts (--uvicorn), or against any running server (--url).
+
+Scenarios:
+  ticking  N running timers, each ticked once per second by its own client
+  reads    list-heavy reads: first pages, status-filtered pages, cursor follow-ups
+  burst    bursts of concurrent create+start pairs
+
+Each scenario reports requests, errors, throughput and p50/p95/p99/max latency
+per request type, plus DB queries per request (from GET /health/pool, so
+single-worker servers only; type introspection on connections opened while
+the pool grows is included). Results are written as JSON; pass an earlier file as --baseline
+to print the relative change. Requires DATABASE_URL to point at a migrated
+database (the script deletes the timers it created).
+
+    python -m benchmarks.loadtest --scenario all --timers 200 --seconds 10
+    python -m benchmarks.loadtest --uvicorn --baseline benchmarks/results/old.json
+"""
+import argparse
+import asyncio
+import contextlib
+import json
+import os
+import random
+import socket
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+import asyncpg
+from httpx import ASGITransport, AsyncClient
+
+RESULTS_DIR = Path(__file__).parent / "results"
+API = "/api/v1/timers"
+
+
+class Recorder:
+    """Latencies (seconds) and error counts per request label."""
+
+    def __init__(self) -> None:
+        self.latencies: dict[str, list[float]] = {}
+        self.errors: dict[str, int] = {}
+        self.started = 0.0
+        self.queries_before: int | None = None
+
+    async def begin(self, client: AsyncClient) -> None:
+        """Mark the end of setup: throughput and queries are counted from here."""
+        self.queries_before = await pool_queries(client)
+        self.started = time.perf_counter()
+
+    async def request(self, client: AsyncClient, label: str, method: str, url: str, **kwargs):
+        started = time.perf_counter()
+        try:
+            response = await client.request(method, url, **kwargs)
+        except Exception:
+            self.errors[label] = self.errors.get(label, 0) + 1
+            return None
+        self.latencies.setdefault(label, []).append(time.perf_counter() - started)
+        if response.status_code >= 400:
+            self.errors[label] = self.errors.get(label, 0) + 1
+            return None
+        return response
+
+    def summary(self, elapsed: float) -> dict:
+        return {
+            label: {
+                "requests": len(samples),
+                "errors": self.errors.get(label, 0),
+                "throughput_rps": round(len(samples) / elapsed, 1),
+                "p50_ms": percentile(samples, 50),
+                "p95_ms": percentile(samples, 95),
+                "p99_ms": percentile(samples, 99),
+                "max_ms": round(max(samples) * 1000, 3),
+            }
+            for label, samples in sorted(self.latencies.items())
+        }
+
+
+def percentile(samples: list[float], q: float) -> float:
+    """Nearest-rank percentile of `samples`, in milliseconds."""
+    ordered = sorted(samples)
+    rank = max(0, min(len(ordered) - 1, round(q / 100 * len(ordered)) - 1))
+    return round(ordered[rank] * 1000, 3)
+
+
+async def create_timers(client: AsyncClient, count: int, duration: int, start: bool) -> list[str]:
+    """Setup helper (not measured): create, and optionally start, `count` timers."""
+    ids = []
+    for offset in range(0, count, 500):
+        batch = [
+            (await client.post(API, json={"duration": duration})).json()["id"]
+            for _ in range(min(500, count - offset))
+        ]
+        if start:
+            (await client.post(f"{API}:start", json={"ids": batch})).raise_for_status()
+        ids.extend(batch)
+    return ids
+
+
+async def scenario_ticking(client: AsyncClient, args, created: list[str]) -> Recorder:
+    """Every timer ticks at 1 Hz on its own schedule, like one open browser tab each."""
+    ids = await create_timers(client, args.timers, duration=24 * 3600, start=True)
+    created.extend(ids)
+    recorder = Recorder()
+    await recorder.begin(client)
+    deadline = time.perf_counter() + args.seconds
+
+    async def tab(timer_id: str) -> None:
+        # Spread the first ticks over one second, then tick on a fixed 1 s grid.
+        next_tick = time.perf_counter() + random.random()
+        while next_tick < deadline:
+            await asyncio.sleep(max(0.0, next_tick - time.perf_counter()))
+            await recorder.request(client, "POST /timers/{id}/tick", "POST", f"{API}/{timer_id}/tick")
+            next_tick += 1.0
+
+    await asyncio.gather(*(tab(timer_id) for timer_id in ids))
+    return recorder
+
+
+async def scenario_reads(client: AsyncClient, args, created: list[str]) -> Recorder:
+    """`concurrency` readers paging through the list endpoint."""
+    ids = await create_timers(client, args.rows, duration=3600, start=False)
+    created.extend(ids)
+    await client.post(f"{API}:start", json={"ids": ids[: len(ids) // 3]})
+    recorder = Recorder()
+    await recorder.begin(client)
+    deadline = time.perf_counter() + args.seconds
+
+    async def reader() -> None:
+        while time.perf_counter() < deadline:
+            page = await recorder.request(client, "GET /timers", "GET", API, params={"limit": 100})
+            await recorder.request(
+                client, "GET /timers?status=running", "GET", API, params={"limit": 100, "status": "running"}
+            )
+            cursor = page.json().get("next_cursor") if page is not None else None
+            if cursor:
+                await recorder.request(
+                    client, "GET /timers?cursor", "GET", API, params={"limit": 100, "cursor": cursor}
+                )
+
+    await asyncio.gather(*(reader() for _ in range(args.concurrency)))
+    return recorder
+
+
+async def scenario_burst(client: AsyncClient, args, created: list[str]) -> Recorder:
+    """`bursts` rounds of `burst_size` concurrent create-then-start pairs."""
+    recorder = Recorder()
+    await recorder.begin(client)
+
+    async def create_and_start() -> None:
+        response = await recorder.request(client, "POST /timers", "POST", API, json={"duration": 300})
+        if response is None:
+            return
+        timer_id = response.json()["id"]
+        created.append(timer_id)
+        await recorder.request(client, "POST /timers/{id}/start", "POST", f"{API}/{timer_id}/start")
+
+    for _ in range(args.bursts):
+        await asyncio.gather(*(create_and_start() for _ in range(args.burst_size)))
+        await asyncio.sleep(args.burst_pause)
+    return recorder
+
+
+SCENARIOS = {"ticking": scenario_ticking, "reads": scenario_reads, "burst": scenario_burst}
+
+
+async def pool_queries(client: AsyncClient) -> int | None:
+    response = await client.get("/health/pool")
+    return response.json().get("queries") if response.status_code == 200 else None
+
+
+async def run_scenario(client: AsyncClient, name: str, args, created: list[str]) -> dict:
+    recorder = await SCENARIOS[name](client, args, created)
+    elapsed = time.perf_counter() - recorder.started
+    queries_after = await pool_queries(client)
+    result = {"seconds": round(elapsed, 3), "requests": recorder.summary(elapsed)}
+    measured = sum(len(v) for v in recorder.latencies.values())
+    if recorder.queries_before is not None and queries_after is not None and measured:
+        result["db_queries_per_request"] = round((queries_after - recorder.queries_before) / measured, 3)
+    return result
+
+
+async def cleanup(created: list[str]) -> None:
+    if not created:
+        return
+    conn = await asyncpg.connect(os.environ["DATABASE_URL"])
+    try:
+        await conn.execute("DELETE FROM timers WHERE id = ANY($1::uuid[])", created)
+    finally:
+        await conn.close()
+
+
+@contextlib.asynccontextmanager
+async def in_process_client():
+    from app.main import app
+
+    async with app.router.lifespan_context(app):
+        async with AsyncClient(transport=ASGITransport(app=app), base_url="http://bench") as client:
+            yield client
+
+
+@contextlib.asynccontextmanager
+async def uvicorn_client():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        port = sock.getsockname()[1]
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(port), "--log-level", "warning"]
+    )
+    try:
+        async with AsyncClient(base_url=f"http://127.0.0.1:{port}", timeout=30) as client:
+            for _ in range(100):
+                with contextlib.suppress(Exception):
+                    if (await client.get("/health")).status_code == 200:
+                        break
+                await asyncio.sleep(0.1)
+            else:
+                raise RuntimeError("uvicorn did not become healthy")
+            yield client
+    finally:
+        server.terminate()
+        server.wait(timeout=10)
+
+
+@contextlib.asynccontextmanager
+async def remote_client(url: str):
+    async with AsyncClient(base_url=url, timeout=30) as client:
+        yield client
+
+
+def git_commit() -> str | None:
+    with contextlib.suppress(Exception):
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], text=True).strip()
+    return None
+
+
+def print_comparison(results: dict, baseline: dict) -> None:
+    """Relative change of each latency/throughput figure against a baseline result file."""
+    for name, scenario in results["scenarios"].items():
+        old_scenario = baseline.get("scenarios", {}).get(name)
+        if old_scenario is None:
+            continue
+        for label, stats in scenario["requests"].items():
+            old = old_scenario["requests"].get(label)
+            if old is None:
+                continue
+            changes = ", ".join(
+                f"{key}={_change(old[key], stats[key])}"
+                for key in ("throughput_rps", "p50_ms", "p95_ms", "p99_ms")
+            )
+            print(f"  vs baseline {name} {label}: {changes}")
+
+
+def _change(old: float, new: float) -> str:
+    return f"{(new - old) / old * 100:+.1f}%" if old else "n/a"
+
+
+async def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--scenario", choices=[*SCENARIOS, "all"], default="all")
+    target = parser.add_mutually_exclusive_group()
+    target.add_argument("--uvicorn", action="store_true", help="start a local uvicorn and test over HTTP")
+    target.add_argument("--url", help="test an already running server")
+    parser.add_argument("--seconds", type=float, default=10.0, help="duration of ticking/reads")
+    parser.add_argument("--timers", type=int, default=200, help="running timers in the ticking scenario")
+    parser.add_argument("--rows", type=int, default=1000, help="timers seeded for the reads scenario")
+    parser.add_argument("--concurrency", type=int, default=20, help="concurrent readers")
+    parser.add_argument("--bursts", type=int, default=10)
+    parser.add_argument("--burst-size", type=int, default=100)
+    parser.add_argument("--burst-pause", type=float, default=0.5)
+    parser.add_argument("--output", type=Path, help="result file (default: benchmarks/results/<time>-<commit>.json)")
+    parser.add_argument("--baseline", type=Path, help="earlier result file to compare against")
+    args = parser.parse_args()
+
+    if args.url:
+        client_context, target_name = remote_client(args.url), args.url
+    elif args.uvicorn:
+        client_context, target_name = uvicorn_client(), "uvicorn"
+    else:
+        client_context, target_name = in_process_client(), "asgi"
+
+    names = list(SCENARIOS) if args.scenario == "all" else [args.scenario]
+    results = {
+        "meta": {
+            "commit": git_commit(),
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "target": target_name,
+            "args": {k: str(v) if isinstance(v, Path) else v for k, v in vars(args).items()},
+        },
+        "scenarios": {},
+    }
+    created: list[str] = []
+    try:
+        async with client_context as client:
+            for name in names:
+                result = await run_scenario(client, name, args, created)
+                results["scenarios"][name] = result
+                for label, stats in result["requests"].items():
+                    print(
+                        f"scenario={name} request={label!r} rps={stats['throughput_rps']} "
+                        f"p50={stats['p50_ms']}ms p95={stats['p95_ms']}ms p99={stats['p99_ms']}ms "
+                        f"errors={stats['errors']}"
+                    )
+                if "db_queries_per_request" in result:
+                    print(f"scenario={name} db_queries_per_request={result['db_queries_per_request']}")
+    finally:
+        await cleanup(created)
+
+    output = args.output or RESULTS_DIR / (
+        f"{datetime.now().strftime('%Y%m%d-%H%M%S')}-{results['meta']['commit'] or 'nogit'}.json"
+    )
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(results, indent=2) + "\n")
+    print(f"results written to {output}")
+    if args.baseline:
+        print_comparison(results, json.loads(args.baseline.read_text()))
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
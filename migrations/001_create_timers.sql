@@ -1,4 +1,4 @@
-CREATE TABLE timers (
+CREATE TABLE IF NOT EXISTS timers (
     id UUID PRIMARY KEY DEFAULT gen_random_uuid(),
     duration INTEGER NOT NULL,
     elapsed_time INTEGER NOT NULL DEFAULT 0,
@@ -8,5 +8,5 @@ CREATE TABLE timers (
     updated_at TIMESTAMPTZ NOT NULL DEFAULT now()
 );
 
-CREATE INDEX idx_timers_status ON timers(status);
-CREATE INDEX idx_timers_created_at ON timers(created_at);
+CREATE INDEX IF NOT EXISTS idx_timers_status ON timers(status);
+CREATE INDEX IF NOT EXISTS idx_timers_created_at ON timers(created_at);
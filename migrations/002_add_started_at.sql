@@ -0,0 +1,4 @@
+-- Wall-clock engine: a running timer stores the accumulated elapsed_time at the
+-- moment it was (re)started plus the anchor below; the current elapsed time is
+-- elapsed_time + (now() - started_at), computed on read.
+ALTER TABLE timers ADD COLUMN IF NOT EXISTS started_at TIMESTAMPTZ;
@@ -0,0 +1,3 @@
+-- Keyset pagination for GET /api/v1/timers orders by (created_at, id) DESC and
+-- seeks with (created_at, id) < ($1, $2); this index serves both.
+CREATE INDEX IF NOT EXISTS idx_timers_created_at_id ON timers (created_at DESC, id DESC);
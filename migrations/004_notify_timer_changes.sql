@@ -0,0 +1,20 @@
+-- Publish every write to the timers table on the timer_changes channel so each
+-- worker can invalidate its in-process cache. Payload: "<id>,<updated_at in
+-- epoch microseconds>" for inserts/updates, "<id>" for deletes.
+CREATE OR REPLACE FUNCTION notify_timer_change() RETURNS trigger AS $$
+BEGIN
+    IF TG_OP = 'DELETE' THEN
+        PERFORM pg_notify('timer_changes', OLD.id::text);
+        RETURN OLD;
+    END IF;
+    PERFORM pg_notify(
+        'timer_changes',
+        NEW.id::text || ',' || round(extract(epoch FROM NEW.updated_at) * 1000000)::bigint
+    );
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE TRIGGER timers_notify_change
+AFTER INSERT OR UPDATE OR DELETE ON timers
+FOR EACH ROW EXECUTE FUNCTION notify_timer_change();
@@ -0,0 +1,53 @@
+-- Replace the per-row NOTIFY of migration 004 with statement-level triggers
+-- over transition tables: a batch write (start_many, the completion
+-- scheduler, tick flushes) now sends one notification per 100 rows instead
+-- of one per row. Each payload is newline-separated entries in the 004
+-- format: "<id>,<updated_at in epoch microseconds>" for inserts/updates,
+-- "<id>" for deletes. 100 entries stay well under the 8000-byte payload limit.
+DROP TRIGGER IF EXISTS timers_notify_change ON timers;
+DROP FUNCTION IF EXISTS notify_timer_change();
+
+CREATE OR REPLACE FUNCTION notify_timer_changes() RETURNS trigger AS $$
+DECLARE
+    payload text;
+BEGIN
+    IF TG_OP = 'DELETE' THEN
+        FOR payload IN
+            SELECT string_agg(entry, E'\n')
+            FROM (
+                SELECT id::text AS entry, (row_number() OVER () - 1) / 100 AS chunk
+                FROM old_rows
+            ) entries
+            GROUP BY chunk
+        LOOP
+            PERFORM pg_notify('timer_changes', payload);
+        END LOOP;
+    ELSE
+        FOR payload IN
+            SELECT string_agg(entry, E'\n')
+            FROM (
+                SELECT id::text || ',' || round(extract(epoch FROM updated_at) * 1000000)::bigint AS entry,
+                       (row_number() OVER () - 1) / 100 AS chunk
+                FROM new_rows
+            ) entries
+            GROUP BY chunk
+        LOOP
+            PERFORM pg_notify('timer_changes', payload);
+        END LOOP;
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+-- Transition tables require one trigger per event.
+CREATE OR REPLACE TRIGGER timers_notify_insert
+AFTER INSERT ON timers REFERENCING NEW TABLE AS new_rows
+FOR EACH STATEMENT EXECUTE FUNCTION notify_timer_changes();
+
+CREATE OR REPLACE TRIGGER timers_notify_update
+AFTER UPDATE ON timers REFERENCING NEW TABLE AS new_rows
+FOR EACH STATEMENT EXECUTE FUNCTION notify_timer_changes();
+
+CREATE OR REPLACE TRIGGER timers_notify_delete
+AFTER DELETE ON timers REFERENCING OLD TABLE AS old_rows
+FOR EACH STATEMENT EXECUTE FUNCTION notify_timer_changes();
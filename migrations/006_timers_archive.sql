@@ -0,0 +1,24 @@
+-- Separate the finished set from the active one. The retention job
+-- (app.services.retention_job) moves `complete` timers older than
+-- RETENTION_AGE_DAYS from timers into timers_archive in bounded batches, so
+-- the hot table, its indexes and its vacuum work only cover live timers.
+-- Range partitioning timers by created_at was rejected: the primary key
+-- would have to include created_at, and every lookup by id would then probe
+-- each partition.
+CREATE TABLE IF NOT EXISTS timers_archive (
+    id UUID PRIMARY KEY,
+    duration INTEGER NOT NULL,
+    elapsed_time INTEGER NOT NULL,
+    status VARCHAR(255) NOT NULL,
+    urgency_level INTEGER NOT NULL,
+    created_at TIMESTAMPTZ NOT NULL,
+    updated_at TIMESTAMPTZ NOT NULL,
+    started_at TIMESTAMPTZ,
+    archived_at TIMESTAMPTZ NOT NULL DEFAULT now()
+);
+
+CREATE INDEX IF NOT EXISTS idx_timers_archive_archived_at ON timers_archive (archived_at);
+
+-- Retention batches pick the oldest completed timers; this index covers only
+-- that set, so a batch reads `limit` index entries instead of scanning.
+CREATE INDEX IF NOT EXISTS idx_timers_complete_updated_at ON timers (updated_at) WHERE status = 'complete';
@@ -0,0 +1,19 @@
+-- status holds one of four TimerStatus values; VARCHAR(255) accepted anything.
+-- This blocks timers: the type change takes an ACCESS EXCLUSIVE lock, and the
+-- runner applies the file in one transaction, so every read and write waits
+-- until it commits, including the CHECK's full scan of the table. On a large
+-- table, apply it in a maintenance window.
+ALTER TABLE timers ALTER COLUMN status TYPE TEXT;
+ALTER TABLE timers DROP CONSTRAINT IF EXISTS timers_status_check;
+ALTER TABLE timers ADD CONSTRAINT timers_status_check
+    CHECK (status IN ('idle', 'running', 'paused', 'complete'));
+
+ALTER TABLE timers_archive ALTER COLUMN status TYPE TEXT;
+ALTER TABLE timers_archive DROP CONSTRAINT IF EXISTS timers_archive_status_check;
+ALTER TABLE timers_archive ADD CONSTRAINT timers_archive_status_check
+    CHECK (status IN ('idle', 'running', 'paused', 'complete'));
+
+-- The completion scheduler's rebuild and the urgency recompute job read only
+-- running wall-clock timers; this index covers exactly that (small) set
+-- instead of the status index's entries for every timer ever created.
+CREATE INDEX IF NOT EXISTS idx_timers_running ON timers (started_at) WHERE status = 'running';
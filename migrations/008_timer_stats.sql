@@ -0,0 +1,76 @@
+-- Live timer counts per (status, urgency_level) for GET /api/v1/timers/stats,
+-- maintained by statement-level triggers in the same transaction as every
+-- write, so reading them is a sum over at most a few hundred rows however
+-- large timers grows. Each (status, urgency_level) is split over 16 slots
+-- picked by backend pid: concurrent writers from different pool connections
+-- update different rows instead of queueing on one hot counter. Writes that
+-- leave status and urgency_level unchanged (ticks) net out and touch nothing.
+-- Drift (e.g. a trigger disabled during a manual load) is repaired by the
+-- stats reconcile job (app.services.stats_job).
+CREATE TABLE IF NOT EXISTS timer_stats (
+    status TEXT NOT NULL,
+    urgency_level INTEGER NOT NULL,
+    slot SMALLINT NOT NULL,
+    count BIGINT NOT NULL,
+    PRIMARY KEY (status, urgency_level, slot)
+);
+
+CREATE OR REPLACE FUNCTION timer_stats_apply() RETURNS trigger AS $$
+DECLARE
+    backend_slot SMALLINT := pg_backend_pid() % 16;
+BEGIN
+    -- Rows are upserted in key order so two writers sharing a slot lock them
+    -- in the same order and cannot deadlock.
+    IF TG_OP = 'INSERT' THEN
+        INSERT INTO timer_stats AS s (status, urgency_level, slot, count)
+        SELECT status, urgency_level, backend_slot, count(*) FROM new_rows GROUP BY 1, 2 ORDER BY 1, 2
+        ON CONFLICT (status, urgency_level, slot) DO UPDATE SET count = s.count + EXCLUDED.count;
+    ELSIF TG_OP = 'UPDATE' THEN
+        INSERT INTO timer_stats AS s (status, urgency_level, slot, count)
+        SELECT status, urgency_level, backend_slot, sum(delta)
+        FROM (
+            SELECT status, urgency_level, 1 AS delta FROM new_rows
+            UNION ALL
+            SELECT status, urgency_level, -1 FROM old_rows
+        ) deltas
+        GROUP BY 1, 2
+        HAVING sum(delta) <> 0
+        ORDER BY 1, 2
+        ON CONFLICT (status, urgency_level, slot) DO UPDATE SET count = s.count + EXCLUDED.count;
+    ELSE
+        INSERT INTO timer_stats AS s (status, urgency_level, slot, count)
+        SELECT status, urgency_level, backend_slot, -count(*) FROM old_rows GROUP BY 1, 2 ORDER BY 1, 2
+        ON CONFLICT (status, urgency_level, slot) DO UPDATE SET count = s.count + EXCLUDED.count;
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION timer_stats_truncate() RETURNS trigger AS $$
+BEGIN
+    DELETE FROM timer_stats;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE TRIGGER timers_stats_insert
+AFTER INSERT ON timers REFERENCING NEW TABLE AS new_rows
+FOR EACH STATEMENT EXECUTE FUNCTION timer_stats_apply();
+
+CREATE OR REPLACE TRIGGER timers_stats_update
+AFTER UPDATE ON timers REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+FOR EACH STATEMENT EXECUTE FUNCTION timer_stats_apply();
+
+CREATE OR REPLACE TRIGGER timers_stats_delete
+AFTER DELETE ON timers REFERENCING OLD TABLE AS old_rows
+FOR EACH STATEMENT EXECUTE FUNCTION timer_stats_apply();
+
+CREATE OR REPLACE TRIGGER timers_stats_truncate
+AFTER TRUNCATE ON timers
+FOR EACH STATEMENT EXECUTE FUNCTION timer_stats_truncate();
+
+-- Backfill. Creating the triggers above locked timers against writes until
+-- this transaction commits, so the snapshot counted here is exact.
+DELETE FROM timer_stats;
+INSERT INTO timer_stats (status, urgency_level, slot, count)
+SELECT status, urgency_level, 0, count(*) FROM timers GROUP BY 1, 2;
@@ -0,0 +1,8 @@
+-- Last run of each cluster-wide periodic job. Every worker schedules the job,
+-- but a pass only goes ahead after claiming its row here (last_run_at older
+-- than the interval), so the work happens once per interval across workers
+-- and a restart does not repeat a pass another worker just ran.
+CREATE TABLE IF NOT EXISTS job_runs (
+    name TEXT PRIMARY KEY,
+    last_run_at TIMESTAMPTZ NOT NULL
+);
@@ -0,0 +1,55 @@
+-- Per-row version assigned by the database. updated_at is stamped from the
+-- writer's clock before it queues for a pool connection and the row lock, so
+-- two writes can commit in the opposite order to their stamps (and hosts'
+-- clocks differ); readers that keep the newest copy of a row (the read cache,
+-- the completion scheduler, tick flushes, ETags) need an order that follows
+-- commits. A BEFORE UPDATE trigger runs once the row lock is held and sees
+-- the last committed version, so every UPDATE -- the repo's and any made by
+-- hand -- commits exactly one version after the one it replaced.
+-- Adding a column with a constant default does not rewrite the table.
+ALTER TABLE timers ADD COLUMN IF NOT EXISTS version BIGINT NOT NULL DEFAULT 1;
+ALTER TABLE timers_archive ADD COLUMN IF NOT EXISTS version BIGINT NOT NULL DEFAULT 1;
+
+CREATE OR REPLACE FUNCTION timers_bump_version() RETURNS trigger AS $$
+BEGIN
+    NEW.version := OLD.version + 1;
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE TRIGGER timers_bump_version
+BEFORE UPDATE ON timers
+FOR EACH ROW EXECUTE FUNCTION timers_bump_version();
+
+-- Change notifications now carry that version: "<id>,<version>" for inserts
+-- and updates, "<id>" for deletes (otherwise as in migration 005).
+CREATE OR REPLACE FUNCTION notify_timer_changes() RETURNS trigger AS $$
+DECLARE
+    payload text;
+BEGIN
+    IF TG_OP = 'DELETE' THEN
+        FOR payload IN
+            SELECT string_agg(entry, E'\n')
+            FROM (
+                SELECT id::text AS entry, (row_number() OVER () - 1) / 100 AS chunk
+                FROM old_rows
+            ) entries
+            GROUP BY chunk
+        LOOP
+            PERFORM pg_notify('timer_changes', payload);
+        END LOOP;
+    ELSE
+        FOR payload IN
+            SELECT string_agg(entry, E'\n')
+            FROM (
+                SELECT id::text || ',' || version AS entry, (row_number() OVER () - 1) / 100 AS chunk
+                FROM new_rows
+            ) entries
+            GROUP BY chunk
+        LOOP
+            PERFORM pg_notify('timer_changes', payload);
+        END LOOP;
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
@@ -4,8 +4,12 @@ import pytest
 import pytest_asyncio
 import asyncpg
 from httpx import AsyncClient, ASGITransport
+from app.config import DATABASE_URL, TIMER_BACKEND
 from app.main import app
+from app.migrate import migrate_database
 from app.database import get_pool, close_pool
+from app.repos.memory_repo import get_memory_repo
+from app.repos.timer_cache import close_timer_cache
 
 
 @pytest.fixture(scope="session")
@@ -16,18 +20,36 @@ def event_loop():
     loop.close()
 
 
+@pytest_asyncio.fixture(scope="session", autouse=True)
+async def migrated_schema():
+    """Bring the test database's schema up to date once per session."""
+    if TIMER_BACKEND == "postgres":
+        await migrate_database(DATABASE_URL)
+
+
 @pytest_asyncio.fixture
 async def db_pool():
     """Provide a database pool and clean the timers table between tests."""
+    if TIMER_BACKEND != "postgres":
+        pytest.skip("needs TIMER_BACKEND=postgres")
     pool = await get_pool()
     yield pool
-    async with pool.acquire() as conn:
-        await conn.execute("DELETE FROM timers")
+    await _clear_database(pool)
 
 
 @pytest_asyncio.fixture
-async def async_client(db_pool):
-    """Provide an httpx AsyncClient against the FastAPI app."""
+async def async_client():
+    """Provide an httpx AsyncClient against the FastAPI app, on an empty TIMER_BACKEND store."""
     transport = ASGITransport(app=app)
     async with AsyncClient(transport=transport, base_url="http://test") as client:
         yield client
+    if TIMER_BACKEND == "memory":
+        get_memory_repo().clear()
+    else:
+        await _clear_database(await get_pool())
+
+
+async def _clear_database(pool: asyncpg.Pool) -> None:
+    async with pool.acquire() as conn:
+        await conn.execute("DELETE FROM timers")
+    await close_timer_cache()
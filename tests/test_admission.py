@@ -0,0 +1,124 @@
+"""Tests for admission control: priorities, shedding and the adaptive limit."""
+import asyncio
+import pytest
+from httpx import ASGITransport, AsyncClient
+from app.admission import (
+    BACKGROUND,
+    READ,
+    TRANSITION,
+    AdmissionController,
+    AdmissionMiddleware,
+    classify,
+)
+
+
+def make_controller(limit=1, queue_size=10, queue_timeout=1.0, min_limit=1, max_limit=10) -> AdmissionController:
+    return AdmissionController(limit, min_limit, max_limit, queue_size, queue_timeout, latency_target=0.1)
+
+
+def scope(method: str, path: str, query: bytes = b"") -> dict:
+    return {"type": "http", "method": method, "path": path, "query_string": query}
+
+
+def test_classify_favours_transitions():
+    assert classify(scope("POST", "/api/v1/timers/abc/start")) == TRANSITION
+    assert classify(scope("POST", "/api/v1/timers:reset")) == TRANSITION
+    assert classify(scope("POST", "/api/v1/timers")) == TRANSITION
+    assert classify(scope("GET", "/api/v1/timers/abc")) == READ
+    assert classify(scope("GET", "/api/v1/timers")) == BACKGROUND
+    assert classify(scope("POST", "/api/v1/timers/abc/tick")) == BACKGROUND
+    assert classify(scope("GET", "/api/v1/timers/abc", b"wait=5&since=1")) is None
+    assert classify(scope("GET", "/api/v1/timers/abc/stream")) is None
+    assert classify(scope("GET", "/health/ready")) is None
+
+
+@pytest.mark.asyncio
+async def test_queued_requests_are_admitted_by_priority():
+    controller = make_controller(limit=1)
+    held = await controller.acquire(READ)
+    order = []
+
+    async def request(priority: int, name: str) -> None:
+        admitted = await controller.acquire(priority)
+        order.append(name)
+        controller.release(admitted, 0.0, failed=False)
+
+    waiting = [asyncio.create_task(request(BACKGROUND, "list")), asyncio.create_task(request(READ, "get"))]
+    await asyncio.sleep(0)
+    waiting.append(asyncio.create_task(request(TRANSITION, "start")))
+    await asyncio.sleep(0)
+    controller.release(held, 0.0, failed=False)
+    await asyncio.gather(*waiting)
+
+    assert order == ["start", "get", "list"]
+    assert controller.in_flight == 0
+
+
+@pytest.mark.asyncio
+async def test_full_queue_sheds_or_evicts_less_important():
+    controller = make_controller(limit=1, queue_size=1)
+    held = await controller.acquire(READ)
+    background = asyncio.create_task(controller.acquire(BACKGROUND))
+    await asyncio.sleep(0)
+
+    # Queue full of an equally important request: shed at once.
+    assert await controller.acquire(BACKGROUND) is None
+    # A transition displaces the queued background request.
+    transition = asyncio.create_task(controller.acquire(TRANSITION))
+    await asyncio.sleep(0)
+    assert await background is None
+
+    controller.release(held, 0.0, failed=False)
+    assert await transition is not None
+
+
+@pytest.mark.asyncio
+async def test_queue_deadline_sheds():
+    controller = make_controller(limit=1, queue_timeout=0.05)
+    await controller.acquire(READ)
+
+    assert await controller.acquire(READ) is None
+    assert controller.in_flight == 1
+
+
+@pytest.mark.asyncio
+async def test_limit_grows_additively_and_backs_off_once_per_generation():
+    controller = make_controller(limit=2, max_limit=10)
+    first = await controller.acquire(READ)
+    second = await controller.acquire(READ)
+    controller.release(first, 0.01, failed=False)
+    assert controller.limit == pytest.approx(2.5)
+
+    controller.release(second, 0.5, failed=False)
+    assert controller.limit == pytest.approx(2.25)
+    # Admitted before that cut: does not cut again.
+    controller.release(first, 0.5, failed=False)
+    assert controller.limit == pytest.approx(2.25)
+    later = await controller.acquire(READ)
+    controller.release(later, 0.0, failed=True)
+    assert controller.limit == pytest.approx(2.025)
+
+
+@pytest.mark.asyncio
+async def test_middleware_returns_503_with_retry_after_when_shed():
+    release = asyncio.Event()
+
+    async def slow_app(scope, receive, send):
+        await release.wait()
+        await send({"type": "http.response.start", "status": 200, "headers": []})
+        await send({"type": "http.response.body", "body": b"{}"})
+
+    app = AdmissionMiddleware(
+        slow_app, initial_limit=1, min_limit=1, max_limit=1, queue_size=0, queue_timeout=1.0, latency_target=1.0
+    )
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+        first = asyncio.create_task(client.get("/api/v1/timers/abc"))
+        await asyncio.sleep(0.05)
+        shed = await client.get("/api/v1/timers/abc")
+        bypass = asyncio.create_task(client.get("/health/ready"))
+        release.set()
+
+        assert shed.status_code == 503
+        assert shed.headers["retry-after"] == "1"
+        assert (await first).status_code == 200
+        assert (await bypass).status_code == 200
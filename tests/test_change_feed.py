@@ -0,0 +1,138 @@
+"""Tests for the LISTEN/NOTIFY change feed: parsing, coalescing, overflow and dispatch."""
+import asyncio
+from uuid import uuid4
+import pytest
+from app.config import DATABASE_URL
+from app.repos.timer_repo import TimerRepo
+from app.services.change_feed import ChangeFeed, parse_payload
+
+
+class RecordingConsumer:
+    def __init__(self) -> None:
+        self.changes: list[dict] = []
+        self.resets = 0
+
+    def on_changes(self, changes) -> None:
+        self.changes.append(dict(changes))
+
+    def on_reset(self) -> None:
+        self.resets += 1
+
+    def seen(self) -> dict:
+        merged = {}
+        for changes in self.changes:
+            merged.update(changes)
+        return merged
+
+
+def make_feed(**kwargs) -> tuple[ChangeFeed, RecordingConsumer]:
+    feed = ChangeFeed(DATABASE_URL, **kwargs)
+    consumer = RecordingConsumer()
+    feed.subscribe(consumer)
+    return feed, consumer
+
+
+class TestParsePayload:
+    """Tests for the trigger payload format."""
+
+    def test_writes_and_deletes(self):
+        a, b = uuid4(), uuid4()
+        assert parse_payload(f"{a},1700000000000000\n{b}") == {a: 1700000000000000, b: None}
+
+    def test_malformed_entries_are_skipped(self):
+        a = uuid4()
+        assert parse_payload(f"not-a-uuid,1\n{a},x\n{a},5") == {a: 5}
+
+
+class TestCoalescing:
+    """Tests for pending-change coalescing and overflow without a connection."""
+
+    def test_latest_version_wins(self):
+        feed, consumer = make_feed()
+        a, b = uuid4(), uuid4()
+        feed.handle_payload(f"{a},1\n{b},1")
+        feed.handle_payload(f"{a},3")
+        feed.handle_payload(f"{a},2")
+
+        feed.dispatch_pending()
+
+        assert consumer.changes == [{a: 3, b: 1}]
+        stats = feed.stats()
+        assert (stats.notifications, stats.changes, stats.coalesced, stats.dispatches) == (3, 4, 2, 1)
+
+    def test_delete_is_final(self):
+        feed, consumer = make_feed()
+        a = uuid4()
+        feed.handle_payload(str(a))
+        feed.handle_payload(f"{a},9")
+        feed.dispatch_pending()
+        assert consumer.changes == [{a: None}]
+
+    def test_nothing_pending_dispatches_nothing(self):
+        feed, consumer = make_feed()
+        feed.dispatch_pending()
+        assert consumer.changes == [] and consumer.resets == 0
+
+    def test_overflow_resets_consumers_once(self):
+        feed, consumer = make_feed(max_pending=2)
+        feed.handle_payload("\n".join(f"{uuid4()},1" for _ in range(3)))
+        feed.handle_payload(f"{uuid4()},1")
+
+        feed.dispatch_pending()
+
+        assert consumer.changes == []
+        assert consumer.resets == 1
+        assert feed.stats().overflows == 1
+        # The next burst is collected normally again.
+        a = uuid4()
+        feed.handle_payload(f"{a},1")
+        feed.dispatch_pending()
+        assert consumer.changes == [{a: 1}]
+
+    def test_failing_consumer_does_not_block_others(self):
+        feed, consumer = make_feed()
+
+        class Broken:
+            def on_changes(self, changes):
+                raise RuntimeError("boom")
+
+            def on_reset(self):
+                raise RuntimeError("boom")
+
+        feed._consumers.insert(0, Broken())
+        a = uuid4()
+        feed.handle_payload(f"{a},1")
+        feed.dispatch_pending()
+        assert consumer.changes == [{a: 1}]
+
+
+@pytest.mark.asyncio
+async def test_batch_write_is_one_dispatch(db_pool):
+    """A multi-row statement reaches consumers as one coalesced dispatch."""
+    feed, consumer = make_feed(coalesce_window=0.05)
+    feed.start()
+    try:
+        await asyncio.sleep(0.2)  # let the feed connect
+        repo = TimerRepo(db_pool)
+        timers = [await repo.create(60) for _ in range(3)]
+        await asyncio.sleep(0.1)
+        consumer.changes.clear()
+        notifications = feed.stats().notifications
+
+        await repo.start_many([t.id for t in timers])
+        for _ in range(50):
+            if consumer.changes:
+                break
+            await asyncio.sleep(0.02)
+
+        assert feed.stats().notifications == notifications + 1
+        assert consumer.changes[0].keys() == {t.id for t in timers}
+        async with db_pool.acquire() as conn:
+            await conn.execute("DELETE FROM timers WHERE id = $1", timers[0].id)
+        for _ in range(50):
+            if consumer.seen().get(timers[0].id, 0) is None:
+                break
+            await asyncio.sleep(0.02)
+        assert consumer.seen()[timers[0].id] is None
+    finally:
+        await feed.close()
@@ -0,0 +1,245 @@
+"""Tests for the completion scheduler: deadlines, arming, settling and rebuild."""
+import asyncio
+from datetime import datetime, timedelta, timezone
+from unittest.mock import AsyncMock
+import pytest
+from app.models.timer import TimerStatus
+from app.repos.timer_repo import TimerRepo
+from app.services.completion_scheduler import CompletionScheduler, next_deadline
+from app.services.timer_service import TimerService
+from tests.test_timer_service import make_timer
+
+NOW = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+
+def running(duration=100, elapsed_time=0, urgency_level=0, started_at=NOW):
+    return make_timer(
+        duration=duration,
+        elapsed_time=elapsed_time,
+        status=TimerStatus.running,
+        urgency_level=urgency_level,
+        started_at=started_at,
+    )
+
+
+def make_scheduler(repo) -> CompletionScheduler:
+    async def factory():
+        return repo
+
+    return CompletionScheduler(factory, resync_interval=60)
+
+
+class TestNextDeadline:
+    """Tests for next_deadline."""
+
+    def test_next_urgency_threshold_comes_first(self):
+        assert next_deadline(running(duration=100)) == NOW.timestamp() + 33
+        assert next_deadline(running(duration=100, urgency_level=2)) == NOW.timestamp() + 90
+        # ceil(10 * 33 / 100) = 4 seconds
+        assert next_deadline(running(duration=10)) == NOW.timestamp() + 4
+
+    def test_completion_after_last_threshold(self):
+        assert next_deadline(running(duration=100, urgency_level=3)) == NOW.timestamp() + 100
+
+    def test_accounts_for_elapsed_before_restart(self):
+        assert next_deadline(running(duration=100, elapsed_time=50, urgency_level=1)) == NOW.timestamp() + 16
+
+    def test_overdue_threshold_is_due_immediately(self):
+        assert next_deadline(running(duration=100, elapsed_time=80, urgency_level=0)) == NOW.timestamp()
+
+    def test_not_running_has_no_deadline(self):
+        assert next_deadline(make_timer(status=TimerStatus.paused)) is None
+        # Tick engine timers run without an anchor.
+        assert next_deadline(running(started_at=None)) is None
+
+
+class TestCompletionScheduler:
+    """Tests for arming and settling with a mock repository."""
+
+    @pytest.mark.asyncio
+    async def test_settles_only_due_timers_and_rearms_them(self):
+        due = running(duration=10, urgency_level=3)
+        later = running(duration=1000)
+        repo = AsyncMock()
+        repo.settle_due_many.return_value = {due.id: due._replace(status=TimerStatus.complete.value)}
+        scheduler = make_scheduler(repo)
+        scheduler.track([due, later])
+
+        assert await scheduler.run_due(now=NOW.timestamp() + 10) == 1
+
+        repo.settle_due_many.assert_called_once_with([due.id])
+        assert scheduler.pending == 1
+        assert scheduler.next_due() == NOW.timestamp() + 330
+
+    @pytest.mark.asyncio
+    async def test_stopped_timer_is_disarmed(self):
+        timer = running(duration=10)
+        repo = AsyncMock()
+        scheduler = make_scheduler(repo)
+        scheduler.track([timer])
+
+        scheduler.track([timer._replace(status=TimerStatus.paused.value, started_at=None)])
+
+        assert await scheduler.run_due(now=NOW.timestamp() + 100) == 0
+        repo.settle_due_many.assert_not_called()
+        assert scheduler.next_due() is None
+
+    @pytest.mark.asyncio
+    async def test_restart_replaces_deadline(self):
+        timer = running(duration=100, urgency_level=3)
+        repo = AsyncMock()
+        repo.settle_due_many.return_value = {}
+        scheduler = make_scheduler(repo)
+        scheduler.track([timer])
+        scheduler.track([timer._replace(started_at=NOW + timedelta(seconds=50))])
+
+        assert await scheduler.run_due(now=NOW.timestamp() + 100) == 0
+        assert await scheduler.run_due(now=NOW.timestamp() + 150) == 1
+
+    @pytest.mark.asyncio
+    async def test_not_yet_due_in_database_is_retried(self):
+        timer = running(duration=10, urgency_level=3)
+        repo = AsyncMock()
+        repo.settle_due_many.return_value = {timer.id: timer}
+        scheduler = make_scheduler(repo)
+        scheduler.track([timer])
+
+        await scheduler.run_due(now=NOW.timestamp() + 10)
+
+        assert scheduler.pending == 1
+        assert scheduler.next_due() > NOW.timestamp() + 10
+
+    @pytest.mark.asyncio
+    async def test_failed_settle_rearms_batch(self):
+        timer = running(duration=10, urgency_level=3)
+        repo = AsyncMock()
+        repo.settle_due_many.side_effect = RuntimeError("db down")
+        scheduler = make_scheduler(repo)
+        scheduler.track([timer])
+
+        with pytest.raises(RuntimeError):
+            await scheduler.run_due(now=NOW.timestamp() + 10)
+
+        assert scheduler.pending == 1
+
+    @pytest.mark.asyncio
+    async def test_service_transitions_arm_the_scheduler(self):
+        timer = running(duration=100)
+        repo = AsyncMock()
+        repo.start.return_value = timer
+        repo.stop.return_value = timer._replace(status=TimerStatus.paused.value, started_at=None)
+        scheduler = make_scheduler(repo)
+        service = TimerService(repo, completion_scheduler=scheduler)
+
+        await service.start_timer(timer.id)
+        assert scheduler.pending == 1
+        await service.stop_timer(timer.id)
+        assert scheduler.pending == 0
+
+    def test_many_timers(self):
+        scheduler = make_scheduler(AsyncMock())
+        timers = [running(duration=60 + i % 3600, urgency_level=3) for i in range(100_000)]
+
+        scheduler.track(timers)
+
+        assert scheduler.pending == 100_000
+        assert scheduler.next_due() == NOW.timestamp() + 60
+
+
+@pytest.mark.asyncio
+async def test_rebuild_and_complete_overdue_timer(db_pool):
+    """A timer whose tab closed is completed from the database snapshot alone."""
+    repo = TimerRepo(db_pool)
+    overdue = await repo.create(5)
+    halfway = await repo.create(100)
+    await repo.start_many([overdue.id, halfway.id])
+    async with db_pool.acquire() as conn:
+        await conn.execute(
+            "UPDATE timers SET started_at = $2 WHERE id = ANY($1::uuid[])",
+            [overdue.id, halfway.id],
+            datetime.now(timezone.utc) - timedelta(seconds=40),
+        )
+    scheduler = make_scheduler(repo)
+
+    await scheduler.rebuild()
+    assert await scheduler.run_due() == 2
+
+    completed = await repo.get_by_id(overdue.id)
+    assert completed.status == TimerStatus.complete
+    assert completed.elapsed_time == 5
+    still_running = await repo.get_by_id(halfway.id)
+    assert still_running.status == TimerStatus.running
+    assert still_running.urgency_level == 1
+    assert scheduler.pending == 1
+
+
+class TestChangeFeedConsumer:
+    """Tests for the scheduler's reaction to other workers' writes."""
+
+    @pytest.mark.asyncio
+    async def test_unknown_write_is_refreshed_and_armed(self):
+        timer = running(duration=100)
+        repo = AsyncMock()
+        repo.get_many.return_value = {timer.id: timer}
+        scheduler = make_scheduler(repo)
+
+        scheduler.on_changes({timer.id: timer.version})
+        await scheduler.refresh()
+
+        repo.get_many.assert_called_once_with([timer.id])
+        assert scheduler.next_due() == NOW.timestamp() + 33
+
+    @pytest.mark.asyncio
+    async def test_echo_of_own_write_is_ignored(self):
+        armed = running(duration=100)
+        completed = running(duration=100)._replace(status=TimerStatus.complete.value)
+        repo = AsyncMock()
+        scheduler = make_scheduler(repo)
+        scheduler.track([armed, completed])
+
+        scheduler.on_changes({t.id: t.version for t in (armed, completed)})
+        await scheduler.refresh()
+
+        repo.get_many.assert_not_called()
+
+    def test_delete_disarms(self):
+        timer = running(duration=100)
+        scheduler = make_scheduler(AsyncMock())
+        scheduler.track([timer])
+        scheduler.on_changes({timer.id: None})
+        assert scheduler.pending == 0
+
+    @pytest.mark.asyncio
+    async def test_change_queued_during_refresh_wakes_the_next_pass(self):
+        started = datetime.now(timezone.utc)
+        first, second = running(started_at=started), running(started_at=started)
+        refreshing, release = asyncio.Event(), asyncio.Event()
+
+        async def iter_running():
+            return
+            yield
+
+        async def get_many(timer_ids):
+            refreshing.set()
+            await release.wait()
+            return {t.id: t for t in (first, second) if t.id in timer_ids}
+
+        repo = AsyncMock()
+        repo.iter_running = iter_running
+        repo.get_many.side_effect = get_many
+        scheduler = make_scheduler(repo)
+        scheduler.start()
+        try:
+            scheduler.on_changes({first.id: first.version})
+            await asyncio.wait_for(refreshing.wait(), 1)
+            scheduler.on_changes({second.id: second.version})
+            release.set()
+            # Without the wakeup this waits for the first deadline (33s away).
+            for _ in range(100):
+                if repo.get_many.await_count == 2:
+                    break
+                await asyncio.sleep(0.01)
+            assert repo.get_many.await_args_list[1].args == ([second.id],)
+            assert scheduler.pending == 2
+        finally:
+            await scheduler.close()
@@ -0,0 +1,83 @@
+"""Integration tests for the connection pool: prepared statements and utilisation stats."""
+import asyncio
+import pytest
+from httpx import AsyncClient
+from app.database import get_pool_stats
+from app.repos.statements import STATEMENTS, warm_up
+from app.repos.timer_repo import _PAGE_SQL
+
+
+@pytest.mark.asyncio
+async def test_pool_connections_prepare_registered_statements(db_pool):
+    """Every registered repo statement is prepared before the connection is first used."""
+    async with db_pool.acquire() as conn:
+        prepared = {
+            row["statement"]
+            for row in await conn.fetch("SELECT statement FROM pg_prepared_statements")
+        }
+    assert set(STATEMENTS.values()) <= prepared
+
+
+@pytest.mark.asyncio
+async def test_registered_statements_run_without_preparing_again(db_pool):
+    """conn.fetch(sql) finds the statement prepare_all cached (it relies on asyncpg's private _prepare)."""
+    count_sql = "SELECT count(*) FROM pg_prepared_statements"
+    async with db_pool.acquire() as conn:
+        await conn.fetch(count_sql)
+        before = await conn.fetchval(count_sql)
+        await conn.fetch(_PAGE_SQL, 1)
+        after = await conn.fetchval(count_sql)
+    assert after == before
+
+
+@pytest.mark.asyncio
+async def test_warm_up_executes_statements_and_keeps_nothing(db_pool):
+    """Warm-up plans the per-request statements on the connection and rolls back its writes."""
+    async with db_pool.acquire() as conn:
+        await warm_up(conn)
+        plans = await conn.fetchval(
+            "SELECT generic_plans + custom_plans FROM pg_prepared_statements WHERE statement = $1", _PAGE_SQL
+        )
+        remaining = await conn.fetchval("SELECT count(*) FROM timers")
+    assert plans >= 1
+    assert remaining == 0
+
+
+@pytest.mark.asyncio
+async def test_pool_stats_track_acquires(db_pool):
+    """Acquires are counted and timed; nothing is waiting once they are released."""
+    before = get_pool_stats().acquires
+    async with db_pool.acquire():
+        in_use = get_pool_stats()
+
+    stats = get_pool_stats()
+    assert stats.acquires == before + 1
+    assert in_use.in_use >= 1
+    assert stats.waiters == 0
+    assert stats.acquire_ms_max >= stats.acquire_ms_p95 >= 0
+    assert stats.min_size <= stats.size <= stats.max_size
+
+
+@pytest.mark.asyncio
+async def test_pool_stats_count_queries_but_not_session_resets(db_pool):
+    """Each statement is counted once; the reset run on release is not."""
+    async with db_pool.acquire() as conn:
+        await conn.fetchval("SELECT 1")
+    await asyncio.sleep(0)  # query loggers run via call_soon
+    before = get_pool_stats().queries
+
+    async with db_pool.acquire() as conn:
+        await conn.fetchval("SELECT 1")
+        await conn.fetchval("SELECT 2")
+    await asyncio.sleep(0)
+
+    assert get_pool_stats().queries == before + 2
+
+
+@pytest.mark.asyncio
+async def test_health_pool_endpoint(db_pool, async_client: AsyncClient):
+    """GET /health/pool reports pool utilisation."""
+    response = await async_client.get("/health/pool")
+    assert response.status_code == 200
+    body = response.json()
+    assert {"size", "idle", "waiters", "acquire_ms_p95"} <= body.keys()
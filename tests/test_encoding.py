@@ -0,0 +1,43 @@
+"""Parity tests: raw TimerRow encoding must match FastAPI/pydantic output."""
+import json
+from datetime import datetime, timezone
+from uuid import uuid4
+from app.models.encoding import encode_batch, encode_timer, encode_timer_list
+from app.models.timer import (
+    BatchTimerResponse,
+    BatchTimerResult,
+    TimerListResponse,
+    TimerResponse,
+    TimerRow,
+)
+
+
+def make_row(microsecond: int = 123456) -> TimerRow:
+    now = datetime(2024, 5, 1, 12, 30, 0, microsecond, tzinfo=timezone.utc)
+    return TimerRow(uuid4(), 60, 12, "running", 0, now, now, now)
+
+
+def test_encode_timer_matches_pydantic():
+    for row in (make_row(), make_row(microsecond=0)):
+        expected = TimerResponse.model_validate(row, from_attributes=True).model_dump_json()
+        assert encode_timer(row).decode() == expected
+
+
+def test_encode_timer_list_matches_pydantic():
+    rows = [make_row(), make_row()]
+    items = [TimerResponse.model_validate(r, from_attributes=True) for r in rows]
+    expected = TimerListResponse(items=items, count=2, next_cursor="abc", total_estimate=7)
+    assert encode_timer_list(rows, "abc", 7).decode() == expected.model_dump_json()
+    assert json.loads(encode_timer_list([]))["items"] == []
+
+
+def test_encode_batch_matches_pydantic():
+    row = make_row()
+    missing = uuid4()
+    expected = BatchTimerResponse(
+        items=[
+            BatchTimerResult(id=row.id, timer=TimerResponse.model_validate(row, from_attributes=True)),
+            BatchTimerResult(id=missing, error="Timer not found"),
+        ]
+    )
+    assert encode_batch([(row.id, row), (missing, None)]).decode() == expected.model_dump_json()
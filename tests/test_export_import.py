@@ -0,0 +1,83 @@
+"""Tests for binary export/import (GET /export, POST /import)."""
+import io
+import pytest
+from httpx import AsyncClient
+from app.repos.timer_repo import EXPORT_QUEUE_CHUNKS, TimerRepo
+
+COLUMNS = ["id", "duration", "elapsed_time", "status", "urgency_level", "created_at", "updated_at", "started_at"]
+
+
+async def _stored(db_pool) -> list[tuple]:
+    async with db_pool.acquire() as conn:
+        rows = await conn.fetch(f"SELECT {', '.join(COLUMNS)} FROM timers ORDER BY id")
+    return [tuple(row) for row in rows]
+
+
+@pytest.mark.asyncio
+async def test_export_import_round_trip(db_pool, async_client: AsyncClient):
+    ids = [(await async_client.post("/api/v1/timers", json={"duration": d})).json()["id"] for d in (10, 20, 30)]
+    await async_client.post(f"/api/v1/timers/{ids[0]}/start")
+    before = await _stored(db_pool)
+
+    export = await async_client.get("/api/v1/timers/export")
+    assert export.status_code == 200
+    assert export.headers["content-type"] == "application/vnd.timers.pgcopy"
+    assert export.content.startswith(b"PGCOPY\n\xff\r\n\x00")
+
+    async with db_pool.acquire() as conn:
+        await conn.execute("DELETE FROM timers")
+    response = await async_client.post("/api/v1/timers/import", content=export.content)
+    assert response.json() == {"received": 3, "imported": 3, "skipped": 0}
+    assert await _stored(db_pool) == before
+
+    # Existing ids are kept as they are.
+    await async_client.post(f"/api/v1/timers/{ids[1]}/start")
+    changed = await _stored(db_pool)
+    response = await async_client.post("/api/v1/timers/import", content=export.content)
+    assert response.json() == {"received": 3, "imported": 0, "skipped": 3}
+    assert await _stored(db_pool) == changed
+
+
+@pytest.mark.asyncio
+async def test_import_rejects_malformed_stream(db_pool, async_client: AsyncClient):
+    response = await async_client.post("/api/v1/timers/import", content=b"not a copy stream")
+    assert response.status_code == 400
+    assert await _stored(db_pool) == []
+
+
+@pytest.mark.asyncio
+async def test_import_rejects_invalid_rows_atomically(db_pool, async_client: AsyncClient):
+    async with db_pool.acquire() as conn:
+        async with conn.transaction():
+            await conn.execute("CREATE TEMP TABLE bad (LIKE timers INCLUDING DEFAULTS) ON COMMIT DROP")
+            await conn.execute(
+                "INSERT INTO bad SELECT gen_random_uuid(), 10, 0, s, 0, now(), now(), NULL"
+                " FROM unnest(ARRAY['idle', 'bogus']) AS s"
+            )
+            dump = io.BytesIO()
+            await conn.copy_from_table("bad", columns=COLUMNS, format="binary", output=dump)
+
+    response = await async_client.post("/api/v1/timers/import", content=dump.getvalue())
+
+    assert response.status_code == 400
+    assert await _stored(db_pool) == []
+
+
+@pytest.mark.asyncio
+async def test_closing_export_early_releases_the_connection(db_pool):
+    repo = TimerRepo(db_pool)
+    async with db_pool.acquire() as conn:
+        await conn.execute(
+            "INSERT INTO timers (id, duration, elapsed_time, status, urgency_level, created_at, updated_at)"
+            " SELECT gen_random_uuid(), 60, 0, 'idle', 0, now(), now() FROM generate_series(1, 20000)"
+        )
+
+    stream = repo.export_binary()
+    assert (await anext(stream)).startswith(b"PGCOPY")
+    await stream.aclose()
+
+    chunks = [chunk async for chunk in repo.export_binary()]
+    assert len(chunks) > EXPORT_QUEUE_CHUNKS
+    assert chunks[-1].endswith(b"\xff\xff")
+    async with db_pool.acquire() as conn:
+        assert await conn.fetchval("SELECT count(*) FROM timers") == 20000
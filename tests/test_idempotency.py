@@ -0,0 +1,118 @@
+"""Tests for Idempotency-Key handling of POST requests."""
+import asyncio
+import pytest
+from httpx import ASGITransport, AsyncClient
+from app.idempotency import IdempotencyMiddleware, IdempotencyStore, StoredResponse
+
+
+@pytest.mark.asyncio
+async def test_retried_create_is_replayed(async_client: AsyncClient):
+    """A POST retried with the same Idempotency-Key creates one timer and returns the same body."""
+    headers = {"Idempotency-Key": "create-1"}
+    first = await async_client.post("/api/v1/timers", json={"duration": 60}, headers=headers)
+    retry = await async_client.post("/api/v1/timers", json={"duration": 60}, headers=headers)
+
+    assert first.status_code == retry.status_code == 201
+    assert retry.json() == first.json()
+    assert retry.headers["idempotent-replayed"] == "true"
+    assert "idempotent-replayed" not in first.headers
+    assert (await async_client.get("/api/v1/timers")).json()["count"] == 1
+
+
+@pytest.mark.asyncio
+async def test_concurrent_requests_with_one_key_execute_once(async_client: AsyncClient):
+    """Requests racing with the same key wait for the first and share its response."""
+    headers = {"Idempotency-Key": "create-2"}
+    responses = await asyncio.gather(
+        *(async_client.post("/api/v1/timers", json={"duration": 60}, headers=headers) for _ in range(5))
+    )
+
+    assert len({r.json()["id"] for r in responses}) == 1
+    assert (await async_client.get("/api/v1/timers")).json()["count"] == 1
+
+
+@pytest.mark.asyncio
+async def test_keys_are_scoped_to_method_and_path_and_optional(async_client: AsyncClient):
+    """The same key on another path runs; requests without a key always run."""
+    timer_id = (await async_client.post("/api/v1/timers", json={"duration": 60})).json()["id"]
+    headers = {"Idempotency-Key": "shared"}
+
+    started = await async_client.post(f"/api/v1/timers/{timer_id}/start", headers=headers)
+    stopped = await async_client.post(f"/api/v1/timers/{timer_id}/stop", headers=headers)
+    unkeyed = [await async_client.post("/api/v1/timers", json={"duration": 5}) for _ in range(2)]
+
+    assert started.json()["status"] == "running"
+    assert stopped.json()["status"] == "paused"
+    assert unkeyed[0].json()["id"] != unkeyed[1].json()["id"]
+    too_long = await async_client.post("/api/v1/timers", json={"duration": 5}, headers={"Idempotency-Key": "k" * 256})
+    assert too_long.status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_key_reused_with_another_body_is_rejected(async_client: AsyncClient):
+    headers = {"Idempotency-Key": "create-3"}
+    first = await async_client.post("/api/v1/timers", json={"duration": 60}, headers=headers)
+    other = await async_client.post("/api/v1/timers", json={"duration": 30}, headers=headers)
+
+    assert first.status_code == 201
+    assert other.status_code == 422
+    assert (await async_client.get("/api/v1/timers")).json()["count"] == 1
+
+
+@pytest.mark.asyncio
+async def test_store_is_bounded_and_expires():
+    store = IdempotencyStore(max_keys=2, ttl=0.0)
+    response = StoredResponse(200, [], b"{}")
+    for key in ("a", "b", "c"):
+        store.begin(("POST", "/p", key), b"fp")
+        store.finish(("POST", "/p", key), response)
+
+    assert len(store) == 2
+    assert store.get(("POST", "/p", "a")) is None
+    # ttl=0: stored responses are already expired.
+    assert store.get(("POST", "/p", "c")) is None
+
+
+@pytest.mark.asyncio
+async def test_in_flight_keys_are_never_evicted():
+    store = IdempotencyStore(max_keys=2, ttl=60.0)
+    in_flight = store.begin(("POST", "/p", "a"), b"fp")
+    store.begin(("POST", "/p", "b"), b"fp")
+    store.finish(("POST", "/p", "b"), StoredResponse(200, [], b"{}"))
+
+    # A new key displaces the stored response, not the request still running.
+    assert store.begin(("POST", "/p", "c"), b"fp") is not None
+    assert store.get(("POST", "/p", "a")) == (in_flight, b"fp")
+    assert store.get(("POST", "/p", "b")) is None
+    # Every slot is in flight: new keys are turned away until one finishes.
+    assert store.begin(("POST", "/p", "d"), b"fp") is None
+    assert not in_flight.done()
+    store.finish(("POST", "/p", "a"), StoredResponse(201, [], b"{}"))
+    assert in_flight.done()
+    assert store.begin(("POST", "/p", "d"), b"fp") is not None
+
+
+@pytest.mark.asyncio
+async def test_middleware_answers_503_when_every_key_is_in_flight():
+    release = asyncio.Event()
+
+    async def slow_app(scope, receive, send):
+        await receive()
+        await release.wait()
+        await send({"type": "http.response.start", "status": 201, "headers": []})
+        await send({"type": "http.response.body", "body": b"{}"})
+
+    app = IdempotencyMiddleware(slow_app, max_keys=1, ttl=60.0)
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+        first = asyncio.create_task(client.post("/p", json={}, headers={"Idempotency-Key": "a"}))
+        joined = asyncio.create_task(client.post("/p", json={}, headers={"Idempotency-Key": "a"}))
+        await asyncio.sleep(0.05)
+        rejected = await client.post("/p", json={}, headers={"Idempotency-Key": "b"})
+        release.set()
+
+        assert rejected.status_code == 503
+        assert rejected.headers["retry-after"] == "1"
+        assert (await first).status_code == 201
+        replay = await joined
+        assert replay.status_code == 201
+        assert replay.headers["idempotent-replayed"] == "true"
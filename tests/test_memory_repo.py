@@ -0,0 +1,158 @@
+"""Tests for the in-memory TimerRepo backend."""
+from datetime import datetime, timedelta, timezone
+from uuid import uuid4
+import pytest
+from app.repos import memory_repo
+from app.repos.base import BinaryTimerStore, TimerStore
+from app.repos.memory_repo import MemoryTimerRepo
+from app.repos.timer_repo import TimerRepo
+from app.models.timer import TimerStatus
+
+
+def _ago(seconds: float) -> datetime:
+    return datetime.now(timezone.utc) - timedelta(seconds=seconds)
+
+
+@pytest.mark.asyncio
+async def test_transitions_follow_the_wallclock_rules():
+    repo = MemoryTimerRepo()
+    timer = await repo.create(100)
+    assert (timer.status, timer.elapsed_time, timer.started_at) == ("idle", 0, None)
+
+    running = await repo.start(timer.id)
+    assert running.status == "running" and running.started_at is not None
+    # Backdate the anchor: 70s into a 100s timer.
+    await repo.update(timer.id, 0, TimerStatus.running, 0, started_at=_ago(70.5))
+
+    paused = await repo.stop(timer.id)
+    assert (paused.status, paused.elapsed_time, paused.urgency_level, paused.started_at) == ("paused", 70, 2, None)
+
+    await repo.start(timer.id)
+    await repo.update(timer.id, 70, TimerStatus.running, 2, started_at=_ago(45))
+    done = await repo.complete_if_due(timer.id)
+    assert (done.status, done.elapsed_time, done.urgency_level) == ("complete", 100, 3)
+
+    reset = await repo.reset(timer.id)
+    assert (reset.status, reset.elapsed_time, reset.urgency_level) == ("idle", 0, 0)
+    assert await repo.start(uuid4()) is None
+
+
+@pytest.mark.asyncio
+async def test_settle_due_raises_urgency_without_moving_updated_at():
+    repo = MemoryTimerRepo()
+    timer = await repo.create(100)
+    await repo.start(timer.id)
+    stored = await repo.update(timer.id, 0, TimerStatus.running, 0, started_at=_ago(50))
+
+    settled = (await repo.settle_due_many([timer.id]))[timer.id]
+
+    assert (settled.status, settled.elapsed_time, settled.urgency_level) == ("running", 0, 1)
+    assert settled.updated_at == stored.updated_at
+
+
+@pytest.mark.asyncio
+async def test_flush_ticks_skips_rows_changed_since_buffered():
+    repo = MemoryTimerRepo()
+    a, b = await repo.create(10), await repo.create(10)
+    a = await repo.start(a.id, wallclock=False)
+    b = await repo.start(b.id, wallclock=False)
+    await repo.stop(b.id)
+
+    written = await repo.flush_ticks([a._replace(elapsed_time=4), b._replace(elapsed_time=4)])
+
+    assert list(written) == [a.id]
+    assert (await repo.get_by_id(a.id)).elapsed_time == 4
+    assert (await repo.get_by_id(b.id)).elapsed_time == 0
+
+
+@pytest.mark.asyncio
+async def test_keyset_pages_filters_and_counts():
+    repo = MemoryTimerRepo()
+    timers = [await repo.create(60) for _ in range(7)]
+    await repo.start_many([t.id for t in timers[:3]])
+
+    newest_first = [t.id for t in await repo.list_all()]
+    assert newest_first == [t.id for t in reversed(timers)]
+
+    first = await repo.list_page(limit=4)
+    rest = await repo.list_page(limit=4, after=(first[-1].created_at, first[-1].id))
+    assert [t.id for t in first + rest] == newest_first
+
+    running = await repo.list_page(status=TimerStatus.running)
+    assert {t.id for t in running} == {t.id for t in timers[:3]}
+    assert await repo.estimate_count(status=TimerStatus.running) == 3
+    assert await repo.estimate_count() == 7
+    assert len([row async for row in repo.iter_running()]) == 3
+
+
+@pytest.mark.asyncio
+async def test_retention_archives_oldest_completed_in_batches():
+    repo = MemoryTimerRepo()
+    timers = [await repo.create(1) for _ in range(3)]
+    for timer in timers:
+        await repo.update(timer.id, 1, TimerStatus.complete, 3)
+    cutoff = datetime.now(timezone.utc) + timedelta(seconds=1)
+
+    assert await repo.archive_complete(cutoff, 2) == 2
+    assert await repo.delete_complete(cutoff, 2) == 1
+    assert await repo.estimate_count() == 0
+    assert set(repo.archived()) == {t.id for t in timers[:2]}
+
+
+@pytest.mark.asyncio
+async def test_snapshot_round_trip(tmp_path):
+    path = tmp_path / "timers.json"
+    repo = MemoryTimerRepo(str(path))
+    timer = await repo.create(30)
+    running = await repo.start(timer.id)
+    assert await repo.save_snapshot() is True
+    assert await repo.save_snapshot() is False  # nothing changed since
+
+    restored = MemoryTimerRepo(str(path))
+
+    assert await restored.get_by_id(timer.id) == running
+    assert await restored.estimate_count(status=TimerStatus.running) == 1
+    assert not path.with_name(path.name + ".tmp").exists()
+
+
+@pytest.mark.asyncio
+async def test_failed_snapshot_is_retried(tmp_path, monkeypatch):
+    path = tmp_path / "timers.json"
+    repo = MemoryTimerRepo(str(path))
+    await repo.create(30)
+
+    def fail(*args):
+        raise OSError("disk full")
+
+    monkeypatch.setattr(memory_repo, "_write_snapshot", fail)
+    with pytest.raises(OSError):
+        await repo.save_snapshot()
+    monkeypatch.undo()
+
+    assert await repo.save_snapshot() is True
+    assert await MemoryTimerRepo(str(path)).estimate_count() == 1
+
+
+def test_both_backends_implement_the_store_protocol():
+    assert isinstance(MemoryTimerRepo(), TimerStore)
+    assert isinstance(TimerRepo(None), BinaryTimerStore)
+    assert not isinstance(MemoryTimerRepo(), BinaryTimerStore)
+
+
+@pytest.mark.asyncio
+async def test_matches_postgres_repo(db_pool):
+    """The same sequence of calls leaves both backends in the same state."""
+    memory, postgres = MemoryTimerRepo(), TimerRepo(db_pool)
+
+    async def run(repo) -> list[tuple]:
+        a, b, c = [await repo.create(duration) for duration in (100, 100, 10)]
+        await repo.start_many([a.id, b.id, c.id])
+        await repo.update(a.id, 20, TimerStatus.running, 0, started_at=_ago(50.5))
+        await repo.update(c.id, 0, TimerStatus.running, 0, started_at=_ago(15))
+        await repo.stop(b.id)
+        await repo.settle_due_many([a.id, b.id, c.id])
+        stopped = await repo.stop_many([a.id, b.id])
+        rows = [stopped[a.id], stopped[b.id], await repo.get_by_id(c.id)]
+        return [(r.duration, r.elapsed_time, r.status, r.urgency_level, r.started_at is None) for r in rows]
+
+    assert await run(memory) == await run(postgres)
@@ -0,0 +1,122 @@
+"""Tests for the metrics registry, request middleware, /metrics and the sampling profiler."""
+import asyncio
+import time
+import pytest
+from httpx import AsyncClient
+from app.metrics import Counter, Histogram, Registry, _Metric
+from app.profiler import profile_event_loop
+from app.config import get_settings
+
+
+class TestRegistry:
+    """Tests for the Prometheus text rendering."""
+
+    def test_histogram_buckets_are_cumulative(self):
+        registry = Registry()
+        histogram = registry.register(Histogram("latency_seconds", "Latency.", ("route",), buckets=(0.1, 1.0)))
+        histogram.observe(0.05, "/a")
+        histogram.observe(0.5, "/a")
+        histogram.observe(5, "/a")
+
+        lines = registry.render().splitlines()
+
+        assert 'latency_seconds_bucket{route="/a",le="0.1"} 1' in lines
+        assert 'latency_seconds_bucket{route="/a",le="1.0"} 2' in lines
+        assert 'latency_seconds_bucket{route="/a",le="+Inf"} 3' in lines
+        assert 'latency_seconds_count{route="/a"} 3' in lines
+        assert "# TYPE latency_seconds histogram" in lines
+
+    def test_label_values_are_escaped(self):
+        registry = Registry()
+        counter = registry.register(Counter("events_total", "Events.", ("name",)))
+        counter.inc('a"b\\c')
+        assert 'events_total{name="a\\"b\\\\c"} 1' in registry.render()
+
+    def test_metric_without_samples_cannot_be_instantiated(self):
+        class Incomplete(_Metric):
+            kind = "gauge"
+
+        with pytest.raises(TypeError):
+            Incomplete("x", "x")
+
+    def test_register_returns_existing_metric(self):
+        registry = Registry()
+        first = registry.counter("events_total", "Events.")
+        assert registry.counter("events_total", "Events.") is first
+
+
+def sample(text: str, prefix: str) -> float:
+    for line in text.splitlines():
+        if line.startswith(prefix + " "):
+            return float(line.rsplit(" ", 1)[1])
+    return 0.0
+
+
+@pytest.mark.asyncio
+async def test_metrics_endpoint_reports_requests_db_time_and_transitions(async_client: AsyncClient):
+    before = (await async_client.get("/metrics")).text
+    created = (await async_client.post("/api/v1/timers", json={"duration": 60})).json()
+    await async_client.post(f"/api/v1/timers/{created['id']}/start")
+    await async_client.get(f"/api/v1/timers/{created['id']}")
+
+    response = await async_client.get("/metrics")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/plain; version=0.0.4")
+    text = response.text
+    # Routes are labelled by template, not by timer id.
+    route = 'method="GET",route="/api/v1/timers/{timer_id}"'
+    assert sample(text, f'http_requests_total{{{route},status="200"}}') == (
+        sample(before, f'http_requests_total{{{route},status="200"}}') + 1
+    )
+    assert created["id"] not in text
+    assert sample(text, f"http_request_db_seconds_count{{{route}}}") >= 1
+    assert sample(text, 'timer_transitions_total{op="start",status="running"}') == (
+        sample(before, 'timer_transitions_total{op="start",status="running"}') + 1
+    )
+    assert sample(text, 'db_call_duration_seconds_count{op="create"}') >= 1
+    assert "http_requests_in_flight 1" in text  # the /metrics request itself
+
+
+@pytest.mark.asyncio
+async def test_unmatched_routes_share_one_label(async_client: AsyncClient):
+    await async_client.get("/no/such/path")
+    text = (await async_client.get("/metrics")).text
+    assert 'route="unmatched",status="404"' in text
+    assert "/no/such/path" not in text
+
+
+@pytest.mark.asyncio
+async def test_profiler_returns_collapsed_stacks():
+    async def busy() -> None:
+        deadline = time.perf_counter() + 0.3
+        while time.perf_counter() < deadline:
+            sum(range(1000))
+            await asyncio.sleep(0)
+
+    task = asyncio.create_task(busy())
+    stacks = await profile_event_loop(0.2, 0.002)
+    await task
+
+    lines = stacks.splitlines()
+    assert lines
+    stack, count = lines[0].rsplit(" ", 1)
+    assert int(count) >= 1
+    assert any("test_metrics:" in line and "busy" in line for line in lines)
+
+
+@pytest.mark.asyncio
+async def test_profile_endpoint_is_disabled_by_default(async_client: AsyncClient):
+    response = await async_client.post("/debug/profile?seconds=0.1")
+    assert response.status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_profile_endpoint(async_client: AsyncClient, monkeypatch):
+    monkeypatch.setattr(get_settings(), "profiler_enabled", True)
+    assert (await async_client.post("/debug/profile?seconds=600")).status_code == 400
+
+    response = await async_client.post("/debug/profile?seconds=0.1&interval_ms=2")
+
+    assert response.status_code == 200
+    assert all(line.rsplit(" ", 1)[1].isdigit() for line in response.text.splitlines())
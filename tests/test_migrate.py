@@ -0,0 +1,86 @@
+"""Tests for the migration runner, run against a scratch schema."""
+import asyncio
+import asyncpg
+import pytest
+import pytest_asyncio
+from app.config import DATABASE_URL, TIMER_BACKEND
+from app.migrate import load_migrations, migrate
+
+SCHEMA = "migrate_test"
+
+
+@pytest_asyncio.fixture
+async def scratch():
+    """Connections whose search_path is an empty scratch schema."""
+    if TIMER_BACKEND != "postgres":
+        pytest.skip("needs TIMER_BACKEND=postgres")
+    admin = await asyncpg.connect(DATABASE_URL)
+    await admin.execute(f"DROP SCHEMA IF EXISTS {SCHEMA} CASCADE; CREATE SCHEMA {SCHEMA}")
+    conns = []
+
+    async def connect() -> asyncpg.Connection:
+        conn = await asyncpg.connect(DATABASE_URL, server_settings={"search_path": SCHEMA})
+        conns.append(conn)
+        return conn
+
+    yield connect
+    for conn in conns:
+        await conn.close()
+    await admin.execute(f"DROP SCHEMA {SCHEMA} CASCADE")
+    await admin.close()
+
+
+def test_migrations_are_numbered_in_order():
+    versions = [m.version for m in load_migrations()]
+    assert versions == sorted(versions)
+    assert versions[0] == 1
+
+
+@pytest.mark.asyncio
+async def test_applies_everything_then_costs_one_query(scratch):
+    conn = await scratch()
+    all_versions = [m.version for m in load_migrations()]
+
+    assert await migrate(conn) == all_versions
+
+    queries = []
+    conn.add_query_logger(lambda logged: queries.append(logged.query))
+    assert await migrate(conn) == []
+    await asyncio.sleep(0)  # query loggers are called soon after the query
+    assert len(queries) == 1
+
+
+@pytest.mark.asyncio
+async def test_concurrent_workers_apply_each_migration_once(scratch):
+    conns = [await scratch() for _ in range(4)]
+
+    results = await asyncio.gather(*(migrate(conn) for conn in conns))
+
+    applied = sorted(v for result in results for v in result)
+    assert applied == [m.version for m in load_migrations()]
+    assert await conns[0].fetchval("SELECT count(*) FROM schema_migrations") == len(applied)
+
+
+@pytest.mark.asyncio
+async def test_adopts_schema_created_by_hand(scratch):
+    """A database migrated manually (no schema_migrations) is brought under the runner."""
+    conn = await scratch()
+    for migration in load_migrations():
+        await conn.execute(migration.path.read_text())
+
+    assert await migrate(conn) == [m.version for m in load_migrations()]
+    assert await migrate(conn) == []
+
+
+@pytest.mark.asyncio
+async def test_schema_constraints_and_running_index(scratch):
+    conn = await scratch()
+    await migrate(conn)
+
+    with pytest.raises(asyncpg.CheckViolationError):
+        await conn.execute("INSERT INTO timers (duration, status) VALUES (10, 'bogus')")
+    indexes = {
+        row["indexname"]: row["indexdef"]
+        for row in await conn.fetch("SELECT indexname, indexdef FROM pg_indexes WHERE schemaname = $1", SCHEMA)
+    }
+    assert "WHERE (status = 'running'::text)" in indexes["idx_timers_running"]
@@ -0,0 +1,44 @@
+"""Tests for the periodic job runner shared by the background jobs."""
+import asyncio
+import pytest
+from app.services.periodic_job import PeriodicJob, close_periodic_jobs, get_periodic_job, start_periodic_job
+from app.services.readiness import subsystem_states
+
+
+@pytest.mark.asyncio
+async def test_failed_pass_is_retried_next_interval():
+    passes = 0
+
+    async def run_once():
+        nonlocal passes
+        passes += 1
+        if passes == 1:
+            raise RuntimeError("boom")
+
+    job = PeriodicJob("test", run_once, interval=0.01)
+    job.start()
+    for _ in range(100):
+        if passes >= 3:
+            break
+        await asyncio.sleep(0.01)
+    assert job.running
+    await job.close()
+    assert passes >= 3
+    assert not job.running
+
+
+@pytest.mark.asyncio
+async def test_registry_starts_each_job_once_and_reports_it():
+    async def run_once():
+        pass
+
+    assert start_periodic_job("disabled", run_once, 0) is None
+    job = start_periodic_job("test", run_once, 3600)
+    try:
+        assert start_periodic_job("test", run_once, 60) is job
+        assert get_periodic_job("test") is job
+        assert subsystem_states()["test_job"] == "running"
+        assert "disabled_job" not in subsystem_states()
+    finally:
+        await close_periodic_jobs()
+    assert get_periodic_job("test") is None
@@ -0,0 +1,121 @@
+"""Tests for liveness/readiness probes: budgets, caching and subsystem state."""
+import asyncio
+import os
+import subprocess
+import sys
+import time
+from pathlib import Path
+from types import SimpleNamespace
+import pytest
+from httpx import AsyncClient
+from app.database import get_pool_stats
+import app.services.readiness as readiness
+from app.services.readiness import LoopLagMonitor, ReadinessProbe
+from app.startup import StartupTimeline
+
+
+def make_probe(acquire=1.0, db=1.0, loop_lag=1.0, ttl=0.0, lag_monitor=None) -> ReadinessProbe:
+    return ReadinessProbe(acquire, db, loop_lag, ttl, lag_monitor)
+
+
+@pytest.mark.asyncio
+async def test_live_and_ready_endpoints(db_pool, async_client: AsyncClient):
+    live = await async_client.get("/health/live")
+    assert live.status_code == 200
+    assert live.json() == {"status": "ok"}
+
+    ready = await async_client.get("/health/ready")
+
+    assert ready.status_code == 200
+    body = ready.json()
+    assert body["status"] == "ready"
+    assert set(body["checks"]) == {"event_loop_lag", "pool_acquire", "database", "subsystems"}
+    assert body["checks"]["database"]["ms"] <= body["checks"]["database"]["budget_ms"]
+    assert set(body["startup"]) == {"ready_ms", "first_request_ms", "phases_ms"}
+
+
+def test_startup_timeline_records_phases_and_first_request():
+    timeline = StartupTimeline(time.perf_counter() - 1.0)
+    timeline.begin()
+    with timeline.phase("pool"):
+        pass
+    timeline.mark_ready()
+    timeline.request_served()
+    first = timeline.first_request
+    timeline.request_served()
+
+    summary = timeline.to_dict()
+    assert list(summary["phases_ms"]) == ["boot", "pool"]
+    assert summary["phases_ms"]["boot"] >= 1000
+    assert summary["ready_ms"] <= summary["first_request_ms"]
+    assert timeline.first_request == first
+
+
+def test_importing_the_app_reads_no_settings(tmp_path):
+    # No DATABASE_URL and no .env in the working directory: settings are only
+    # read once the lifespan or a request needs them.
+    env = {key: value for key, value in os.environ.items() if key != "DATABASE_URL"}
+    env["PYTHONPATH"] = str(Path(__file__).resolve().parent.parent)
+    script = "import app.main, app.config; print(app.config.get_settings.cache_info().currsize)"
+
+    result = subprocess.run([sys.executable, "-c", script], cwd=tmp_path, env=env, capture_output=True, text=True)
+
+    assert result.returncode == 0, result.stderr
+    assert result.stdout.strip() == "0"
+
+
+@pytest.mark.asyncio
+async def test_exceeded_budget_is_unready(db_pool):
+    result = await make_probe(db=1e-9).check()
+
+    assert not result.ready
+    assert not result.checks["database"].ok
+    assert result.checks["pool_acquire"].ok
+
+
+@pytest.mark.asyncio
+async def test_exhausted_pool_is_unready(db_pool):
+    held = [await db_pool.acquire() for _ in range(db_pool.get_max_size())]
+    try:
+        result = await make_probe(acquire=0.02).check()
+    finally:
+        for conn in held:
+            await db_pool.release(conn)
+
+    assert not result.ready
+    assert result.checks["pool_acquire"].error == "timeout"
+    assert result.checks["database"].error == "no connection"
+
+
+@pytest.mark.asyncio
+async def test_results_are_cached_and_shared(db_pool):
+    probe = make_probe(ttl=60)
+    first = await probe.check()
+    acquires = get_pool_stats().acquires
+
+    results = await asyncio.gather(*(probe.check() for _ in range(10)))
+
+    assert all(result is first for result in results)
+    assert get_pool_stats().acquires == acquires
+
+
+@pytest.mark.asyncio
+async def test_loop_lag_over_budget_is_unready(db_pool):
+    monitor = LoopLagMonitor()
+    monitor._samples.extend([0.001, 0.5])
+
+    result = await make_probe(loop_lag=0.2, lag_monitor=monitor).check()
+
+    assert not result.ready
+    assert result.checks["event_loop_lag"].ms == 500.0
+
+
+@pytest.mark.asyncio
+async def test_stopped_subsystem_is_unready(db_pool, monkeypatch):
+    monkeypatch.setattr(readiness, "get_completion_scheduler", lambda: SimpleNamespace(running=False))
+
+    result = await make_probe().check()
+
+    assert not result.ready
+    assert result.subsystems["completion_scheduler"] == "stopped"
+    assert not result.checks["subsystems"].ok
@@ -0,0 +1,72 @@
+"""Tests for the retention job: batched archival and deletion of old completed timers."""
+from datetime import datetime, timedelta, timezone
+import pytest
+import pytest_asyncio
+from app.repos.timer_repo import TimerRepo
+from app.services.retention_job import RetentionJob
+
+
+@pytest_asyncio.fixture
+async def aged(db_pool):
+    """Five completed timers finished 40 days ago, one finished today and one running."""
+    repo = TimerRepo(db_pool)
+    old = [await repo.create(10) for _ in range(5)]
+    recent = await repo.create(10)
+    running = await repo.create(10)
+    await repo.start(running.id)
+    async with db_pool.acquire() as conn:
+        await conn.execute(
+            "UPDATE timers SET status = 'complete', elapsed_time = 10, updated_at = $2 WHERE id = ANY($1::uuid[])",
+            [t.id for t in old],
+            datetime.now(timezone.utc) - timedelta(days=40),
+        )
+        await conn.execute("UPDATE timers SET status = 'complete', elapsed_time = 10 WHERE id = $1", recent.id)
+    yield repo, old, recent, running
+    async with db_pool.acquire() as conn:
+        await conn.execute("DELETE FROM timers_archive")
+
+
+def make_job(repo: TimerRepo, mode: str, batch_size: int = 2) -> RetentionJob:
+    async def factory():
+        return repo
+
+    return RetentionJob(factory, mode, timedelta(days=30), batch_size)
+
+
+@pytest.mark.asyncio
+async def test_archive_moves_old_completed_timers_in_batches(db_pool, aged):
+    repo, old, recent, running = aged
+
+    assert await make_job(repo, "archive").run_once() == 5
+
+    assert await repo.get_many([t.id for t in old]) == {}
+    assert set(await repo.get_many([recent.id, running.id])) == {recent.id, running.id}
+    async with db_pool.acquire() as conn:
+        archived = await conn.fetch("SELECT id, status, elapsed_time FROM timers_archive")
+    assert {r["id"] for r in archived} == {t.id for t in old}
+    assert all(r["status"] == "complete" and r["elapsed_time"] == 10 for r in archived)
+    # Nothing left to do on the next pass.
+    assert await make_job(repo, "archive").run_once() == 0
+
+
+@pytest.mark.asyncio
+async def test_delete_mode_drops_without_archiving(db_pool, aged):
+    repo, old, recent, _ = aged
+
+    assert await make_job(repo, "delete", batch_size=100).run_once() == 5
+
+    assert await repo.get_many([t.id for t in old]) == {}
+    assert await repo.get_by_id(recent.id) is not None
+    async with db_pool.acquire() as conn:
+        assert await conn.fetchval("SELECT count(*) FROM timers_archive") == 0
+
+
+@pytest.mark.asyncio
+async def test_locked_rows_are_skipped(db_pool, aged):
+    repo, old, _, _ = aged
+    async with db_pool.acquire() as conn:
+        async with conn.transaction():
+            await conn.execute("SELECT 1 FROM timers WHERE id = $1 FOR UPDATE", old[0].id)
+            # A concurrent writer holds one row: the batch moves the rest without waiting.
+            assert await repo.archive_complete(datetime.now(timezone.utc) - timedelta(days=30), 100) == 4
+    assert await repo.archive_complete(datetime.now(timezone.utc) - timedelta(days=30), 100) == 1
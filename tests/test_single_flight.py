@@ -0,0 +1,88 @@
+"""Tests for SingleFlight request coalescing."""
+import asyncio
+import pytest
+from app.services.single_flight import SINGLE_FLIGHT_CALLS, SingleFlight
+
+
+@pytest.mark.asyncio
+async def test_concurrent_calls_share_one_execution():
+    flight = SingleFlight("test_share")
+    calls = 0
+
+    async def load():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.05)
+        return calls
+
+    results = await asyncio.gather(*(flight.do("k", load) for _ in range(5)))
+
+    assert results == [1] * 5
+    assert calls == 1
+    assert SINGLE_FLIGHT_CALLS.value("test_share", "leader") == 1
+    assert SINGLE_FLIGHT_CALLS.value("test_share", "shared") == 4
+    assert flight.in_flight() == 0
+    # Finished calls are not cached: the next call executes again.
+    assert await flight.do("k", load) == 2
+
+
+@pytest.mark.asyncio
+async def test_distinct_keys_run_separately_and_errors_are_shared():
+    flight = SingleFlight("test_errors")
+
+    async def fail():
+        await asyncio.sleep(0.01)
+        raise ValueError("boom")
+
+    async def value():
+        return "ok"
+
+    results = await asyncio.gather(flight.do("a", fail), flight.do("a", fail), flight.do("b", value),
+                                   return_exceptions=True)
+
+    assert [type(r) for r in results[:2]] == [ValueError, ValueError]
+    assert results[2] == "ok"
+
+
+@pytest.mark.asyncio
+async def test_cancelled_caller_does_not_cancel_shared_call():
+    flight = SingleFlight("test_cancel")
+    release = asyncio.Event()
+
+    async def load():
+        await release.wait()
+        return "row"
+
+    leader = asyncio.create_task(flight.do("k", load))
+    await asyncio.sleep(0)
+    follower = asyncio.create_task(flight.do("k", load))
+    await asyncio.sleep(0)
+    leader.cancel()
+    release.set()
+
+    assert await follower == "row"
+    with pytest.raises(asyncio.CancelledError):
+        await leader
+
+
+@pytest.mark.asyncio
+async def test_forget_detaches_the_call_in_flight():
+    flight = SingleFlight("test_forget")
+    release = asyncio.Event()
+    versions = iter(["old", "new"])
+
+    async def load():
+        value = next(versions)
+        await release.wait()
+        return value
+
+    before = asyncio.create_task(flight.do("k", load))
+    await asyncio.sleep(0)
+    flight.forget("k")
+    after = asyncio.create_task(flight.do("k", load))
+    await asyncio.sleep(0)
+    release.set()
+
+    assert await before == "old"
+    assert await after == "new"
+    assert flight.in_flight() == 0
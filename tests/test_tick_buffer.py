@@ -0,0 +1,111 @@
+"""Unit tests for the write-behind tick buffer using a mock repository."""
+import pytest
+from unittest.mock import AsyncMock
+from app.models.timer import TimerStatus
+from app.services.tick_buffer import TickBuffer
+from app.services.timer_service import TimerService
+from tests.test_timer_service import make_timer
+
+
+def make_buffer(timer) -> tuple[TickBuffer, AsyncMock, TimerService]:
+    """Create a buffer whose repo loads `timer` and accepts every flush."""
+    repo = AsyncMock()
+    repo.get_by_id.return_value = timer
+    repo.flush_ticks.side_effect = lambda rows: {row.id: row for row in rows}
+
+    async def factory():
+        return repo
+
+    buffer = TickBuffer(factory, interval=60)
+    return buffer, repo, TimerService(repo, wallclock=False, tick_buffer=buffer)
+
+
+class TestTickBuffer:
+    """Tests for buffering, immediate flushes and the updated_at guard."""
+
+    @pytest.mark.asyncio
+    async def test_plain_ticks_are_buffered_without_writes(self):
+        timer = make_timer(duration=100, elapsed_time=10, status=TimerStatus.running)
+        buffer, repo, service = make_buffer(timer)
+
+        await service.tick_timer(timer.id)
+        result = await service.tick_timer(timer.id)
+
+        assert result.elapsed_time == 12
+        assert buffer.dirty_count == 1
+        repo.get_by_id.assert_called_once()
+        repo.flush_ticks.assert_not_called()
+        assert (await service.get_timer(timer.id)).elapsed_time == 12
+        await buffer.close()
+
+    @pytest.mark.asyncio
+    async def test_urgency_change_flushes_immediately(self):
+        timer = make_timer(duration=100, elapsed_time=32, status=TimerStatus.running)
+        buffer, repo, service = make_buffer(timer)
+
+        result = await service.tick_timer(timer.id)
+
+        assert result.urgency_level == 1
+        repo.flush_ticks.assert_called_once()
+        assert buffer.dirty_count == 0
+        await buffer.close()
+
+    @pytest.mark.asyncio
+    async def test_completion_flushes_and_stops_buffering(self):
+        timer = make_timer(duration=5, elapsed_time=4, status=TimerStatus.running, urgency_level=3)
+        buffer, repo, service = make_buffer(timer)
+
+        result = await service.tick_timer(timer.id)
+
+        assert result.status == TimerStatus.complete
+        repo.flush_ticks.assert_called_once()
+        assert buffer.peek(timer.id) is None
+        await buffer.close()
+
+    @pytest.mark.asyncio
+    async def test_guard_failure_drops_buffered_row(self):
+        timer = make_timer(duration=100, elapsed_time=10, status=TimerStatus.running)
+        buffer, repo, service = make_buffer(timer)
+        await service.tick_timer(timer.id)
+        repo.flush_ticks.side_effect = lambda rows: {}
+
+        assert await buffer.flush() == {}
+
+        assert buffer.peek(timer.id) is None
+        assert buffer.dirty_count == 0
+        await buffer.close()
+
+    @pytest.mark.asyncio
+    async def test_transition_settles_buffered_ticks_first(self):
+        timer = make_timer(duration=100, elapsed_time=10, status=TimerStatus.running)
+        buffer, repo, service = make_buffer(timer)
+        repo.stop.return_value = timer._replace(status=TimerStatus.paused.value)
+        await service.tick_timer(timer.id)
+
+        await service.stop_timer(timer.id)
+
+        flushed = repo.flush_ticks.call_args.args[0]
+        assert [row.elapsed_time for row in flushed] == [11]
+        assert buffer.peek(timer.id) is None
+        await buffer.close()
+
+    @pytest.mark.asyncio
+    async def test_idle_timer_is_not_buffered(self):
+        timer = make_timer(status=TimerStatus.idle)
+        buffer, repo, service = make_buffer(timer)
+
+        result = await service.tick_timer(timer.id)
+
+        assert result == timer
+        assert buffer.peek(timer.id) is None
+
+    @pytest.mark.asyncio
+    async def test_close_flushes_dirty_rows(self):
+        timer = make_timer(duration=100, elapsed_time=10, status=TimerStatus.running)
+        buffer, repo, service = make_buffer(timer)
+        await service.tick_timer(timer.id)
+
+        await buffer.close()
+
+        repo.flush_ticks.assert_called_once()
+        assert buffer.dirty_count == 0
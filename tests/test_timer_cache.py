@@ -0,0 +1,158 @@
+"""Tests for the read-through TimerCache and its change-feed invalidation."""
+import asyncio
+import pytest
+from datetime import datetime, timedelta, timezone
+from uuid import uuid4
+from app.config import DATABASE_URL
+from app.models.timer import TimerRow
+from app.repos.timer_cache import TimerCache
+from app.repos import timer_repo
+from app.repos.timer_repo import TimerRepo
+from app.services.change_feed import ChangeFeed
+
+
+def make_row(elapsed_time: int = 0, version: int = 1) -> TimerRow:
+    now = datetime.now(timezone.utc)
+    return TimerRow(uuid4(), 60, elapsed_time, "idle", 0, now, now, None, version)
+
+
+class TestTimerCache:
+    """Unit tests for LRU, TTL and version handling."""
+
+    def test_hit_and_miss_counters(self):
+        cache = TimerCache(max_size=10, ttl=60)
+        row = make_row()
+        assert cache.get(row.id) is None
+        cache.put(row)
+        assert cache.get(row.id) == row
+        stats = cache.stats()
+        assert (stats.hits, stats.misses, stats.size) == (1, 1, 1)
+
+    def test_evicts_least_recently_used(self):
+        cache = TimerCache(max_size=2, ttl=60)
+        a, b, c = make_row(), make_row(), make_row()
+        cache.put(a)
+        cache.put(b)
+        cache.get(a.id)
+        cache.put(c)
+        assert cache.get(b.id) is None
+        assert cache.get(a.id) == a
+        assert cache.stats().evictions == 1
+
+    def test_expired_entry_is_a_miss(self):
+        cache = TimerCache(max_size=10, ttl=0)
+        row = make_row()
+        cache.put(row)
+        assert cache.get(row.id) is None
+
+    def test_older_row_never_replaces_newer(self):
+        cache = TimerCache(max_size=10, ttl=60)
+        newer = make_row(elapsed_time=5, version=2)
+        older = newer._replace(elapsed_time=1, version=1)
+        cache.put(newer)
+        cache.put(older)
+        assert cache.get(newer.id).elapsed_time == 5
+
+    def test_notification_for_own_write_keeps_entry(self):
+        cache = TimerCache(max_size=10, ttl=60)
+        row = make_row()
+        cache.put(row)
+        cache.on_changes({row.id: row.version})
+        assert cache.get(row.id) == row
+
+    def test_newer_notification_leaves_tombstone(self):
+        cache = TimerCache(max_size=10, ttl=60)
+        row = make_row()
+        cache.put(row)
+        cache.on_changes({row.id: row.version + 1})
+        assert cache.get(row.id) is None
+        cache.put(row)  # a slow read of the old version must not come back
+        assert cache.get(row.id) is None
+        assert cache.stats().invalidations == 1
+
+    def test_later_commit_wins_whatever_its_timestamp(self):
+        """A write stamped earlier by a lagging clock or pool wait, but committed later, replaces the cached row."""
+        cache = TimerCache(max_size=10, ttl=60)
+        reset = make_row(version=2)
+        stopped = reset._replace(status="paused", updated_at=reset.updated_at - timedelta(seconds=1), version=3)
+        cache.put(reset)
+        cache.on_changes({stopped.id: stopped.version})
+        assert cache.get(reset.id) is None
+        cache.put(stopped)
+        assert cache.get(reset.id) == stopped
+
+    def test_delete_notification_drops_entry(self):
+        cache = TimerCache(max_size=10, ttl=60)
+        row = make_row()
+        cache.put(row)
+        cache.on_changes({row.id: None})
+        assert cache.get(row.id) is None
+
+    def test_reset_clears_everything(self):
+        cache = TimerCache(max_size=10, ttl=60)
+        cache.put(make_row())
+        cache.on_reset()
+        assert cache.stats().size == 0
+
+
+@pytest.mark.asyncio
+async def test_other_connection_write_invalidates_cache(db_pool):
+    """A write made outside this repo reaches the cache through the change feed."""
+    cache = TimerCache(max_size=100, ttl=60)
+    feed = ChangeFeed(DATABASE_URL, coalesce_window=0)
+    feed.subscribe(cache)
+    feed.start()
+    try:
+        repo = TimerRepo(db_pool, cache=cache)
+        timer = await repo.create(60)
+        await asyncio.sleep(0.2)  # let the feed connect
+        assert (await repo.get_by_id(timer.id)).elapsed_time == 0
+
+        async with db_pool.acquire() as conn:
+            await conn.execute(
+                "UPDATE timers SET elapsed_time = 7, updated_at = now() WHERE id = $1", timer.id
+            )
+        for _ in range(50):
+            if cache.get(timer.id) is None:
+                break
+            await asyncio.sleep(0.02)
+        assert (await repo.get_by_id(timer.id)).elapsed_time == 7
+    finally:
+        await feed.close()
+
+
+class _ClockBehind(datetime):
+    """datetime whose now() lags by 10s, like a worker on a host with a slow clock."""
+
+    @classmethod
+    def now(cls, tz=None):
+        return datetime.now(tz) - timedelta(seconds=10)
+
+
+@pytest.mark.asyncio
+async def test_write_stamped_earlier_but_committed_later_invalidates(db_pool, monkeypatch):
+    """Worker A caches its reset; worker B's stop commits after it with an older updated_at."""
+    cache = TimerCache(max_size=100, ttl=60)
+    feed = ChangeFeed(DATABASE_URL, coalesce_window=0)
+    feed.subscribe(cache)
+    feed.start()
+    try:
+        worker_a, worker_b = TimerRepo(db_pool, cache=cache), TimerRepo(db_pool)
+        timer = await worker_a.create(60)
+        await asyncio.sleep(0.2)  # let the feed connect
+        reset = await worker_a.reset(timer.id)
+        assert cache.get(timer.id) == reset
+
+        with monkeypatch.context() as patch:
+            patch.setattr(timer_repo, "datetime", _ClockBehind)
+            stopped = await worker_b.stop(timer.id)
+        assert stopped.updated_at < reset.updated_at
+        assert stopped.version == reset.version + 1
+
+        for _ in range(50):
+            if cache.get(timer.id) is None:
+                break
+            await asyncio.sleep(0.02)
+        assert (await worker_a.get_by_id(timer.id)).status == "paused"
+    finally:
+        await feed.close()
@@ -1,9 +1,11 @@
 """Unit tests for TimerService urgency computation and state transitions using a mock repo."""
+import asyncio
 import pytest
 from unittest.mock import AsyncMock, MagicMock
 from uuid import uuid4
-from datetime import datetime
-from app.models.timer import Timer, TimerStatus
+from datetime import datetime, timedelta, timezone
+from app.models.timer import TimerRow, TimerStatus
+from app.services.single_flight import SingleFlight
 from app.services.timer_service import TimerService
 
 
@@ -12,16 +14,18 @@ def make_timer(
     elapsed_time: int = 0,
     status: TimerStatus = TimerStatus.idle,
     urgency_level: int = 0,
-) -> Timer:
-    """Helper to create a Timer instance for testing."""
-    return Timer(
+    started_at: datetime | None = None,
+) -> TimerRow:
+    """Helper to create a TimerRow (what TimerRepo returns) for testing."""
+    return TimerRow(
         id=uuid4(),
         duration=duration,
         elapsed_time=elapsed_time,
-        status=status,
+        status=status.value,
         urgency_level=urgency_level,
-        created_at=datetime.utcnow(),
-        updated_at=datetime.utcnow(),
+        created_at=datetime.now(timezone.utc),
+        updated_at=datetime.now(timezone.utc),
+        started_at=started_at,
     )
 
 
@@ -79,24 +83,33 @@ class TestStartTimer:
     """Tests for TimerService.start_timer."""
 
     @pytest.mark.asyncio
-    async def test_start_timer_sets_running_status(self):
+    async def test_start_timer_uses_atomic_transition(self):
         service, mock_repo = make_service()
-        timer = make_timer(duration=100, elapsed_time=0, status=TimerStatus.idle)
-        mock_repo.get_by_id.return_value = timer
-        mock_repo.update.return_value = make_timer(
+        timer_id = uuid4()
+        mock_repo.start.return_value = make_timer(
             duration=100, elapsed_time=0, status=TimerStatus.running
         )
 
-        result = await service.start_timer(timer.id)
+        result = await service.start_timer(timer_id)
 
-        mock_repo.update.assert_called_once()
-        call_kwargs = mock_repo.update.call_args
-        assert call_kwargs[1]['status'] == TimerStatus.running
+        mock_repo.start.assert_called_once_with(timer_id, wallclock=True)
+        mock_repo.get_by_id.assert_not_called()
+        assert result.status == TimerStatus.running
+
+    @pytest.mark.asyncio
+    async def test_start_timer_tick_engine_records_no_anchor(self):
+        mock_repo = AsyncMock()
+        service = TimerService(mock_repo, wallclock=False)
+        timer_id = uuid4()
+
+        await service.start_timer(timer_id)
+
+        mock_repo.start.assert_called_once_with(timer_id, wallclock=False)
 
     @pytest.mark.asyncio
     async def test_start_timer_returns_none_if_not_found(self):
         service, mock_repo = make_service()
-        mock_repo.get_by_id.return_value = None
+        mock_repo.start.return_value = None
 
         result = await service.start_timer(uuid4())
 
@@ -107,35 +120,145 @@ class TestStopTimer:
     """Tests for TimerService.stop_timer."""
 
     @pytest.mark.asyncio
-    async def test_stop_timer_sets_paused_status(self):
+    async def test_stop_timer_uses_atomic_transition(self):
         service, mock_repo = make_service()
-        timer = make_timer(duration=100, elapsed_time=30, status=TimerStatus.running)
-        mock_repo.get_by_id.return_value = timer
-        mock_repo.update.return_value = make_timer(
+        timer_id = uuid4()
+        mock_repo.stop.return_value = make_timer(
             duration=100, elapsed_time=30, status=TimerStatus.paused
         )
 
-        result = await service.stop_timer(timer.id)
+        result = await service.stop_timer(timer_id)
 
-        call_kwargs = mock_repo.update.call_args
-        assert call_kwargs[1]['status'] == TimerStatus.paused
+        mock_repo.stop.assert_called_once_with(timer_id)
+        mock_repo.update.assert_not_called()
+        assert result.status == TimerStatus.paused
 
 
 class TestResetTimer:
     """Tests for TimerService.reset_timer."""
 
     @pytest.mark.asyncio
-    async def test_reset_timer_clears_elapsed_time(self):
+    async def test_reset_timer_uses_atomic_transition(self):
         service, mock_repo = make_service()
-        timer = make_timer(duration=100, elapsed_time=50, status=TimerStatus.paused)
-        mock_repo.get_by_id.return_value = timer
-        mock_repo.update.return_value = make_timer(
+        timer_id = uuid4()
+        mock_repo.reset.return_value = make_timer(
             duration=100, elapsed_time=0, status=TimerStatus.idle, urgency_level=0
         )
 
-        result = await service.reset_timer(timer.id)
+        result = await service.reset_timer(timer_id)
 
-        call_kwargs = mock_repo.update.call_args
-        assert call_kwargs[1]['elapsed_time'] == 0
-        assert call_kwargs[1]['status'] == TimerStatus.idle
-        assert call_kwargs[1]['urgency_level'] == 0
+        mock_repo.reset.assert_called_once_with(timer_id)
+        assert result.elapsed_time == 0
+        assert result.status == TimerStatus.idle
+
+
+class TestWallclockEngine:
+    """Tests for elapsed-time projection from the started_at anchor."""
+
+    def test_project_adds_running_span(self):
+        service, _ = make_service()
+        now = datetime.now(timezone.utc)
+        timer = make_timer(
+            duration=100, elapsed_time=10, status=TimerStatus.running,
+            started_at=now - timedelta(seconds=30),
+        )
+        projected = service.project(timer, now)
+        assert projected.elapsed_time == 40
+        assert projected.status == TimerStatus.running
+        assert projected.urgency_level == 1
+
+    def test_project_completes_past_duration(self):
+        service, _ = make_service()
+        now = datetime.now(timezone.utc)
+        timer = make_timer(
+            duration=60, elapsed_time=0, status=TimerStatus.running,
+            started_at=now - timedelta(seconds=90),
+        )
+        projected = service.project(timer, now)
+        assert projected.elapsed_time == 60
+        assert projected.status == TimerStatus.complete
+        assert projected.urgency_level == 3
+
+    def test_project_leaves_paused_timer_unchanged(self):
+        service, _ = make_service()
+        timer = make_timer(duration=100, elapsed_time=50, status=TimerStatus.paused)
+        assert service.project(timer) is timer
+
+    @pytest.mark.asyncio
+    async def test_tick_projects_without_writing(self):
+        service, mock_repo = make_service()
+        mock_repo.complete_if_due.return_value = make_timer(
+            duration=100, elapsed_time=0, status=TimerStatus.running,
+            started_at=datetime.now(timezone.utc) - timedelta(seconds=5),
+        )
+
+        result = await service.tick_timer(uuid4())
+
+        mock_repo.tick.assert_not_called()
+        mock_repo.update.assert_not_called()
+        assert result.elapsed_time >= 5
+
+    @pytest.mark.asyncio
+    async def test_tick_engine_uses_atomic_tick(self):
+        mock_repo = AsyncMock()
+        service = TimerService(mock_repo, wallclock=False)
+        timer_id = uuid4()
+
+        await service.tick_timer(timer_id)
+
+        mock_repo.tick.assert_called_once_with(timer_id)
+        mock_repo.complete_if_due.assert_not_called()
+
+
+class TestBatchTransitions:
+    """Tests for the batch counterparts of the single-timer transitions."""
+
+    @pytest.mark.asyncio
+    async def test_stop_timers_dedupes_and_keeps_input_order(self):
+        service, mock_repo = make_service()
+        a, b, missing = uuid4(), uuid4(), uuid4()
+        timer_a = make_timer(status=TimerStatus.paused)
+        timer_b = make_timer(status=TimerStatus.paused)
+        mock_repo.stop_many.return_value = {a: timer_a, b: timer_b}
+
+        result = await service.stop_timers([b, missing, a, b])
+
+        mock_repo.stop_many.assert_called_once_with([b, missing, a])
+        assert result == [timer_b, None, timer_a, timer_b]
+
+
+class TestCoalescedReads:
+    """Tests for reads shared through a SingleFlight."""
+
+    @pytest.mark.asyncio
+    async def test_read_after_write_does_not_join_a_read_started_before_it(self):
+        mock_repo = AsyncMock()
+        service = TimerService(mock_repo, read_flight=SingleFlight("test_read_after_write"))
+        idle = make_timer()
+        running = idle._replace(status=TimerStatus.running.value)
+        stored, reading, release = idle, asyncio.Event(), asyncio.Event()
+
+        async def get_by_id(timer_id):
+            row = stored
+            reading.set()
+            await release.wait()
+            return row
+
+        async def start(timer_id, wallclock):
+            nonlocal stored
+            stored = running
+            return running
+
+        mock_repo.get_by_id.side_effect = get_by_id
+        mock_repo.start.side_effect = start
+
+        before = asyncio.create_task(service.get_timer(idle.id))
+        await reading.wait()
+        await service.start_timer(idle.id)
+        after = asyncio.create_task(service.get_timer(idle.id))
+        await asyncio.sleep(0)
+        release.set()
+
+        assert (await before).status == TimerStatus.idle
+        assert (await after).status == TimerStatus.running
+        assert mock_repo.get_by_id.await_count == 2
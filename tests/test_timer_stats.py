@@ -0,0 +1,115 @@
+"""Tests for GET /api/v1/timers/stats and the counters and reconcile job behind it."""
+import asyncio
+import pytest
+import pytest_asyncio
+from app.repos.memory_repo import MemoryTimerRepo
+from app.repos.timer_repo import TimerRepo
+from app.services.stats_job import StatsReconcileJob
+
+
+def make_job(repo) -> StatsReconcileJob:
+    async def factory():
+        return repo
+
+    return StatsReconcileJob(factory)
+
+
+@pytest.mark.asyncio
+async def test_stats_count_every_status_and_level(async_client):
+    ids = [(await async_client.post("/api/v1/timers", json={"duration": 60})).json()["id"] for _ in range(3)]
+    await async_client.post(f"/api/v1/timers/{ids[0]}/start")
+
+    response = await async_client.get("/api/v1/timers/stats")
+
+    assert response.status_code == 200
+    stats = response.json()
+    assert stats["total"] == 3
+    assert stats["by_status"] == {"idle": 2, "running": 1, "paused": 0, "complete": 0}
+    assert stats["by_urgency"] == {"0": 3, "1": 0, "2": 0, "3": 0}
+    assert stats["by_status_and_urgency"]["running"] == {"0": 1, "1": 0, "2": 0, "3": 0}
+
+
+@pytest.mark.asyncio
+async def test_stats_follow_transitions_and_deletes(db_pool):
+    repo = TimerRepo(db_pool)
+    timers = await repo.create_many([10] * 4)
+    await repo.start_many([t.id for t in timers[:2]])
+    # A tick that leaves status and level unchanged nets out in the trigger.
+    await repo.tick(timers[2].id)
+    async with db_pool.acquire() as conn:
+        await conn.execute("UPDATE timers SET status = 'complete', elapsed_time = 10, urgency_level = 3 WHERE id = $1", timers[3].id)
+
+    assert await repo.stats() == {("idle", 0): 1, ("running", 0): 2, ("complete", 3): 1}
+
+    async with db_pool.acquire() as conn:
+        await conn.execute("DELETE FROM timers WHERE status = 'running'")
+    assert await repo.stats() == {("idle", 0): 1, ("complete", 3): 1}
+    assert await make_job(repo).run_once() == 0
+
+
+@pytest_asyncio.fixture
+async def drifted(db_pool):
+    """Three idle timers, with timer_stats off by 5 idle and 2 paused as if writes had bypassed the triggers."""
+    repo = TimerRepo(db_pool)
+    await repo.create_many([10] * 3)
+    async with db_pool.acquire() as conn:
+        await conn.executemany(
+            "INSERT INTO timer_stats VALUES ($1, $2, 7, $3) "
+            "ON CONFLICT (status, urgency_level, slot) DO UPDATE SET count = timer_stats.count + EXCLUDED.count",
+            [("idle", 0, 5), ("paused", 1, 2)],
+        )
+    yield repo
+    # Leave no drift behind for later tests, whatever the outcome.
+    await repo.reconcile_stats()
+
+
+@pytest.mark.asyncio
+async def test_reconcile_repairs_drift(drifted):
+    repo = drifted
+
+    job = make_job(repo)
+    assert await job.run_once() == 7
+    assert job.last_drift == 7
+    assert await repo.stats() == {("idle", 0): 3}
+    assert await job.run_once() == 0
+
+
+@pytest.mark.asyncio
+async def test_concurrent_reconciles_apply_drift_once(drifted):
+    repo = drifted
+
+    results = await asyncio.gather(*(repo.reconcile_stats() for _ in range(4)))
+
+    # Whoever holds the lock corrects 7; the rest either skip (None) or,
+    # starting after it committed, find nothing left.
+    assert 7 in results
+    assert sum(r or 0 for r in results) == 7
+    assert await repo.stats() == {("idle", 0): 3}
+
+
+@pytest.mark.asyncio
+async def test_reconcile_skips_within_min_interval_of_last_run(db_pool, drifted):
+    repo = drifted
+    assert await repo.reconcile_stats() == 7
+
+    async with db_pool.acquire() as conn:
+        await conn.execute("UPDATE timer_stats SET count = count + 1 WHERE status = 'idle' AND slot = 7")
+    # Another worker's (or a restarted worker's) pass within the interval does not scan.
+    assert await make_job(repo).run_once(min_interval=3600) is None
+    assert await make_job(repo).run_once() == 1
+
+
+@pytest.mark.asyncio
+async def test_memory_counts_follow_writes_and_reconcile():
+    repo = MemoryTimerRepo()
+    timers = await repo.create_many([10] * 3)
+    await repo.start(timers[0].id, wallclock=False)
+    for _ in range(4):
+        await repo.tick(timers[0].id)
+
+    assert await repo.stats() == {("idle", 0): 2, ("running", 1): 1}
+    assert await make_job(repo).run_once() == 0
+
+    repo._counts["idle", 0] += 2
+    assert await make_job(repo).run_once() == 2
+    assert await repo.stats() == {("idle", 0): 2, ("running", 1): 1}
@@ -0,0 +1,127 @@
+"""Unit tests for the push-stream hub using a mock service."""
+import asyncio
+import json
+import pytest
+from unittest.mock import AsyncMock
+from uuid import uuid4
+from app.config import get_settings
+from app.models.timer import TimerStatus
+from app.routers import timers
+from app.services.timer_stream import Subscription, TimerStreamHub
+from tests.test_timer_service import make_timer
+
+
+def make_hub(timers: dict) -> tuple[TimerStreamHub, AsyncMock]:
+    """Create a hub whose service returns `timers` for every poll."""
+    service = AsyncMock()
+    service.get_timers.return_value = timers
+
+    async def factory():
+        return service
+
+    return TimerStreamHub(factory, poll_interval=60), service
+
+
+class TestSubscription:
+    """Tests for frame throttling in Subscription.offer."""
+
+    @pytest.mark.asyncio
+    async def test_sends_only_on_status_or_urgency_change(self):
+        timer = make_timer(duration=100, elapsed_time=10, status=TimerStatus.running)
+        subscription = Subscription({timer.id}, cadence=None)
+
+        subscription.offer(timer.id, timer, now=0.0)
+        subscription.offer(timer.id, timer._replace(elapsed_time=11), now=1.0)
+        subscription.offer(timer.id, timer._replace(urgency_level=1), now=2.0)
+
+        first = json.loads(await subscription.next_frame(timeout=0))
+        second = json.loads(await subscription.next_frame(timeout=0))
+        assert first["timer"]["elapsed_time"] == 10
+        assert second["timer"]["urgency_level"] == 1
+        assert await subscription.next_frame(timeout=0) is None
+
+    @pytest.mark.asyncio
+    async def test_cadence_resends_unchanged_timer(self):
+        timer = make_timer(status=TimerStatus.running)
+        subscription = Subscription({timer.id}, cadence=1.0)
+
+        subscription.offer(timer.id, timer, now=0.0)
+        subscription.offer(timer.id, timer, now=0.5)
+        subscription.offer(timer.id, timer, now=1.0)
+
+        assert await subscription.next_frame(timeout=0) is not None
+        assert await subscription.next_frame(timeout=0) is not None
+        assert await subscription.next_frame(timeout=0) is None
+
+    @pytest.mark.asyncio
+    async def test_missing_timer_reports_error_and_unsubscribes(self):
+        timer_id = uuid4()
+        subscription = Subscription({timer_id}, cadence=None)
+
+        subscription.offer(timer_id, None, now=0.0)
+
+        frame = json.loads(await subscription.next_frame(timeout=0))
+        assert frame["error"] == "Timer not found"
+        assert timer_id not in subscription.timer_ids
+
+
+class TestTimerStreamHub:
+    """Tests for the single-query fan-out in TimerStreamHub.poll_once."""
+
+    @pytest.mark.asyncio
+    async def test_one_query_serves_all_subscribers(self):
+        a = make_timer(status=TimerStatus.running)
+        b = make_timer(status=TimerStatus.paused)
+        hub, service = make_hub({a.id: a, b.id: b})
+        first = hub.subscribe({a.id})
+        second = hub.subscribe({a.id, b.id})
+        try:
+            await hub.poll_once()
+        finally:
+            await hub.close()
+
+        service.get_timers.assert_called_once()
+        assert set(service.get_timers.call_args[0][0]) == {a.id, b.id}
+        assert await first.next_frame(timeout=0) is not None
+        assert await second.next_frame(timeout=0) is not None
+        assert await second.next_frame(timeout=0) is not None
+
+
+class TestTimersWebSocket:
+    """Tests for client message handling on /api/v1/timers/ws, driven as a raw ASGI websocket."""
+
+    @pytest.mark.asyncio
+    async def test_bad_messages_get_an_error_and_keep_the_connection(self, monkeypatch):
+        hub, _ = make_hub({})
+        monkeypatch.setattr(timers, "get_timer_stream_hub", lambda: hub)
+        monkeypatch.setattr(timers, "WS_MAX_TIMERS", 2)
+        monkeypatch.setattr(get_settings(), "timer_engine", "wallclock")
+        incoming: asyncio.Queue = asyncio.Queue()
+        outgoing: asyncio.Queue = asyncio.Queue()
+        scope = {
+            "type": "websocket", "path": "/api/v1/timers/ws", "raw_path": b"/api/v1/timers/ws",
+            "query_string": b"", "headers": [], "subprotocols": [], "root_path": "",
+        }
+        connection = asyncio.create_task(timers.router(scope, incoming.get, outgoing.put))
+
+        async def reply(text: str) -> dict:
+            await incoming.put({"type": "websocket.receive", "text": text})
+            return json.loads((await asyncio.wait_for(outgoing.get(), 1))["text"])
+
+        try:
+            await incoming.put({"type": "websocket.connect"})
+            assert (await asyncio.wait_for(outgoing.get(), 1))["type"] == "websocket.accept"
+
+            assert await reply("{not json") == {"error": "Invalid message"}
+            assert await reply("[]") == {"error": "Invalid message"}
+            await incoming.put({"type": "websocket.receive", "bytes": b"\x00"})
+            assert json.loads((await asyncio.wait_for(outgoing.get(), 1))["text"]) == {"error": "Invalid message"}
+            too_many = json.dumps({"subscribe": [str(uuid4()) for _ in range(3)]})
+            assert await reply(too_many) == {"error": "at most 2 timers per connection"}
+            assert not any(subscription.timer_ids for subscription in hub._subscriptions)
+
+            await incoming.put({"type": "websocket.disconnect", "code": 1000})
+            await asyncio.wait_for(connection, 1)
+        finally:
+            connection.cancel()
+            await hub.close()
@@ -1,4 +1,8 @@
 """Integration tests for all timer API endpoints."""
+import asyncio
+import json
+import time
+from datetime import datetime, timezone
 import pytest
 import pytest_asyncio
 from httpx import AsyncClient
@@ -27,6 +31,23 @@ async def test_create_timer_returns_201(async_client: AsyncClient):
     assert data["urgency_level"] == 0
 
 
+@pytest.mark.asyncio
+async def test_timestamps_are_utc_whatever_the_local_zone(async_client: AsyncClient, monkeypatch):
+    """created_at/updated_at are the current UTC instant even when the process runs in another zone."""
+    monkeypatch.setenv("TZ", "America/New_York")
+    time.tzset()
+    try:
+        created = (await async_client.post("/api/v1/timers", json={"duration": 60})).json()
+    finally:
+        monkeypatch.undo()
+        time.tzset()
+    now = datetime.now(timezone.utc)
+    for field in ("created_at", "updated_at"):
+        stamp = datetime.fromisoformat(created[field])
+        assert stamp.tzinfo is not None
+        assert abs((now - stamp).total_seconds()) < 60
+
+
 @pytest.mark.asyncio
 async def test_list_timers_returns_200(async_client: AsyncClient):
     """GET /api/v1/timers returns items and count."""
@@ -94,3 +115,221 @@ async def test_start_nonexistent_timer_returns_404(async_client: AsyncClient):
         "/api/v1/timers/00000000-0000-0000-0000-000000000000/start"
     )
     assert response.status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_tick_running_timer_returns_200(async_client: AsyncClient):
+    """POST /api/v1/timers/{id}/tick on a running timer returns its current state."""
+    create = await async_client.post("/api/v1/timers", json={"duration": 60})
+    timer_id = create.json()["id"]
+    await async_client.post(f"/api/v1/timers/{timer_id}/start")
+
+    response = await async_client.post(f"/api/v1/timers/{timer_id}/tick")
+    assert response.status_code == 200
+    assert response.json()["status"] == "running"
+
+
+@pytest.mark.asyncio
+async def test_tick_nonexistent_timer_returns_404(async_client: AsyncClient):
+    """POST /api/v1/timers/{id}/tick with bad ID returns 404."""
+    response = await async_client.post(
+        "/api/v1/timers/00000000-0000-0000-0000-000000000000/tick"
+    )
+    assert response.status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_tick_does_not_advance_paused_timer(async_client: AsyncClient):
+    """A tick arriving after stop leaves the paused timer untouched."""
+    create = await async_client.post("/api/v1/timers", json={"duration": 60})
+    timer_id = create.json()["id"]
+    await async_client.post(f"/api/v1/timers/{timer_id}/start")
+    stopped = await async_client.post(f"/api/v1/timers/{timer_id}/stop")
+
+    response = await async_client.post(f"/api/v1/timers/{timer_id}/tick")
+    assert response.status_code == 200
+    assert response.json()["status"] == "paused"
+    assert response.json()["elapsed_time"] == stopped.json()["elapsed_time"]
+
+
+@pytest.mark.asyncio
+async def test_batch_start_preserves_order_and_reports_missing(async_client: AsyncClient):
+    """POST /api/v1/timers:start applies to all ids and flags unknown ones."""
+    first = (await async_client.post("/api/v1/timers", json={"duration": 60})).json()["id"]
+    second = (await async_client.post("/api/v1/timers", json={"duration": 30})).json()["id"]
+    missing = "00000000-0000-0000-0000-000000000000"
+
+    response = await async_client.post(
+        "/api/v1/timers:start", json={"ids": [second, missing, first]}
+    )
+    assert response.status_code == 200
+    items = response.json()["items"]
+    assert [item["id"] for item in items] == [second, missing, first]
+    assert items[0]["timer"]["status"] == "running"
+    assert items[1]["timer"] is None
+    assert items[1]["error"] == "Timer not found"
+    assert items[2]["timer"]["duration"] == 60
+
+
+@pytest.mark.asyncio
+async def test_batch_reset_rejects_empty_ids(async_client: AsyncClient):
+    """POST /api/v1/timers:reset with no ids returns HTTP 422."""
+    response = await async_client.post("/api/v1/timers:reset", json={"ids": []})
+    assert response.status_code == 422
+
+
+@pytest.mark.asyncio
+async def test_bulk_create_streams_ids_in_request_order(async_client: AsyncClient):
+    """POST /api/v1/timers:bulk creates every timer and streams one id per line."""
+    durations = [10 + i for i in range(1500)]
+    response = await async_client.post(
+        "/api/v1/timers:bulk", json={"timers": [{"duration": d} for d in durations], "start": True}
+    )
+    assert response.status_code == 201
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    ids = [json.loads(line)["id"] for line in response.text.strip().split("\n")]
+    assert len(set(ids)) == len(durations)
+
+    batch = (await async_client.post("/api/v1/timers:stop", json={"ids": [ids[0], ids[-1]]})).json()["items"]
+    assert [item["timer"]["duration"] for item in batch] == [durations[0], durations[-1]]
+    listed = await async_client.get("/api/v1/timers", params={"status": "paused"})
+    assert listed.json()["count"] == 2
+
+
+@pytest.mark.asyncio
+async def test_bulk_create_rejects_invalid_durations(async_client: AsyncClient):
+    """One invalid duration rejects the whole request with HTTP 422 and creates nothing."""
+    response = await async_client.post("/api/v1/timers:bulk", json={"timers": [{"duration": 5}, {"duration": 0}]})
+    assert response.status_code == 422
+    assert (await async_client.get("/api/v1/timers")).json()["count"] == 0
+
+
+@pytest.mark.asyncio
+async def test_stream_nonexistent_timer_returns_404(async_client: AsyncClient):
+    """GET /api/v1/timers/{id}/stream with bad ID returns 404 before streaming."""
+    response = await async_client.get(
+        "/api/v1/timers/00000000-0000-0000-0000-000000000000/stream"
+    )
+    assert response.status_code == 404
+
+
+@pytest.mark.asyncio
+async def test_list_timers_keyset_pagination(async_client: AsyncClient):
+    """GET /api/v1/timers pages newest first and follows next_cursor without overlap."""
+    created = [
+        (await async_client.post("/api/v1/timers", json={"duration": 10 + i})).json()["id"]
+        for i in range(5)
+    ]
+
+    first = (await async_client.get("/api/v1/timers", params={"limit": 3})).json()
+    assert first["count"] == 3
+    assert first["next_cursor"] is not None
+    second = (
+        await async_client.get(
+            "/api/v1/timers", params={"limit": 3, "cursor": first["next_cursor"]}
+        )
+    ).json()
+    assert second["next_cursor"] is None
+
+    seen = [t["id"] for t in first["items"] + second["items"]]
+    assert seen == list(reversed(created))
+
+
+@pytest.mark.asyncio
+async def test_list_timers_filters_by_status(async_client: AsyncClient):
+    """GET /api/v1/timers?status=running only returns running timers."""
+    running = (await async_client.post("/api/v1/timers", json={"duration": 60})).json()["id"]
+    await async_client.post("/api/v1/timers", json={"duration": 60})
+    await async_client.post(f"/api/v1/timers/{running}/start")
+
+    response = await async_client.get(
+        "/api/v1/timers", params={"status": "running", "estimate": "true"}
+    )
+    data = response.json()
+    assert [t["id"] for t in data["items"]] == [running]
+    assert data["total_estimate"] is not None
+
+
+@pytest.mark.asyncio
+async def test_list_timers_rejects_bad_cursor(async_client: AsyncClient):
+    """GET /api/v1/timers with a malformed cursor returns HTTP 400."""
+    response = await async_client.get("/api/v1/timers", params={"cursor": "not-a-cursor"})
+    assert response.status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_list_timers_ndjson_streams_all_rows(async_client: AsyncClient):
+    """GET /api/v1/timers?format=ndjson emits one JSON object per line."""
+    for _ in range(3):
+        await async_client.post("/api/v1/timers", json={"duration": 60})
+
+    response = await async_client.get("/api/v1/timers", params={"format": "ndjson"})
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    lines = response.text.strip().split("\n")
+    assert len(lines) == 3
+
+
+@pytest.mark.asyncio
+async def test_get_timer_if_none_match_returns_304(async_client: AsyncClient):
+    """GET /api/v1/timers/{id} sends an ETag; sending it back gets 304 until the timer changes."""
+    timer_id = (await async_client.post("/api/v1/timers", json={"duration": 60})).json()["id"]
+    first = await async_client.get(f"/api/v1/timers/{timer_id}")
+    etag = first.headers["etag"]
+
+    unchanged = await async_client.get(f"/api/v1/timers/{timer_id}", headers={"If-None-Match": f"W/{etag}"})
+    assert unchanged.status_code == 304
+    assert unchanged.content == b""
+    assert unchanged.headers["etag"] == etag
+
+    await async_client.post(f"/api/v1/timers/{timer_id}/start")
+    changed = await async_client.get(f"/api/v1/timers/{timer_id}", headers={"If-None-Match": etag})
+    assert changed.status_code == 200
+    assert changed.json()["status"] == "running"
+    assert int(changed.headers["x-timer-version"]) == int(first.headers["x-timer-version"]) + 1
+
+
+@pytest.mark.asyncio
+async def test_get_timer_long_poll_returns_on_write(async_client: AsyncClient):
+    """?wait=&since= parks until the timer is written, then returns it."""
+    timer_id = (await async_client.post("/api/v1/timers", json={"duration": 60})).json()["id"]
+    version = (await async_client.get(f"/api/v1/timers/{timer_id}")).headers["x-timer-version"]
+
+    poll = asyncio.create_task(async_client.get(f"/api/v1/timers/{timer_id}?wait=10&since={version}"))
+    await asyncio.sleep(0.1)
+    assert not poll.done()
+    await async_client.post(f"/api/v1/timers/{timer_id}/start")
+    response = await asyncio.wait_for(poll, 5)
+
+    assert response.status_code == 200
+    assert response.json()["status"] == "running"
+    assert response.headers["x-timer-version"] != version
+
+
+@pytest.mark.asyncio
+async def test_get_timer_long_poll_wakes_at_urgency_threshold(async_client: AsyncClient):
+    """A running timer's long-poll returns when its projected urgency_level steps up, without any write."""
+    timer_id = (await async_client.post("/api/v1/timers", json={"duration": 3})).json()["id"]
+    await async_client.post(f"/api/v1/timers/{timer_id}/start")
+    version = (await async_client.get(f"/api/v1/timers/{timer_id}")).headers["x-timer-version"]
+
+    response = await async_client.get(f"/api/v1/timers/{timer_id}?wait=2.5&since={version}")
+
+    assert response.status_code == 200
+    assert response.json()["urgency_level"] == 1
+    assert response.headers["x-timer-version"] == version
+
+
+@pytest.mark.asyncio
+async def test_get_timer_long_poll_timeout_and_validation(async_client: AsyncClient):
+    """An unchanged timer 304s once wait passes; wait needs since; a stale since returns at once."""
+    timer_id = (await async_client.post("/api/v1/timers", json={"duration": 60})).json()["id"]
+    version = (await async_client.get(f"/api/v1/timers/{timer_id}")).headers["x-timer-version"]
+
+    timed_out = await async_client.get(f"/api/v1/timers/{timer_id}?wait=0.2&since={version}")
+    assert timed_out.status_code == 304
+
+    stale = await async_client.get(f"/api/v1/timers/{timer_id}?wait=10&since={int(version) - 1}")
+    assert stale.status_code == 200
+
+    assert (await async_client.get(f"/api/v1/timers/{timer_id}?wait=1")).status_code == 400
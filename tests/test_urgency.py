@@ -0,0 +1,131 @@
+"""Tests for the vectorized urgency API and the set-based recompute job."""
+from datetime import datetime, timedelta, timezone
+import numpy as np
+import pytest
+from httpx import AsyncClient
+from app.config import URGENCY_THRESHOLDS, get_settings
+from app.models.timer import TimerStatus
+from app.repos.timer_repo import TimerRepo, _urgency_sql
+from app.services.timer_service import TimerService
+from app.services.urgency import completed, urgency_level, urgency_levels
+from app.services.urgency_job import UrgencyRecomputeJob
+from tests.test_timer_service import make_timer
+
+
+def float_urgency(elapsed_time: int, duration: int) -> int:
+    """The original float-percentage implementation, kept as the reference."""
+    if duration <= 0:
+        return 0
+    percentage = (elapsed_time / duration) * 100
+    if percentage < 33:
+        return 0
+    elif percentage < 66:
+        return 1
+    elif percentage < 90:
+        return 2
+    return 3
+
+
+def boundary_pairs() -> list[tuple[int, int]]:
+    """(elapsed, duration) just below, at and above each threshold for many durations."""
+    pairs = []
+    for duration in [1, 2, 3, 7, 10, 33, 99, 100, 101, 300, 333, 1000, 3599, 3600, 86400, 10**6 + 7]:
+        for threshold in (33, 66, 90):
+            exact = duration * threshold // 100
+            for elapsed in range(max(0, exact - 2), exact + 3):
+                pairs.append((elapsed, duration))
+        pairs += [(0, duration), (duration, duration), (duration + 5, duration)]
+    return pairs + [(5, 0), (0, 0), (3, -1)]
+
+
+class TestUrgencyParity:
+    """Integer scalar, vectorized and SQL urgency all agree with the float original."""
+
+    def test_scalar_matches_float_reference_at_boundaries(self):
+        service = TimerService(repo=None)
+        for elapsed, duration in boundary_pairs():
+            assert service.compute_urgency(elapsed, duration) == float_urgency(elapsed, duration), (elapsed, duration)
+
+    def test_vectorized_matches_scalar_at_boundaries(self):
+        elapsed, duration = map(np.array, zip(*boundary_pairs()))
+        expected = [urgency_level(e, d) for e, d in boundary_pairs()]
+        assert urgency_levels(elapsed, duration).tolist() == expected
+
+    def test_vectorized_matches_float_reference_exhaustively(self):
+        for duration in range(1, 400):
+            elapsed = np.arange(0, duration + 1)
+            expected = [float_urgency(int(e), duration) for e in elapsed]
+            assert urgency_levels(elapsed, np.full_like(elapsed, duration)).tolist() == expected
+
+    def test_custom_thresholds(self):
+        elapsed = np.array([0, 49, 50, 99, 100])
+        duration = np.full(5, 100)
+        assert urgency_levels(elapsed, duration, (50,)).tolist() == [0, 0, 1, 1, 1]
+        assert [urgency_level(int(e), 100, (50,)) for e in elapsed] == [0, 0, 1, 1, 1]
+
+    def test_no_overflow_for_large_values(self):
+        assert urgency_levels(np.array([2**31 - 1]), np.array([2**31 - 1])).tolist() == [3]
+
+    def test_completed(self):
+        assert completed(np.array([0, 9, 10, 11]), np.array([10, 10, 10, 10])).tolist() == [False, False, True, True]
+
+    @pytest.mark.asyncio
+    async def test_sql_matches_vectorized_at_boundaries(self, db_pool):
+        pairs = boundary_pairs()
+        async with db_pool.acquire() as conn:
+            rows = await conn.fetch(
+                f"SELECT {_urgency_sql('elapsed', URGENCY_THRESHOLDS)} AS level "
+                "FROM unnest($1::int[], $2::int[]) WITH ORDINALITY AS v(elapsed, duration, n) ORDER BY n",
+                [e for e, _ in pairs],
+                [d for _, d in pairs],
+            )
+        elapsed, duration = map(np.array, zip(*pairs))
+        assert [r["level"] for r in rows] == urgency_levels(elapsed, duration).tolist()
+
+
+class TestProjectMany:
+    """TimerService.project_many agrees with per-timer project()."""
+
+    def test_matches_project(self):
+        service = TimerService(repo=None)
+        now = datetime.now(timezone.utc)
+        timers = [
+            make_timer(duration=100, elapsed_time=10, status=TimerStatus.running, started_at=now - timedelta(seconds=s))
+            for s in (0, 22, 23, 56, 80, 95, 500)
+        ] + [make_timer(status=TimerStatus.paused, elapsed_time=40)]
+        assert service.project_many(timers, now) == [service.project(t, now) for t in timers]
+
+
+@pytest.mark.asyncio
+async def test_recompute_job_refreshes_running_timers(db_pool):
+    """One pass updates the stored urgency_level of running timers only."""
+    repo = TimerRepo(db_pool)
+    running = await repo.create(100)
+    paused = await repo.create(100)
+    await repo.start(running.id)
+    async with db_pool.acquire() as conn:
+        await conn.execute(
+            "UPDATE timers SET started_at = $2 WHERE id = $1",
+            running.id,
+            datetime.now(timezone.utc) - timedelta(seconds=70),
+        )
+        await conn.execute("UPDATE timers SET status = 'paused', elapsed_time = 95 WHERE id = $1", paused.id)
+
+    async def factory():
+        return repo
+
+    job = UrgencyRecomputeJob(factory)
+    assert await job.run_once() == 1
+    assert (await repo.get_by_id(running.id)).urgency_level == 2
+    assert (await repo.get_by_id(paused.id)).urgency_level == 0
+    assert await job.run_once() == 0
+
+
+@pytest.mark.asyncio
+async def test_urgency_level_filter_follows_configured_levels(async_client: AsyncClient, monkeypatch):
+    assert (await async_client.get("/api/v1/timers", params={"urgency_level": 3})).status_code == 200
+    assert (await async_client.get("/api/v1/timers", params={"urgency_level": 4})).status_code == 422
+
+    monkeypatch.setattr(get_settings(), "urgency_thresholds", "20,40,60,80")
+    assert (await async_client.get("/api/v1/timers", params={"urgency_level": 4})).status_code == 200
+    assert (await async_client.get("/api/v1/timers", params={"urgency_level": 5})).status_code == 422
@@ -42,8 +42,21 @@ export async function resetTimer(id: string): Promise<Timer> {
   return res.json();
 }
 
-export async function tickTimer(id: string): Promise<Timer> {
-  const res = await fetch(`${BASE_URL}/${id}/tick`, { method: 'POST' });
+export async function tickTimer(id: string, idempotencyKey?: string): Promise<Timer> {
+  const res = await fetch(`${BASE_URL}/${id}/tick`, {
+    method: 'POST',
+    headers: idempotencyKey ? { 'Idempotency-Key': idempotencyKey } : undefined,
+  });
   if (!res.ok) throw new Error(`Tick failed: ${res.status}`);
   return res.json();
 }
+
+export interface TimerFrame {
+  id: string;
+  timer: Timer | null;
+  error?: string;
+}
+
+export function streamTimer(id: string, cadence: number): EventSource {
+  return new EventSource(`${BASE_URL}/${id}/stream?cadence=${cadence}`);
+}
@@ -18,12 +18,25 @@ export function useTimer(): UseTimerReturn {
   const [error, setError] = useState<string | null>(null);
   const pollRef = useRef<ReturnType<typeof setInterval> | null>(null);
 
-  // Tick the timer every second when it's running (advances elapsed_time on server)
+  // While running, follow the server's push stream (one connection, frames on
+  // change or every second). If the stream is unavailable (no EventSource, or the
+  // server runs the tick engine and answers 409), fall back to ticking every second.
   useEffect(() => {
-    if (timer?.status === 'running' && timer.id) {
+    if (timer?.status !== 'running' || !timer.id) return;
+    const id = timer.id;
+    let source: EventSource | null = null;
+    let received = false;
+
+    const startTicking = () => {
+      // A failed tick is retried on the next interval under the same
+      // Idempotency-Key, so one the server applied before the response was
+      // lost is replayed instead of advancing the timer twice.
+      const session = Math.random().toString(36).slice(2);
+      let seq = 0;
       pollRef.current = setInterval(async () => {
         try {
-          const updated = await api.tickTimer(timer.id);
+          const updated = await api.tickTimer(id, `${id}:${session}:${seq}`);
+          seq += 1;
           setTimer(updated);
           if (updated.status === 'complete') {
             if (pollRef.current) clearInterval(pollRef.current);
@@ -32,9 +45,28 @@ export function useTimer(): UseTimerReturn {
           // Silently retry on next interval
         }
       }, 1000);
+    };
+
+    if (typeof EventSource === 'undefined') {
+      startTicking();
+    } else {
+      source = api.streamTimer(id, 1);
+      source.onmessage = (event: MessageEvent<string>) => {
+        received = true;
+        const frame: api.TimerFrame = JSON.parse(event.data);
+        if (frame.timer) setTimer(frame.timer);
+      };
+      source.onerror = () => {
+        // After the first frame the browser reconnects on its own.
+        if (received || !source) return;
+        source.close();
+        source = null;
+        startTicking();
+      };
     }
 
     return () => {
+      source?.close();
       if (pollRef.current) {
         clearInterval(pollRef.current);
         pollRef.current = null;
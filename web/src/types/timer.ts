@@ -17,4 +17,6 @@ export interface CreateTimerRequest {
 export interface TimerListResponse {
   items: Timer[];
   count: number;
+  next_cursor: string | null;
+  total_estimate: number | null;
 }